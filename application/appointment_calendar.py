@@ -0,0 +1,127 @@
+import copy
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from domain.entities import Appointment
+from domain.normalization import doctor_key
+
+
+def _remove_entry(entries: List[Tuple[datetime, str]], entry: Tuple[datetime, str]):
+    position = bisect_left(entries, entry)
+    if position < len(entries) and entries[position] == entry:
+        del entries[position]
+
+
+def _slice(entries: List[Tuple[datetime, str]], start: datetime, end: datetime) -> List[Tuple[datetime, str]]:
+    # (fecha,) es menor que cualquier (fecha, id): el rango es [start, end)
+    return entries[bisect_left(entries, (start,)):bisect_left(entries, (end,))]
+
+
+class AppointmentCalendar:
+    """
+    Agenda en memoria de las citas, ordenada por fecha, con una sub-agenda por doctor.
+    Las consultas por día, semana o rango se resuelven con búsqueda binaria sobre
+    listas de (fecha, id) ordenadas, sin consultar la base de datos.
+    Los nombres de doctor se comparan sin mayúsculas ni tildes.
+    """
+
+    def __init__(self):
+        self._appointments: Dict[str, Appointment] = {}
+        self._entries: List[Tuple[datetime, str]] = []               # (fecha, id), ordenada
+        self._by_doctor: Dict[str, List[Tuple[datetime, str]]] = {}  # doctor normalizado -> (fecha, id)
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def load(self, appointments: Iterable[Appointment]):
+        """Reconstruye la agenda a partir de las citas; las entidades pasan a ser de la agenda"""
+        with self._lock:
+            self._appointments.clear()
+            self._entries = []
+            self._by_doctor.clear()
+            for appointment in appointments:
+                self._add_locked(appointment, keep_sorted=False)
+            self._entries.sort()
+            for entries in self._by_doctor.values():
+                entries.sort()
+            self.loaded = True
+
+    def add(self, appointment: Appointment):
+        """Agrega una cita o reemplaza la versión anterior (cambio de fecha, doctor o estado)"""
+        with self._lock:
+            if appointment.id in self._appointments:
+                self._remove_locked(appointment.id)
+            # Se guarda una copia para que los cambios de quien la creó no desordenen la agenda
+            self._add_locked(copy.copy(appointment), keep_sorted=True)
+
+    def remove(self, appointment_id: str):
+        """Quita una cita de la agenda; no falla si no estaba"""
+        with self._lock:
+            if appointment_id in self._appointments:
+                self._remove_locked(appointment_id)
+
+    def between(
+        self,
+        start: datetime,
+        end: datetime,
+        doctor_name: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[Appointment]:
+        """
+        Devuelve las citas con fecha en [start, end), ordenadas por fecha,
+        opcionalmente solo las de un doctor y/o un estado
+        """
+        with self._lock:
+            if doctor_name is None:
+                entries = self._entries
+            else:
+                entries = self._by_doctor.get(doctor_key(doctor_name), [])
+
+            appointments = [self._appointments[appointment_id] for _, appointment_id in _slice(entries, start, end)]
+
+        if status is not None:
+            appointments = [appointment for appointment in appointments if appointment.status == status]
+        return [copy.copy(appointment) for appointment in appointments]
+
+    def day(self, day: date, doctor_name: Optional[str] = None, status: Optional[str] = None) -> List[Appointment]:
+        """Citas del día indicado"""
+        start = datetime.combine(day, time.min)
+        return self.between(start, start + timedelta(days=1), doctor_name, status)
+
+    def week(self, day: date, doctor_name: Optional[str] = None, status: Optional[str] = None) -> List[Appointment]:
+        """Citas de la semana (lunes a domingo) que contiene el día indicado"""
+        start = datetime.combine(day - timedelta(days=day.weekday()), time.min)
+        return self.between(start, start + timedelta(days=7), doctor_name, status)
+
+    def doctors(self) -> List[str]:
+        """Nombres de los doctores con citas en la agenda, tal como se registraron"""
+        with self._lock:
+            names = {doctor_key(a.doctor_name): a.doctor_name for a in self._appointments.values()}
+        return sorted(names.values())
+
+    def __len__(self) -> int:
+        return len(self._appointments)
+
+    def _add_locked(self, appointment: Appointment, keep_sorted: bool):
+        entry = (appointment.date, appointment.id)
+        doctor_entries = self._by_doctor.setdefault(doctor_key(appointment.doctor_name), [])
+        self._appointments[appointment.id] = appointment
+
+        if keep_sorted:
+            insort(self._entries, entry)
+            insort(doctor_entries, entry)
+        else:
+            self._entries.append(entry)
+            doctor_entries.append(entry)
+
+    def _remove_locked(self, appointment_id: str):
+        appointment = self._appointments.pop(appointment_id)
+        entry = (appointment.date, appointment.id)
+        doctor = doctor_key(appointment.doctor_name)
+
+        _remove_entry(self._entries, entry)
+        doctor_entries = self._by_doctor.get(doctor)
+        if doctor_entries is not None:
+            _remove_entry(doctor_entries, entry)
+            if not doctor_entries:
+                del self._by_doctor[doctor]
@@ -0,0 +1,145 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from domain.normalization import normalize_name
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PatientNameIndex:
+    """
+    Índice en memoria de nombres de pacientes para el autocompletado.
+    Las consultas de una o dos letras se resuelven por prefijo de palabra (lista ordenada
+    y búsqueda binaria); las más largas, por intersección de trigramas.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, Tuple[str, str]] = {}  # id -> (nombre, nombre normalizado)
+        self._words: List[Tuple[str, str]] = []       # (palabra normalizada, id), ordenada
+        self._trigram_ids: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def load(self, entries: Iterable[Tuple[str, str]]):
+        """Reconstruye el índice a partir de pares (id, nombre)"""
+        with self._lock:
+            self._names.clear()
+            self._words = []
+            self._trigram_ids.clear()
+            for patient_id, name in entries:
+                self._add_locked(str(patient_id), name, keep_sorted=False)
+            self._words.sort()
+            self.loaded = True
+
+    def add(self, patient_id: str, name: str):
+        """Agrega un paciente o actualiza su nombre"""
+        with self._lock:
+            patient_id = str(patient_id)
+            if patient_id in self._names:
+                self._remove_locked(patient_id)
+            self._add_locked(patient_id, name, keep_sorted=True)
+
+    def remove(self, patient_id: str):
+        """Quita un paciente del índice; no falla si no estaba"""
+        with self._lock:
+            patient_id = str(patient_id)
+            if patient_id in self._names:
+                self._remove_locked(patient_id)
+
+    def suggest(self, query: str, limit: int = 20) -> List[Tuple[str, str]]:
+        """
+        Devuelve hasta limit pares (id, nombre) que coinciden con la consulta.
+        Primero los nombres que empiezan con la consulta, luego los que tienen una palabra
+        que empieza con ella y por último los que la contienen; dentro de cada grupo, por nombre.
+        """
+        normalized = normalize_name(query)
+        if not normalized or limit <= 0:
+            return []
+
+        with self._lock:
+            if len(normalized) < 3:
+                candidates = self._word_prefix_ids(normalized)
+            else:
+                candidates = self._trigram_candidates(normalized)
+
+            ranked = []
+            for patient_id in candidates:
+                name, normalized_name = self._names[patient_id]
+                if normalized_name.startswith(normalized):
+                    rank = 0
+                elif (' ' + normalized) in (' ' + normalized_name):
+                    rank = 1
+                elif normalized in normalized_name:
+                    rank = 2
+                else:
+                    continue
+                ranked.append((rank, normalized_name, patient_id, name))
+
+        best = heapq.nsmallest(limit, ranked)
+        return [(patient_id, name) for _, _, patient_id, name in best]
+
+    def get_name(self, patient_id: str) -> Optional[str]:
+        """Devuelve el nombre del paciente, o None si no está en el índice"""
+        entry = self._names.get(str(patient_id))
+        return entry[0] if entry else None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _add_locked(self, patient_id: str, name: str, keep_sorted: bool):
+        normalized = normalize_name(name)
+        self._names[patient_id] = (name, normalized)
+
+        for word in set(normalized.split()):
+            if keep_sorted:
+                insort(self._words, (word, patient_id))
+            else:
+                self._words.append((word, patient_id))
+
+        for trigram in _trigrams(normalized):
+            self._trigram_ids.setdefault(trigram, set()).add(patient_id)
+
+    def _remove_locked(self, patient_id: str):
+        _, normalized = self._names.pop(patient_id)
+
+        for word in set(normalized.split()):
+            position = bisect_left(self._words, (word, patient_id))
+            if position < len(self._words) and self._words[position] == (word, patient_id):
+                del self._words[position]
+
+        for trigram in _trigrams(normalized):
+            ids = self._trigram_ids.get(trigram)
+            if ids is not None:
+                ids.discard(patient_id)
+                if not ids:
+                    del self._trigram_ids[trigram]
+
+    def _word_prefix_ids(self, prefix: str) -> Set[str]:
+        """IDs con alguna palabra que empieza con prefix"""
+        ids = set()
+        position = bisect_left(self._words, (prefix, ''))
+        while position < len(self._words) and self._words[position][0].startswith(prefix):
+            ids.add(self._words[position][1])
+            position += 1
+        return ids
+
+    def _trigram_candidates(self, text: str) -> Set[str]:
+        """IDs cuyos nombres contienen todos los trigramas de text"""
+        postings = []
+        for trigram in _trigrams(text):
+            ids = self._trigram_ids.get(trigram)
+            if not ids:
+                return set()
+            postings.append(ids)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                break
+        return candidates
+
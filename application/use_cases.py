@@ -1,9 +1,243 @@
-from typing import List, Optional
-from datetime import datetime
+import base64
+import json
+from contextlib import closing
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from domain.entities import Patient, Appointment, Treatment
 from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
-from domain.dto import PatientDTO, AppointmentDTO, TreatmentDTO, PatientSearchDTO, PatientReportDTO
+from domain.dto import (
+    PatientDTO, AppointmentDTO, TreatmentDTO, PatientSearchDTO, PatientReportDTO, BatchItemResultDTO, PageDTO,
+    PatientListItemDTO, AppointmentListItemDTO, TreatmentListItemDTO
+)
 from domain.services import PatientService, AppointmentService, TreatmentService, ReportService
+from application.patient_index import PatientNameIndex
+from application.appointment_calendar import AppointmentCalendar
+from config import REPORT_CONFIG, REPOSITORY_CONFIG, SEARCH_CONFIG
+
+
+class UnitOfWork:
+    """
+    Ejecuta un caso de uso sobre una sola conexión y una sola transacción.
+    Usa la transacción del pool del repositorio indicado; los demás repositorios que
+    comparten ese pool se unen a ella. Si el repositorio no admite transacciones
+    (por ejemplo, uno en memoria), el bloque se ejecuta sin cambios.
+    """
+
+    def __init__(self, repository):
+        self._transaction = getattr(repository, 'transaction', None)
+        self._scope = None
+
+    def __enter__(self):
+        if self._transaction is not None:
+            self._scope = self._transaction()
+            self._scope.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._scope is None:
+            return False
+        scope, self._scope = self._scope, None
+        return scope.__exit__(exc_type, exc_value, traceback)
+
+
+def _encode_page_token(key: tuple) -> str:
+    """Codifica la clave keyset de la última fila como un token opaco"""
+    values = [
+        {'datetime': value.isoformat()} if isinstance(value, datetime) else value
+        for value in key
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def _decode_page_token(token: str) -> tuple:
+    """Recupera la clave keyset desde un token generado por _encode_page_token"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+        return tuple(
+            datetime.fromisoformat(value['datetime']) if isinstance(value, dict) else value
+            for value in values
+        )
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Token de paginación inválido: {str(e)}")
+
+
+def _fetch_page(
+    fetch: Callable[..., list],
+    page_key: Callable[[object], tuple],
+    to_dto: Optional[Callable[[object], object]],
+    page_size: Optional[int],
+    page_token: Optional[str]
+) -> PageDTO:
+    """
+    Obtiene una página con fetch(limit=..., after=...) pidiendo una fila extra
+    para saber si existe una página siguiente.
+    Sin to_dto, fetch ya devuelve los DTO (proyecciones de lectura).
+    """
+    page_size = page_size or REPOSITORY_CONFIG['page_size']
+    after = _decode_page_token(page_token) if page_token else None
+
+    entities = fetch(limit=page_size + 1, after=after)
+    next_token = None
+    if len(entities) > page_size:
+        entities = entities[:page_size]
+        next_token = _encode_page_token(page_key(entities[-1]))
+
+    items = entities if to_dto is None else [to_dto(entity) for entity in entities]
+    return PageDTO(items=items, next_token=next_token)
+
+
+def _iter_dtos(entities: Iterator, to_dto: Callable[[object], object]) -> Iterator:
+    """
+    Convierte entidades en DTOs a medida que se consumen.
+    Si el consumidor se detiene antes, cierra el iterador de origen para liberar su conexión.
+    """
+    with closing(entities):
+        for entity in entities:
+            yield to_dto(entity)
+
+
+def _update_counters(statistics_repository, before: List[str], after: List[str]):
+    """
+    Aplica a los contadores del reporte la variación entre las claves de una entidad antes y
+    después de una escritura (ReportService.counter_keys). Sin repositorio de estadísticas no hace nada.
+    """
+    if statistics_repository is None:
+        return
+    deltas = ReportService.counter_deltas(before, after)
+    if deltas:
+        statistics_repository.apply_deltas(deltas)
+
+
+def _count_inserted(statistics_repository) -> Optional[Callable[[list, List[BatchItemResultDTO]], None]]:
+    """Suma a los contadores del reporte las entidades insertadas en un lote"""
+    if statistics_repository is None:
+        return None
+
+    def on_saved(entities: list, results: List[BatchItemResultDTO]):
+        after = []
+        for entity, result in zip(entities, results):
+            # Las altas por lotes generan IDs nuevos, por lo que no hay estado anterior que restar
+            if result.outcome == BatchItemResultDTO.INSERTED:
+                after.extend(ReportService.counter_keys(entity))
+        _update_counters(statistics_repository, [], after)
+    return on_saved
+
+
+def _delete_in_batches(
+    ids: Iterable[str],
+    batch_size: Optional[int],
+    repository,
+    statistics_repository=None
+) -> List[BatchItemResultDTO]:
+    """
+    Elimina por lotes con delete_many. Con repositorio de estadísticas, cada lote lee antes
+    las entidades (una consulta) y resta sus contadores en la misma transacción.
+    """
+    if statistics_repository is None:
+        return repository.delete_many(ids, batch_size)
+
+    batch_size = batch_size or REPOSITORY_CONFIG['batch_size']
+    iterator = (str(entity_id) for entity_id in ids)
+    results = []
+
+    while True:
+        chunk = list(islice(iterator, batch_size))
+        if not chunk:
+            break
+
+        with UnitOfWork(repository):
+            entities = repository.find_by_ids(chunk)
+            chunk_results = repository.delete_many(chunk, batch_size)
+            deleted = {result.id for result in chunk_results if result.outcome == BatchItemResultDTO.DELETED}
+            before = [
+                key for entity in entities if str(entity.id) in deleted
+                for key in ReportService.counter_keys(entity)
+            ]
+            _update_counters(statistics_repository, before, [])
+        results.extend(chunk_results)
+
+    return results
+
+
+def _create_in_batches(
+    rows: Iterable[dict],
+    batch_size: Optional[int],
+    build_entity: Callable[[dict], object],
+    repository,
+    check_batch: Optional[Callable[[list], Dict[int, str]]] = None,
+    on_saved: Optional[Callable[[list, List[BatchItemResultDTO]], None]] = None
+) -> List[BatchItemResultDTO]:
+    """
+    Construye entidades fila a fila y las guarda por lotes con save_many.
+    Las filas inválidas se informan como 'invalid' y el orden de entrada se conserva.
+    Una entidad con un ID ya generado en la misma carga también es 'invalid': save_many
+    la guardaría sobre la anterior y se perdería una fila informada como 'updated'.
+    on_saved(entidades, resultados) se ejecuta en la misma transacción que cada lote.
+    """
+    batch_size = batch_size or REPOSITORY_CONFIG['batch_size']
+    iterator = iter(rows)
+    results = []
+    seen_ids = set()
+
+    while True:
+        chunk = list(islice(iterator, batch_size))
+        if not chunk:
+            break
+
+        chunk_results = [None] * len(chunk)
+        entities = []
+        positions = []
+        for position, row in enumerate(chunk):
+            try:
+                entity = build_entity(row)
+            except KeyError as e:
+                chunk_results[position] = BatchItemResultDTO(None, BatchItemResultDTO.INVALID, f"Campo obligatorio faltante: {e}")
+                continue
+            except (ValueError, TypeError) as e:
+                chunk_results[position] = BatchItemResultDTO(None, BatchItemResultDTO.INVALID, str(e))
+                continue
+
+            entity_id = str(entity.id)
+            if entity_id in seen_ids:
+                chunk_results[position] = BatchItemResultDTO(
+                    entity_id, BatchItemResultDTO.INVALID, "ID duplicado dentro de la carga"
+                )
+                continue
+            seen_ids.add(entity_id)
+            entities.append(entity)
+            positions.append(position)
+
+        if check_batch and entities:
+            rejected = check_batch(entities)
+            for index in sorted(rejected, reverse=True):
+                entity = entities.pop(index)
+                position = positions.pop(index)
+                chunk_results[position] = BatchItemResultDTO(str(entity.id), BatchItemResultDTO.INVALID, rejected[index])
+
+        if entities:
+            with UnitOfWork(repository):
+                saved = repository.save_many(entities, batch_size)
+                if on_saved:
+                    on_saved(entities, saved)
+            for position, result in zip(positions, saved):
+                chunk_results[position] = result
+
+        results.extend(chunk_results)
+
+    return results
+
+
+def _reject_missing_patients(patient_repository) -> Callable[[list], Dict[int, str]]:
+    """Valida en una sola consulta que los pacientes de un lote existan"""
+    def check_batch(entities: list) -> Dict[int, str]:
+        existing = patient_repository.existing_ids(str(entity.patient_id) for entity in entities)
+        return {
+            index: "Paciente no encontrado"
+            for index, entity in enumerate(entities)
+            if str(entity.patient_id) not in existing
+        }
+    return check_batch
 
 
 class PatientUseCase:
@@ -11,9 +245,13 @@ class PatientUseCase:
     Casos de uso para la gestión de pacientes
     """
     
-    def __init__(self, patient_repository):
+    def __init__(self, patient_repository, name_index: Optional[PatientNameIndex] = None, statistics_repository=None):
         self.patient_repository = patient_repository
         self.patient_service = PatientService()
+        # Índice de nombres para el autocompletado; se carga en el primer uso
+        self.name_index = name_index or PatientNameIndex()
+        # Contadores materializados del reporte; se actualizan en cada escritura
+        self.statistics_repository = statistics_repository
 
     def create_patient(
         self,
@@ -35,12 +273,47 @@ class PatientUseCase:
                 contact=contact
             )
             
-            saved_patient = self.patient_repository.save(patient)
+            with UnitOfWork(self.patient_repository):
+                saved_patient = self.patient_repository.save(patient)
+                _update_counters(self.statistics_repository, [], ReportService.counter_keys(saved_patient))
+            self._index_patient(saved_patient)
             return PatientDTO.from_entity(saved_patient)
             
         except Exception as e:
             raise Exception(f"Error al crear paciente: {str(e)}")
 
+    def create_patients(self, patients_data: Iterable[dict], batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Crea pacientes por lotes. Cada elemento es un diccionario con las claves
+        name, age, gender, medical_history y contact.
+        """
+        names = {}
+
+        def build_patient(data: dict) -> Patient:
+            patient = self.patient_service.create_patient(
+                name=data['name'],
+                age=data['age'],
+                gender=data['gender'],
+                medical_history=data.get('medical_history', ''),
+                contact=data['contact']
+            )
+            if self.name_index.loaded:
+                names[str(patient.id)] = patient.name
+            return patient
+
+        try:
+            results = _create_in_batches(
+                patients_data, batch_size, build_patient, self.patient_repository,
+                on_saved=_count_inserted(self.statistics_repository)
+            )
+        except Exception as e:
+            raise Exception(f"Error al crear pacientes: {str(e)}")
+
+        for result in results:
+            if result.is_success() and result.id in names:
+                self.name_index.add(result.id, names[result.id])
+        return results
+
     def get_all_patients(self) -> List[PatientDTO]:
         """
         Obtiene todos los pacientes del sistema
@@ -51,6 +324,44 @@ class PatientUseCase:
         except Exception as e:
             raise Exception(f"Error al obtener pacientes: {str(e)}")
 
+    def get_patients_page(self, page_size: Optional[int] = None, page_token: Optional[str] = None) -> PageDTO:
+        """
+        Obtiene una página de pacientes ordenados por nombre.
+        El next_token de la página se pasa como page_token para obtener la siguiente.
+        """
+        try:
+            return _fetch_page(
+                self.patient_repository.find_all, self.patient_repository.page_key,
+                PatientDTO.from_entity, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener pacientes: {str(e)}")
+
+    def get_patient_list_page(self, page_size: Optional[int] = None, page_token: Optional[str] = None) -> PageDTO:
+        """
+        Obtiene una página de la lista de pacientes (PatientListItemDTO) ordenada por nombre,
+        proyectada desde las filas sin crear entidades
+        """
+        try:
+            return _fetch_page(
+                self.patient_repository.list_items, self.patient_repository.page_key,
+                None, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener pacientes: {str(e)}")
+
+    def iter_all_patients(self) -> Iterator[PatientDTO]:
+        """
+        Recorre todos los pacientes sin mantenerlos en memoria (exportaciones y reportes)
+        """
+        return _iter_dtos(self.patient_repository.iter_all(), PatientDTO.from_entity)
+
+    def iter_search_patients(self, search_dto: PatientSearchDTO) -> Iterator[PatientDTO]:
+        """
+        Recorre los pacientes que cumplen los criterios sin mantenerlos en memoria
+        """
+        return _iter_dtos(self.patient_repository.iter_search(search_dto), PatientDTO.from_entity)
+
     def get_patient_by_id(self, patient_id: str) -> Optional[PatientDTO]:
         """
         Obtiene un paciente por su ID
@@ -63,19 +374,36 @@ class PatientUseCase:
         except Exception as e:
             raise Exception(f"Error al obtener paciente: {str(e)}")
 
+    def get_patient_medical_history(self, patient_id: str) -> str:
+        """
+        Obtiene el historial médico completo de un paciente; las listas solo traen el comienzo
+        """
+        try:
+            history = self.patient_repository.find_medical_history(PatientId.from_string(patient_id))
+            if history is None:
+                raise ValueError("Paciente no encontrado")
+            return history
+        except Exception as e:
+            raise Exception(f"Error al obtener historial médico: {str(e)}")
+
     def update_patient_medical_history(self, patient_id: str, new_history: str) -> PatientDTO:
         """
         Actualiza el historial médico de un paciente
         """
         try:
-            patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
-            if not patient:
-                raise ValueError("Paciente no encontrado")
-                
-            updated_patient = self.patient_service.update_patient_medical_history(patient, new_history)
-            saved_patient = self.patient_repository.save(updated_patient)
+            with UnitOfWork(self.patient_repository):
+                patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
+                if not patient:
+                    raise ValueError("Paciente no encontrado")
+                    
+                before = ReportService.counter_keys(patient)
+                updated_patient = self.patient_service.update_patient_medical_history(patient, new_history)
+                saved_patient = self.patient_repository.save(updated_patient)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_patient))
+            # El índice de nombres se actualiza recién con la transacción confirmada
+            self._index_patient(saved_patient)
             return PatientDTO.from_entity(saved_patient)
-            
+                
         except Exception as e:
             raise Exception(f"Error al actualizar historial médico: {str(e)}")
 
@@ -84,14 +412,19 @@ class PatientUseCase:
         Actualiza la información de contacto de un paciente
         """
         try:
-            patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
-            if not patient:
-                raise ValueError("Paciente no encontrado")
-                
-            updated_patient = self.patient_service.update_patient_contact(patient, new_contact)
-            saved_patient = self.patient_repository.save(updated_patient)
+            with UnitOfWork(self.patient_repository):
+                patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
+                if not patient:
+                    raise ValueError("Paciente no encontrado")
+                    
+                before = ReportService.counter_keys(patient)
+                updated_patient = self.patient_service.update_patient_contact(patient, new_contact)
+                saved_patient = self.patient_repository.save(updated_patient)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_patient))
+            # El índice de nombres se actualiza recién con la transacción confirmada
+            self._index_patient(saved_patient)
             return PatientDTO.from_entity(saved_patient)
-            
+                
         except Exception as e:
             raise Exception(f"Error al actualizar contacto: {str(e)}")
 
@@ -105,25 +438,127 @@ class PatientUseCase:
         except Exception as e:
             raise Exception(f"Error al buscar pacientes: {str(e)}")
 
+    def search_patients_text(self, term: str, limit: Optional[int] = None) -> List[PatientDTO]:
+        """
+        Busca pacientes por nombre, contacto o historial médico, ordenados por relevancia
+        """
+        try:
+            patients = self.patient_repository.search_text(term, limit)
+            return [PatientDTO.from_entity(patient) for patient in patients]
+        except Exception as e:
+            raise Exception(f"Error al buscar pacientes: {str(e)}")
+
+    def search_patient_list_text(self, term: str, limit: Optional[int] = None) -> List[PatientListItemDTO]:
+        """
+        Igual que search_patients_text, pero devuelve las filas de la lista (PatientListItemDTO)
+        proyectadas desde la consulta, sin crear entidades
+        """
+        try:
+            return self.patient_repository.search_text_items(term, limit)
+        except Exception as e:
+            raise Exception(f"Error al buscar pacientes: {str(e)}")
+
+    def search_patients_page(
+        self,
+        search_dto: PatientSearchDTO,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None
+    ) -> PageDTO:
+        """
+        Busca pacientes según criterios específicos, página a página
+        """
+        def fetch(limit: int, after: Optional[tuple]) -> List[Patient]:
+            return self.patient_repository.search(search_dto, limit=limit, after=after)
+
+        try:
+            return _fetch_page(fetch, self.patient_repository.page_key, PatientDTO.from_entity, page_size, page_token)
+        except Exception as e:
+            raise Exception(f"Error al buscar pacientes: {str(e)}")
+
     def delete_patient(self, patient_id: str) -> bool:
         """
         Elimina un paciente del sistema
         """
         try:
-            return self.patient_repository.delete(PatientId.from_string(patient_id))
+            with UnitOfWork(self.patient_repository):
+                patient = None
+                if self.statistics_repository is not None:
+                    patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
+                deleted = self.patient_repository.delete(PatientId.from_string(patient_id))
+                if deleted:
+                    _update_counters(self.statistics_repository, ReportService.counter_keys(patient), [])
+            if deleted:
+                self.name_index.remove(patient_id)
+            return deleted
         except Exception as e:
             raise Exception(f"Error al eliminar paciente: {str(e)}")
 
+    def delete_patients(self, patient_ids: Iterable[str], batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Elimina pacientes por lotes
+        """
+        try:
+            results = _delete_in_batches(patient_ids, batch_size, self.patient_repository, self.statistics_repository)
+        except Exception as e:
+            raise Exception(f"Error al eliminar pacientes: {str(e)}")
+
+        for result in results:
+            if result.outcome == BatchItemResultDTO.DELETED:
+                self.name_index.remove(result.id)
+        return results
+
+    def suggest_patients(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Sugiere pacientes cuyo nombre coincide con lo escrito hasta ahora.
+        Devuelve pares (id, nombre), como máximo limit, sin consultar la base de datos
+        salvo la primera vez, cuando se carga el índice de nombres.
+        """
+        try:
+            self.load_name_index()
+            return self.name_index.suggest(query, limit or SEARCH_CONFIG['typeahead_limit'])
+        except Exception as e:
+            raise Exception(f"Error al sugerir pacientes: {str(e)}")
+
+    def get_patient_name(self, patient_id: str) -> Optional[str]:
+        """
+        Devuelve el nombre de un paciente desde el índice de nombres, sin consultar la base de datos
+        """
+        try:
+            self.load_name_index()
+            return self.name_index.get_name(patient_id)
+        except Exception as e:
+            raise Exception(f"Error al obtener nombre del paciente: {str(e)}")
+
+    def load_name_index(self, reload: bool = False):
+        """Carga el índice de nombres desde el repositorio si aún no se cargó"""
+        if reload or not self.name_index.loaded:
+            self.name_index.load(self.patient_repository.iter_names())
+
+    def _index_patient(self, patient: Patient):
+        """Mantiene el índice de nombres al día; si aún no se cargó, lo hará la primera sugerencia"""
+        if self.name_index.loaded:
+            self.name_index.add(str(patient.id), patient.name)
+
 
 class AppointmentUseCase:
     """
     Casos de uso para la gestión de citas médicas
     """
     
-    def __init__(self, appointment_repository, patient_repository):
+    def __init__(
+        self,
+        appointment_repository,
+        patient_repository,
+        statistics_repository=None,
+        calendar: Optional[AppointmentCalendar] = None
+    ):
         self.appointment_repository = appointment_repository
         self.patient_repository = patient_repository
         self.appointment_service = AppointmentService()
+        # Contadores materializados del reporte; se actualizan en cada escritura
+        self.statistics_repository = statistics_repository
+        # Agenda en memoria para las consultas por día, semana y doctor; se carga en el primer uso
+        self.calendar = calendar or AppointmentCalendar()
 
     def create_appointment(
         self,
@@ -131,30 +566,85 @@ class AppointmentUseCase:
         date: datetime,
         doctor_name: str,
         reason: str,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        duration_minutes: Optional[int] = None
     ) -> AppointmentDTO:
         """
-        Crea una nueva cita médica
+        Crea una nueva cita médica; se rechaza si el doctor ya tiene una cita superpuesta
         """
         try:
-            patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
-            if not patient:
-                raise ValueError("Paciente no encontrado")
+            with UnitOfWork(self.appointment_repository):
+                patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
+                if not patient:
+                    raise ValueError("Paciente no encontrado")
+                    
+                appointment = self.appointment_service.create_appointment(
+                    patient_id=patient.id,
+                    date=date,
+                    doctor_name=doctor_name,
+                    reason=reason,
+                    notes=notes,
+                    duration_minutes=duration_minutes
+                )
+                self._check_conflicts(appointment)
                 
-            appointment = self.appointment_service.create_appointment(
-                patient_id=patient.id,
-                date=date,
-                doctor_name=doctor_name,
-                reason=reason,
-                notes=notes
-            )
-            
-            saved_appointment = self.appointment_repository.save(appointment)
+                saved_appointment = self.appointment_repository.save(appointment)
+                _update_counters(self.statistics_repository, [], ReportService.counter_keys(saved_appointment))
+            self._index_appointment(saved_appointment)
             return AppointmentDTO.from_entity(saved_appointment)
-            
+                
         except Exception as e:
             raise Exception(f"Error al crear cita: {str(e)}")
 
+    def create_appointments(self, appointments_data: Iterable[dict], batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Crea citas por lotes. Cada elemento es un diccionario con las claves
+        patient_id, date, doctor_name, reason, notes (opcional) y duration_minutes (opcional).
+        No verifica superposiciones entre citas; para eso está audit_conflicts.
+        """
+        built = {}
+
+        def build_appointment(data: dict) -> Appointment:
+            appointment = self.appointment_service.create_appointment(
+                patient_id=PatientId.from_string(data['patient_id']),
+                date=data['date'],
+                doctor_name=data['doctor_name'],
+                reason=data['reason'],
+                notes=data.get('notes'),
+                duration_minutes=data.get('duration_minutes')
+            )
+            if self.calendar.loaded:
+                built[appointment.id] = appointment
+            return appointment
+
+        try:
+            results = _create_in_batches(
+                appointments_data, batch_size, build_appointment, self.appointment_repository,
+                _reject_missing_patients(self.patient_repository),
+                _count_inserted(self.statistics_repository)
+            )
+        except Exception as e:
+            raise Exception(f"Error al crear citas: {str(e)}")
+
+        for result in results:
+            if result.is_success() and result.id in built:
+                self.calendar.add(built[result.id])
+        return results
+
+    def delete_appointments(self, appointment_ids: Iterable[str], batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Elimina citas por lotes
+        """
+        try:
+            results = _delete_in_batches(appointment_ids, batch_size, self.appointment_repository, self.statistics_repository)
+        except Exception as e:
+            raise Exception(f"Error al eliminar citas: {str(e)}")
+
+        for result in results:
+            if result.outcome == BatchItemResultDTO.DELETED:
+                self.calendar.remove(result.id)
+        return results
+
     def get_all_appointments(self) -> List[AppointmentDTO]:
         """
         Obtiene todas las citas del sistema
@@ -165,6 +655,57 @@ class AppointmentUseCase:
         except Exception as e:
             raise Exception(f"Error al obtener citas: {str(e)}")
 
+    def get_all_appointments_with_patient(self) -> List[AppointmentDTO]:
+        """
+        Obtiene todas las citas con el nombre del paciente (patient_name) en una sola consulta
+        """
+        try:
+            rows = self.appointment_repository.find_all_with_patient()
+            return [AppointmentDTO.from_entity(appointment, patient_name) for appointment, patient_name in rows]
+        except Exception as e:
+            raise Exception(f"Error al obtener citas: {str(e)}")
+
+    def get_appointment_list(self) -> List[AppointmentListItemDTO]:
+        """
+        Obtiene las filas de la lista de citas con el nombre del paciente, proyectadas
+        desde una sola consulta sin crear entidades
+        """
+        try:
+            return self.appointment_repository.list_items_with_patient()
+        except Exception as e:
+            raise Exception(f"Error al obtener citas: {str(e)}")
+
+    def get_appointment_list_page(self, page_size: Optional[int] = None, page_token: Optional[str] = None) -> PageDTO:
+        """
+        Obtiene una página de la lista de citas (AppointmentListItemDTO) con el nombre del
+        paciente, ordenada por fecha y proyectada desde las filas sin crear entidades
+        """
+        try:
+            return _fetch_page(
+                self.appointment_repository.list_items_with_patient, self.appointment_repository.page_key,
+                None, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener citas: {str(e)}")
+
+    def get_appointments_page(self, page_size: Optional[int] = None, page_token: Optional[str] = None) -> PageDTO:
+        """
+        Obtiene una página de citas ordenadas por fecha
+        """
+        try:
+            return _fetch_page(
+                self.appointment_repository.find_all, self.appointment_repository.page_key,
+                AppointmentDTO.from_entity, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener citas: {str(e)}")
+
+    def iter_all_appointments(self) -> Iterator[AppointmentDTO]:
+        """
+        Recorre todas las citas sin mantenerlas en memoria
+        """
+        return _iter_dtos(self.appointment_repository.iter_all(), AppointmentDTO.from_entity)
+
     def get_appointments_by_patient(self, patient_id: str) -> List[AppointmentDTO]:
         """
         Obtiene todas las citas de un paciente específico
@@ -175,19 +716,65 @@ class AppointmentUseCase:
         except Exception as e:
             raise Exception(f"Error al obtener citas del paciente: {str(e)}")
 
+    def get_appointment_list_by_patient(self, patient_id: str) -> List[AppointmentListItemDTO]:
+        """
+        Obtiene las filas de la lista de citas de un paciente, proyectadas sin crear entidades
+        """
+        try:
+            return self.appointment_repository.list_items_by_patient(PatientId.from_string(patient_id))
+        except Exception as e:
+            raise Exception(f"Error al obtener citas del paciente: {str(e)}")
+
+    def get_appointment_notes(self, appointment_id: str) -> str:
+        """
+        Obtiene las notas de una cita, que las listas no incluyen
+        """
+        try:
+            notes = self.appointment_repository.find_notes(appointment_id)
+            if notes is None:
+                raise ValueError("Cita no encontrada")
+            return notes
+        except Exception as e:
+            raise Exception(f"Error al obtener notas de la cita: {str(e)}")
+
+    def get_appointments_by_patient_page(
+        self,
+        patient_id: str,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None
+    ) -> PageDTO:
+        """
+        Obtiene una página de las citas de un paciente específico
+        """
+        def fetch(limit: int, after: Optional[tuple]) -> List[Appointment]:
+            return self.appointment_repository.find_by_patient_id(
+                PatientId.from_string(patient_id), limit=limit, after=after
+            )
+
+        try:
+            return _fetch_page(
+                fetch, self.appointment_repository.page_key, AppointmentDTO.from_entity, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener citas del paciente: {str(e)}")
+
     def complete_appointment(self, appointment_id: str) -> AppointmentDTO:
         """
         Marca una cita como completada
         """
         try:
-            appointment = self.appointment_repository.find_by_id(appointment_id)
-            if not appointment:
-                raise ValueError("Cita no encontrada")
-                
-            updated_appointment = self.appointment_service.complete_appointment(appointment)
-            saved_appointment = self.appointment_repository.save(updated_appointment)
+            with UnitOfWork(self.appointment_repository):
+                appointment = self.appointment_repository.find_by_id(appointment_id)
+                if not appointment:
+                    raise ValueError("Cita no encontrada")
+                    
+                before = ReportService.counter_keys(appointment)
+                updated_appointment = self.appointment_service.complete_appointment(appointment)
+                saved_appointment = self.appointment_repository.save(updated_appointment)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_appointment))
+            self._index_appointment(saved_appointment)
             return AppointmentDTO.from_entity(saved_appointment)
-            
+                
         except Exception as e:
             raise Exception(f"Error al completar cita: {str(e)}")
 
@@ -196,38 +783,145 @@ class AppointmentUseCase:
         Cancela una cita médica
         """
         try:
-            appointment = self.appointment_repository.find_by_id(appointment_id)
-            if not appointment:
-                raise ValueError("Cita no encontrada")
-                
-            updated_appointment = self.appointment_service.cancel_appointment(appointment)
-            saved_appointment = self.appointment_repository.save(updated_appointment)
+            with UnitOfWork(self.appointment_repository):
+                appointment = self.appointment_repository.find_by_id(appointment_id)
+                if not appointment:
+                    raise ValueError("Cita no encontrada")
+                    
+                before = ReportService.counter_keys(appointment)
+                updated_appointment = self.appointment_service.cancel_appointment(appointment)
+                saved_appointment = self.appointment_repository.save(updated_appointment)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_appointment))
+            self._index_appointment(saved_appointment)
             return AppointmentDTO.from_entity(saved_appointment)
-            
+                
         except Exception as e:
             raise Exception(f"Error al cancelar cita: {str(e)}")
 
+    def reschedule_appointment(
+        self,
+        appointment_id: str,
+        date: datetime,
+        duration_minutes: Optional[int] = None
+    ) -> AppointmentDTO:
+        """
+        Cambia la fecha (y opcionalmente la duración) de una cita programada;
+        se rechaza si el doctor ya tiene otra cita superpuesta en el nuevo horario
+        """
+        try:
+            with UnitOfWork(self.appointment_repository):
+                appointment = self.appointment_repository.find_by_id(appointment_id)
+                if not appointment:
+                    raise ValueError("Cita no encontrada")
+                    
+                before = ReportService.counter_keys(appointment)
+                updated_appointment = self.appointment_service.reschedule_appointment(
+                    appointment, date, duration_minutes
+                )
+                self._check_conflicts(updated_appointment)
+                saved_appointment = self.appointment_repository.save(updated_appointment)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_appointment))
+            self._index_appointment(saved_appointment)
+            return AppointmentDTO.from_entity(saved_appointment)
+                
+        except Exception as e:
+            raise Exception(f"Error al reprogramar cita: {str(e)}")
+
+    def audit_conflicts(self) -> List[Tuple[AppointmentDTO, AppointmentDTO]]:
+        """
+        Revisa todas las citas programadas y devuelve los pares del mismo doctor que se superponen.
+        Recorre la tabla una vez, en orden de fecha, sin cargarla completa en memoria.
+        """
+        try:
+            appointments = self.appointment_repository.iter_by_status('scheduled')
+            return [
+                (AppointmentDTO.from_entity(first), AppointmentDTO.from_entity(second))
+                for first, second in self.appointment_service.find_conflicts(appointments)
+            ]
+        except Exception as e:
+            raise Exception(f"Error al auditar superposiciones de citas: {str(e)}")
+
     def get_upcoming_appointments(self, days: int = 7) -> List[AppointmentDTO]:
         """
-        Obtiene las citas próximas
+        Obtiene las citas próximas: programadas con fecha hasta dentro de 'days' días.
+        El filtro se resuelve en la base de datos con el índice (Estado, Fecha).
         """
         try:
-            all_appointments = self.appointment_repository.find_all()
-            upcoming_appointments = self.appointment_service.get_upcoming_appointments(all_appointments, days)
+            cutoff_date = self.appointment_service.upcoming_cutoff(days)
+            upcoming_appointments = self.appointment_repository.find_scheduled_between(None, cutoff_date)
             return [AppointmentDTO.from_entity(appointment) for appointment in upcoming_appointments]
         except Exception as e:
             raise Exception(f"Error al obtener citas próximas: {str(e)}")
 
+    def get_day_schedule(self, day: date, doctor_name: Optional[str] = None) -> List[AppointmentDTO]:
+        """
+        Obtiene las citas de un día, opcionalmente de un solo doctor, desde la agenda en memoria
+        """
+        try:
+            self.load_calendar()
+            return [AppointmentDTO.from_entity(appointment) for appointment in self.calendar.day(day, doctor_name)]
+        except Exception as e:
+            raise Exception(f"Error al obtener la agenda del día: {str(e)}")
+
+    def get_week_schedule(self, day: date, doctor_name: Optional[str] = None) -> List[AppointmentDTO]:
+        """
+        Obtiene las citas de la semana (lunes a domingo) que contiene el día indicado
+        """
+        try:
+            self.load_calendar()
+            return [AppointmentDTO.from_entity(appointment) for appointment in self.calendar.week(day, doctor_name)]
+        except Exception as e:
+            raise Exception(f"Error al obtener la agenda de la semana: {str(e)}")
+
+    def get_schedule_between(
+        self,
+        start: datetime,
+        end: datetime,
+        doctor_name: Optional[str] = None
+    ) -> List[AppointmentDTO]:
+        """
+        Obtiene las citas con fecha en [start, end), opcionalmente de un solo doctor
+        """
+        try:
+            self.load_calendar()
+            appointments = self.calendar.between(start, end, doctor_name)
+            return [AppointmentDTO.from_entity(appointment) for appointment in appointments]
+        except Exception as e:
+            raise Exception(f"Error al obtener la agenda: {str(e)}")
+
+    def load_calendar(self, reload: bool = False):
+        """
+        Carga la agenda desde el repositorio si aún no se cargó. Las escrituras de este caso
+        de uso la mantienen al día; los cambios hechos por otros procesos requieren reload=True.
+        """
+        if reload or not self.calendar.loaded:
+            self.calendar.load(self.appointment_repository.iter_all())
+
+    def _check_conflicts(self, appointment: Appointment):
+        """Rechaza la cita si se superpone con otra del mismo doctor; bloquea el rango hasta el commit"""
+        overlapping = self.appointment_repository.find_overlapping(
+            appointment.doctor_name, appointment.date, appointment.end,
+            exclude_id=appointment.id, for_update=True
+        )
+        self.appointment_service.ensure_no_conflicts(appointment, overlapping)
+
+    def _index_appointment(self, appointment: Appointment):
+        """Mantiene la agenda al día; si aún no se cargó, lo hará la primera consulta"""
+        if self.calendar.loaded:
+            self.calendar.add(appointment)
+
 
 class TreatmentUseCase:
     """
     Casos de uso para la gestión de tratamientos médicos
     """
     
-    def __init__(self, treatment_repository, patient_repository):
+    def __init__(self, treatment_repository, patient_repository, statistics_repository=None):
         self.treatment_repository = treatment_repository
         self.patient_repository = patient_repository
         self.treatment_service = TreatmentService()
+        # Contadores materializados del reporte; se actualizan en cada escritura
+        self.statistics_repository = statistics_repository
 
     def create_treatment(
         self,
@@ -240,23 +934,56 @@ class TreatmentUseCase:
         Crea un nuevo tratamiento médico
         """
         try:
-            patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
-            if not patient:
-                raise ValueError("Paciente no encontrado")
+            with UnitOfWork(self.treatment_repository):
+                patient = self.patient_repository.find_by_id(PatientId.from_string(patient_id))
+                if not patient:
+                    raise ValueError("Paciente no encontrado")
+                    
+                treatment = self.treatment_service.create_treatment(
+                    patient_id=patient.id,
+                    diagnosis=diagnosis,
+                    prescription=prescription,
+                    start_date=start_date
+                )
+                
+                saved_treatment = self.treatment_repository.save(treatment)
+                _update_counters(self.statistics_repository, [], ReportService.counter_keys(saved_treatment))
+                return TreatmentDTO.from_entity(saved_treatment)
                 
-            treatment = self.treatment_service.create_treatment(
-                patient_id=patient.id,
-                diagnosis=diagnosis,
-                prescription=prescription,
-                start_date=start_date
-            )
-            
-            saved_treatment = self.treatment_repository.save(treatment)
-            return TreatmentDTO.from_entity(saved_treatment)
-            
         except Exception as e:
             raise Exception(f"Error al crear tratamiento: {str(e)}")
 
+    def create_treatments(self, treatments_data: Iterable[dict], batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Crea tratamientos por lotes. Cada elemento es un diccionario con las claves
+        patient_id, diagnosis, prescription y start_date (opcional).
+        """
+        def build_treatment(data: dict) -> Treatment:
+            return self.treatment_service.create_treatment(
+                patient_id=PatientId.from_string(data['patient_id']),
+                diagnosis=data['diagnosis'],
+                prescription=data['prescription'],
+                start_date=data.get('start_date')
+            )
+
+        try:
+            return _create_in_batches(
+                treatments_data, batch_size, build_treatment, self.treatment_repository,
+                _reject_missing_patients(self.patient_repository),
+                _count_inserted(self.statistics_repository)
+            )
+        except Exception as e:
+            raise Exception(f"Error al crear tratamientos: {str(e)}")
+
+    def delete_treatments(self, treatment_ids: Iterable[str], batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Elimina tratamientos por lotes
+        """
+        try:
+            return _delete_in_batches(treatment_ids, batch_size, self.treatment_repository, self.statistics_repository)
+        except Exception as e:
+            raise Exception(f"Error al eliminar tratamientos: {str(e)}")
+
     def get_all_treatments(self) -> List[TreatmentDTO]:
         """
         Obtiene todos los tratamientos del sistema
@@ -267,6 +994,64 @@ class TreatmentUseCase:
         except Exception as e:
             raise Exception(f"Error al obtener tratamientos: {str(e)}")
 
+    def get_all_treatments_with_patient(self, status: Optional[str] = None) -> List[TreatmentDTO]:
+        """
+        Obtiene los tratamientos con el nombre del paciente (patient_name) en una sola consulta;
+        con 'status' solo los de ese estado
+        """
+        try:
+            rows = self.treatment_repository.find_all_with_patient(status=status)
+            return [TreatmentDTO.from_entity(treatment, patient_name) for treatment, patient_name in rows]
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos: {str(e)}")
+
+    def get_treatment_list(self, status: Optional[str] = None) -> List[TreatmentListItemDTO]:
+        """
+        Obtiene las filas de la lista de tratamientos con el nombre del paciente, proyectadas
+        desde una sola consulta sin crear entidades; con 'status' solo las de ese estado
+        """
+        try:
+            return self.treatment_repository.list_items_with_patient(status=status)
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos: {str(e)}")
+
+    def get_treatment_list_page(
+        self,
+        status: Optional[str] = None,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None
+    ) -> PageDTO:
+        """
+        Obtiene una página de la lista de tratamientos (TreatmentListItemDTO) con el nombre del
+        paciente, del más reciente al más antiguo; con 'status' solo los de ese estado.
+        El token solo es válido para el mismo 'status' con el que se obtuvo.
+        """
+        try:
+            return _fetch_page(
+                lambda limit, after: self.treatment_repository.list_items_with_patient(limit, after, status),
+                self.treatment_repository.page_key, None, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos: {str(e)}")
+
+    def get_treatments_page(self, page_size: Optional[int] = None, page_token: Optional[str] = None) -> PageDTO:
+        """
+        Obtiene una página de tratamientos, del más reciente al más antiguo
+        """
+        try:
+            return _fetch_page(
+                self.treatment_repository.find_all, self.treatment_repository.page_key,
+                TreatmentDTO.from_entity, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos: {str(e)}")
+
+    def iter_all_treatments(self) -> Iterator[TreatmentDTO]:
+        """
+        Recorre todos los tratamientos sin mantenerlos en memoria
+        """
+        return _iter_dtos(self.treatment_repository.iter_all(), TreatmentDTO.from_entity)
+
     def get_treatments_by_patient(self, patient_id: str) -> List[TreatmentDTO]:
         """
         Obtiene todos los tratamientos de un paciente específico
@@ -277,19 +1062,64 @@ class TreatmentUseCase:
         except Exception as e:
             raise Exception(f"Error al obtener tratamientos del paciente: {str(e)}")
 
+    def get_treatment_list_by_patient(self, patient_id: str) -> List[TreatmentListItemDTO]:
+        """
+        Obtiene las filas de la lista de tratamientos de un paciente, proyectadas sin crear entidades
+        """
+        try:
+            return self.treatment_repository.list_items_by_patient(PatientId.from_string(patient_id))
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos del paciente: {str(e)}")
+
+    def get_treatment_prescription(self, treatment_id: str) -> str:
+        """
+        Obtiene la prescripción completa de un tratamiento; las listas solo traen el comienzo
+        """
+        try:
+            prescription = self.treatment_repository.find_prescription(treatment_id)
+            if prescription is None:
+                raise ValueError("Tratamiento no encontrado")
+            return prescription
+        except Exception as e:
+            raise Exception(f"Error al obtener prescripción: {str(e)}")
+
+    def get_treatments_by_patient_page(
+        self,
+        patient_id: str,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None
+    ) -> PageDTO:
+        """
+        Obtiene una página de los tratamientos de un paciente específico
+        """
+        def fetch(limit: int, after: Optional[tuple]) -> List[Treatment]:
+            return self.treatment_repository.find_by_patient_id(
+                PatientId.from_string(patient_id), limit=limit, after=after
+            )
+
+        try:
+            return _fetch_page(
+                fetch, self.treatment_repository.page_key, TreatmentDTO.from_entity, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos del paciente: {str(e)}")
+
     def complete_treatment(self, treatment_id: str) -> TreatmentDTO:
         """
         Marca un tratamiento como completado
         """
         try:
-            treatment = self.treatment_repository.find_by_id(treatment_id)
-            if not treatment:
-                raise ValueError("Tratamiento no encontrado")
+            with UnitOfWork(self.treatment_repository):
+                treatment = self.treatment_repository.find_by_id(treatment_id)
+                if not treatment:
+                    raise ValueError("Tratamiento no encontrado")
+                    
+                before = ReportService.counter_keys(treatment)
+                updated_treatment = self.treatment_service.complete_treatment(treatment)
+                saved_treatment = self.treatment_repository.save(updated_treatment)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_treatment))
+                return TreatmentDTO.from_entity(saved_treatment)
                 
-            updated_treatment = self.treatment_service.complete_treatment(treatment)
-            saved_treatment = self.treatment_repository.save(updated_treatment)
-            return TreatmentDTO.from_entity(saved_treatment)
-            
         except Exception as e:
             raise Exception(f"Error al completar tratamiento: {str(e)}")
 
@@ -298,14 +1128,17 @@ class TreatmentUseCase:
         Discontinúa un tratamiento
         """
         try:
-            treatment = self.treatment_repository.find_by_id(treatment_id)
-            if not treatment:
-                raise ValueError("Tratamiento no encontrado")
+            with UnitOfWork(self.treatment_repository):
+                treatment = self.treatment_repository.find_by_id(treatment_id)
+                if not treatment:
+                    raise ValueError("Tratamiento no encontrado")
+                    
+                before = ReportService.counter_keys(treatment)
+                updated_treatment = self.treatment_service.discontinue_treatment(treatment)
+                saved_treatment = self.treatment_repository.save(updated_treatment)
+                _update_counters(self.statistics_repository, before, ReportService.counter_keys(saved_treatment))
+                return TreatmentDTO.from_entity(saved_treatment)
                 
-            updated_treatment = self.treatment_service.discontinue_treatment(treatment)
-            saved_treatment = self.treatment_repository.save(updated_treatment)
-            return TreatmentDTO.from_entity(saved_treatment)
-            
         except Exception as e:
             raise Exception(f"Error al discontinuar tratamiento: {str(e)}")
 
@@ -314,28 +1147,65 @@ class TreatmentUseCase:
         Obtiene todos los tratamientos activos
         """
         try:
-            all_treatments = self.treatment_repository.find_all()
-            active_treatments = self.treatment_service.get_active_treatments(all_treatments)
+            active_treatments = self.treatment_repository.find_by_status('active')
             return [TreatmentDTO.from_entity(treatment) for treatment in active_treatments]
         except Exception as e:
             raise Exception(f"Error al obtener tratamientos activos: {str(e)}")
 
+    def get_treatments_by_status_page(
+        self,
+        status: str,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None
+    ) -> PageDTO:
+        """
+        Obtiene una página de los tratamientos en el estado indicado, del más reciente al más antiguo
+        """
+        def fetch(limit: int, after: Optional[tuple]) -> List[Treatment]:
+            return self.treatment_repository.find_by_status(status, limit=limit, after=after)
+
+        try:
+            return _fetch_page(
+                fetch, self.treatment_repository.page_key, TreatmentDTO.from_entity, page_size, page_token
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener tratamientos por estado: {str(e)}")
+
 
 class ReportUseCase:
     """
     Casos de uso para la generación de reportes
     """
     
-    def __init__(self, patient_repository, appointment_repository, treatment_repository):
+    def __init__(
+        self,
+        patient_repository,
+        appointment_repository,
+        treatment_repository,
+        report_repository=None,
+        statistics_repository=None,
+        recent_patients_limit: Optional[int] = None
+    ):
         self.patient_repository = patient_repository
         self.appointment_repository = appointment_repository
         self.treatment_repository = treatment_repository
+        # Pacientes recientes que lista el reporte desde la base de datos
+        self.recent_patients_limit = recent_patients_limit or REPORT_CONFIG['recent_patients_limit']
+        # Con un repositorio de reportes los conteos se calculan en la base de datos
+        self.report_repository = report_repository
+        # Con contadores materializados (y el repositorio de reportes) el reporte se lee sin recalcular
+        self.statistics_repository = statistics_repository
         self.report_service = ReportService()
 
     def generate_patient_report(self) -> PatientReportDTO:
         """
         Genera un reporte completo de pacientes
         """
+        if self.report_repository is not None and self.statistics_repository is not None:
+            return self._generate_materialized_report()
+        if self.report_repository is not None:
+            return self._generate_aggregated_report()
+
         try:
             patients = self.patient_repository.find_all()
             appointments = self.appointment_repository.find_all()
@@ -345,3 +1215,98 @@ class ReportUseCase:
             
         except Exception as e:
             raise Exception(f"Error al generar reporte: {str(e)}")
+
+    def _generate_aggregated_report(self) -> PatientReportDTO:
+        """
+        Genera el reporte con consultas de agregación, en una sola conexión y transacción,
+        de modo que el tiempo no depende de cuántas filas tengan las tablas
+        """
+        try:
+            now = datetime.now()
+            with UnitOfWork(self.report_repository):
+                patients_by_gender = self.report_repository.count_patients_by_gender()
+                patients_by_age_range = self.report_repository.count_patients_by_age_range(
+                    self.report_service.AGE_RANGES
+                )
+                recent_patients, recent_patients_total = self._recent_patients(now)
+                active_treatments = self.report_repository.count_treatments_by_status('active')
+                upcoming_appointments = self.report_repository.count_appointments_after('scheduled', now)
+
+            return self.report_service.build_patient_report(
+                patients_by_gender, patients_by_age_range, recent_patients,
+                active_treatments, upcoming_appointments, recent_patients_total
+            )
+            
+        except Exception as e:
+            raise Exception(f"Error al generar reporte: {str(e)}")
+
+    def _generate_materialized_report(self) -> PatientReportDTO:
+        """
+        Genera el reporte leyendo los contadores materializados. Las citas próximas suman
+        los contadores de los días siguientes más las citas de hoy posteriores a la hora actual.
+        """
+        try:
+            now = datetime.now()
+            service = self.report_service
+            end_of_today = datetime(now.year, now.month, now.day) + timedelta(days=1)
+            with UnitOfWork(self.statistics_repository):
+                counters = self.statistics_repository.read_counters([
+                    service.GENDER_COUNTER_PREFIX,
+                    service.AGE_RANGE_COUNTER_PREFIX,
+                    service.ACTIVE_TREATMENTS_COUNTER
+                ])
+                upcoming_appointments = self.statistics_repository.sum_after(
+                    service.SCHEDULED_DAY_COUNTER_PREFIX, service.scheduled_day_counter(now)
+                )
+                upcoming_appointments += self.report_repository.count_appointments_after('scheduled', now, end_of_today)
+                recent_patients, recent_patients_total = self._recent_patients(now)
+
+            return service.build_report_from_counters(
+                counters, recent_patients, upcoming_appointments, recent_patients_total
+            )
+            
+        except Exception as e:
+            raise Exception(f"Error al generar reporte: {str(e)}")
+
+    def _recent_patients(self, now: datetime) -> Tuple[List[Patient], int]:
+        """
+        Pacientes recientes más nuevos (como máximo recent_patients_limit) y el total de
+        pacientes recientes, contado con COUNT(*): el costo no crece con las altas
+        """
+        since = self.report_service.recent_patients_since(now)
+        recent_patients = self.patient_repository.find_created_since(since, self.recent_patients_limit)
+        return recent_patients, self.report_repository.count_patients_created_since(since)
+
+    def reconcile_statistics(self, apply: bool = True) -> Dict[str, Tuple[int, int]]:
+        """
+        Recalcula los contadores del reporte desde las tablas y los compara con los guardados.
+        Devuelve las diferencias como {clave: (guardado, esperado)}; con apply=True las corrige
+        en la misma transacción. Conviene ejecutarlo con poca actividad de escritura.
+        """
+        if self.report_repository is None or self.statistics_repository is None:
+            raise Exception("Error al reconciliar estadísticas: se requieren los repositorios de reportes y estadísticas")
+
+        try:
+            with UnitOfWork(self.statistics_repository):
+                expected = self.report_service.expected_counters(
+                    self.report_repository.count_patients_by_gender(),
+                    self.report_repository.count_patients_by_age_range(self.report_service.AGE_RANGES),
+                    self.report_repository.count_treatments_by_status('active'),
+                    self.report_repository.count_appointments_by_day('scheduled')
+                )
+                stored = self.statistics_repository.read_all()
+
+                drift = {
+                    key: (stored.get(key, 0), expected.get(key, 0))
+                    for key in set(stored) | set(expected)
+                    if stored.get(key, 0) != expected.get(key, 0)
+                }
+                if apply and drift:
+                    self.statistics_repository.apply_deltas({
+                        key: expected_value - stored_value
+                        for key, (stored_value, expected_value) in drift.items()
+                    })
+                return dict(sorted(drift.items()))
+            
+        except Exception as e:
+            raise Exception(f"Error al reconciliar estadísticas: {str(e)}")
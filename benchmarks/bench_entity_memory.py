@@ -0,0 +1,86 @@
+"""
+Memoria por paciente cargado: entidad Patient, sus cinco value objects y el PatientDTO,
+con las clases con __slots__ (actuales) y con las mismas dataclasses con __dict__ (antes).
+Mide con tracemalloc; no requiere base de datos.
+
+    python -m benchmarks.bench_entity_memory
+    python -m benchmarks.bench_entity_memory --rows 100000 1000000
+
+Las filas (textos y fechas) se generan antes de medir, como si vinieran del cursor, de modo
+que la cifra es el costo de los objetos del dominio y no el de los datos.
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+from domain.dto import PatientDTO
+from domain.entities import Patient
+from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+
+
+def build_rows(count: int) -> list:
+    """Filas como las devolvería el cursor: (id, nombre, edad, género, historial, contacto, fecha)"""
+    created_at = datetime(2024, 1, 1)
+    return [
+        (
+            f"{i:026d}", f"Paciente {i}", i % 100, Gender.VALID_GENDERS[i % len(Gender.VALID_GENDERS)],
+            f"Historial {i}", f"paciente{i}@correo.cl", created_at + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ]
+
+
+def load(rows: list, slotted: bool) -> list:
+    """Hidrata las filas como (Patient, PatientDTO) con las clases con o sin __slots__"""
+    def variant(cls):
+        return cls if slotted else cls.__unslotted__
+
+    patient_cls, dto_cls = variant(Patient), variant(PatientDTO)
+    id_cls, age_cls, gender_cls = variant(PatientId), variant(Age), variant(Gender)
+    contact_cls, history_cls = variant(Contact), variant(MedicalHistory)
+
+    loaded = []
+    for patient_id, name, age, gender, history, contact, created_at in rows:
+        patient = patient_cls(
+            id_cls(patient_id), name, age_cls(age), gender_cls(gender),
+            history_cls(history), contact_cls(contact), created_at, created_at
+        )
+        loaded.append((patient, dto_cls.from_entity(patient)))
+    return loaded
+
+
+def measure(rows: list, slotted: bool) -> float:
+    """Devuelve los bytes por paciente (entidad, value objects y DTO)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        loaded = load(rows, slotted)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # No se cuenta la lista que guarda los pares, solo los objetos
+    container = len(loaded) * 8 + 56
+    del loaded
+    return (after - before - container) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por paciente con y sin __slots__")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000],
+                        help="Cantidades de pacientes a medir")
+    args = parser.parse_args()
+
+    print(f"{'Pacientes':>12}  {'Con __dict__':>14}  {'Con __slots__':>14}  {'Ahorro':>8}")
+    for count in args.rows:
+        rows = build_rows(count)
+        with_dict = measure(rows, slotted=False)
+        with_slots = measure(rows, slotted=True)
+        saving = 1 - with_slots / with_dict
+        print(f"{count:>12,}  {with_dict:>11.0f} B  {with_slots:>11.0f} B  {saving:>7.0%}")
+        del rows
+
+
+if __name__ == "__main__":
+    main()
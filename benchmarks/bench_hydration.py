@@ -0,0 +1,108 @@
+"""
+Filas por segundo hidratadas como Patient: la lectura anterior (cursor con diccionarios y
+value objects validados en __post_init__) contra la actual (cursor de tuplas en el orden de
+select_columns y value objects creados con from_trusted). No requiere base de datos: las filas
+se generan antes de medir, como si vinieran del cursor.
+
+    python -m benchmarks.bench_hydration
+    python -m benchmarks.bench_hydration --rows 1000000 --repeat 5
+"""
+import argparse
+import gc
+import time
+from datetime import datetime, timedelta
+from domain.entities import Patient
+from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+from infrastructure.mysql_repository import MySQLPatientRepository
+
+
+def build_rows(count: int) -> list:
+    """Filas de Pacientes como tuplas, en el orden de select_columns"""
+    created_at = datetime(2024, 1, 1)
+    genders = Gender.VALID_GENDERS
+    return [
+        (
+            f"{i:026d}", f"Paciente {i}", i % 100, genders[i % len(genders)],
+            f"Historial {i}", f"paciente{i}@correo.cl", created_at + timedelta(seconds=i), created_at
+        )
+        for i in range(count)
+    ]
+
+
+def validated_row_to_patient(row: dict) -> Patient:
+    """Conversión anterior: por nombre de columna y validando cada value object"""
+    return Patient(
+        id=PatientId.from_string(row['ID']),
+        name=row['Nombre'],
+        age=Age(row['Edad']),
+        gender=Gender(row['Genero']),
+        medical_history=MedicalHistory(row['HistorialMedico']),
+        contact=Contact(row['Contacto']),
+        created_at=row['CreatedAt'],
+        updated_at=row['UpdatedAt']
+    )
+
+
+def validated_tuple_to_patient(row: tuple) -> Patient:
+    """Tupla en el orden de select_columns, validando cada value object"""
+    patient_id, name, age, gender, medical_history, contact, created_at, updated_at = row
+    return Patient(
+        PatientId(patient_id), name, Age(age), Gender(gender),
+        MedicalHistory(medical_history), Contact(contact), created_at, updated_at
+    )
+
+
+def hydrate_dict_validated(rows: list) -> list:
+    # Un cursor con diccionarios arma dict(zip(columnas, fila)) por cada fila
+    columns = MySQLPatientRepository.select_columns
+    return [validated_row_to_patient(dict(zip(columns, row))) for row in rows]
+
+
+def hydrate_tuple_validated(rows: list) -> list:
+    return [validated_tuple_to_patient(row) for row in rows]
+
+
+def hydrate_tuple_trusted(rows: list) -> list:
+    row_to_patient = MySQLPatientRepository()._row_to_patient
+    return [row_to_patient(row) for row in rows]
+
+
+def best_rate(hydrate, rows: list, repeat: int) -> float:
+    """Mejor resultado (filas por segundo) de 'repeat' corridas, sin el recolector de ciclos"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            hydrate(rows)
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return len(rows) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filas por segundo hidratadas como Patient")
+    parser.add_argument('--rows', type=int, default=200000, help="Cantidad de filas")
+    parser.add_argument('--repeat', type=int, default=5, help="Corridas por variante (se toma la mejor)")
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    variants = (
+        ("Diccionario + validación (antes)", hydrate_dict_validated),
+        ("Tupla + validación", hydrate_tuple_validated),
+        ("Tupla + from_trusted (actual)", hydrate_tuple_trusted),
+    )
+
+    baseline = None
+    print(f"{'Variante':<34}  {'Filas/s':>12}  {'Relativo':>8}")
+    for name, hydrate in variants:
+        rate = best_rate(hydrate, rows, args.repeat)
+        baseline = baseline or rate
+        print(f"{name:<34}  {rate:>12,.0f}  {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
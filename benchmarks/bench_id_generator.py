@@ -0,0 +1,91 @@
+"""
+Benchmark del generador de IDs (domain/id_generator.py): genera IDs en varios hilos y en
+varios procesos a la vez, verifica que no haya repetidos ni retrocesos dentro de cada hilo
+y mide el rendimiento total. No requiere base de datos.
+
+    python -m benchmarks.bench_id_generator
+    python -m benchmarks.bench_id_generator --workers 8 --ids-per-worker 200000
+
+Los procesos se crean con fork (donde existe) después de que el padre ya generó IDs, para
+verificar que el hijo no continúa la secuencia heredada. Termina con código 1 si hay IDs
+repetidos o si el rendimiento queda por debajo de --target.
+"""
+import argparse
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from domain.id_generator import new_id
+
+
+def generate(count: int) -> list:
+    """Genera 'count' IDs con el generador compartido del proceso"""
+    return [new_id() for _ in range(count)]
+
+
+def run_threads(workers: int, count: int) -> tuple:
+    """Devuelve (listas de IDs por hilo, segundos) generando en 'workers' hilos a la vez"""
+    results = [None] * workers
+    start_barrier = threading.Barrier(workers + 1)
+
+    def worker(position: int):
+        start_barrier.wait()
+        results[position] = generate(count)
+
+    threads = [threading.Thread(target=worker, args=(position,)) for position in range(workers)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def run_processes(workers: int, count: int) -> tuple:
+    """Devuelve (listas de IDs por proceso, segundos) generando en 'workers' procesos a la vez"""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else methods[0])
+
+    # El padre genera antes de crear los procesos: con fork, el estado del generador se hereda
+    generate(1000)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        # Arranca los procesos antes de medir
+        list(executor.map(generate, [1] * workers))
+        started = time.perf_counter()
+        results = list(executor.map(generate, [count] * workers))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def check(name: str, batches: list, elapsed: float, target: float) -> bool:
+    """Imprime el resultado de una prueba y devuelve True si pasó"""
+    total = sum(len(batch) for batch in batches)
+    unique = len(set().union(*batches))
+    ordered = all(batch == sorted(batch) for batch in batches)
+    rate = total / elapsed
+
+    passed = unique == total and ordered and rate >= target
+    print(
+        f"{name:<10} {total:>10,} IDs  {unique:>10,} únicos  {'ordenados' if ordered else 'DESORDENADOS':<12}"
+        f"  {rate:>12,.0f} IDs/s  {'OK' if passed else 'FALLA'}"
+    )
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del generador de IDs")
+    parser.add_argument('--workers', type=int, default=4, help="Hilos y procesos simultáneos")
+    parser.add_argument('--ids-per-worker', type=int, default=100000, help="IDs generados por cada hilo o proceso")
+    parser.add_argument('--target', type=float, default=100000, help="Rendimiento mínimo (IDs por segundo)")
+    args = parser.parse_args()
+
+    passed = check("Hilos", *run_threads(args.workers, args.ids_per_worker), args.target)
+    passed = check("Procesos", *run_processes(args.workers, args.ids_per_worker), args.target) and passed
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
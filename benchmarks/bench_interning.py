@@ -0,0 +1,138 @@
+"""
+Efecto del internado (domain/interning.py) en las citas y pacientes leídos de la base de datos:
+memoria por cita con y sin internar doctor y estado, y tiempo de los filtros por estado
+(AppointmentService.get_upcoming_appointments) y del reporte (ReportService) cuando los estados
+y géneros son objetos compartidos o una copia por fila. No requiere base de datos.
+
+    python -m benchmarks.bench_interning
+    python -m benchmarks.bench_interning --rows 1000000
+
+Las filas se generan con una cadena nueva por valor, como las entrega el conector de MySQL.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from domain.entities import Appointment, Patient
+from domain.interning import APPOINTMENT_STATUSES, DOCTOR_NAMES
+from domain.services import AppointmentService, ReportService
+from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+from infrastructure.mysql_repository import MySQLAppointmentRepository, MySQLPatientRepository
+
+
+def fresh(text: str) -> str:
+    """Copia de 'text' que no es el mismo objeto (como una cadena leída del cursor)"""
+    return (text + '.')[:-1]
+
+
+def build_appointment_rows(count: int) -> list:
+    start = datetime.now() - timedelta(days=30)
+    return [
+        (
+            f"apt_{i:026d}", f"{i:026d}", start + timedelta(minutes=15 * i), fresh(f"Dr. Doctor {i % 40}"),
+            f"Control {i}", fresh(APPOINTMENT_STATUSES[i % 3]), None, 30
+        )
+        for i in range(count)
+    ]
+
+
+def build_patient_rows(count: int) -> list:
+    created_at = datetime(2024, 1, 1)
+    genders = Gender.VALID_GENDERS
+    return [
+        (
+            f"{i:026d}", f"Paciente {i}", i % 100, fresh(genders[i % len(genders)]),
+            f"Historial {i}", f"paciente{i}@correo.cl", created_at, created_at
+        )
+        for i in range(count)
+    ]
+
+
+def plain_appointment(row: tuple) -> Appointment:
+    """Cita con las cadenas tal como vienen en la fila, sin internar"""
+    appointment_id, patient_id, date, doctor_name, reason, status, notes, duration_minutes = row
+    return Appointment(appointment_id, PatientId(patient_id), date, doctor_name, reason, status, notes, duration_minutes)
+
+
+def plain_patient(row: tuple) -> Patient:
+    """Paciente con un Gender nuevo por fila"""
+    patient_id, name, age, gender, medical_history, contact, created_at, updated_at = row
+    return Patient(
+        PatientId(patient_id), name, Age.from_trusted(age), Gender(gender),
+        MedicalHistory.from_trusted(medical_history), Contact.from_trusted(contact), created_at, updated_at
+    )
+
+
+def measure_memory(build_rows, count: int, row_to_entity) -> float:
+    """
+    Bytes que retiene cada entidad hidratada: las filas se crean y se descartan dentro de la
+    medición, así cuenta lo que la entidad conserva de la fila (sin la lista que las guarda)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        rows = build_rows(count)
+        entities = [row_to_entity(row) for row in rows]
+        del rows
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    container = len(entities) * 8 + 56
+    del entities
+    return (after - before - container) / count
+
+
+def best_time(function, repeat: int = 5) -> float:
+    """Mejor tiempo (segundos) de 'repeat' corridas, sin el recolector de ciclos"""
+    best = None
+    for _ in range(repeat):
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria y comparaciones con y sin internado")
+    parser.add_argument('--rows', type=int, default=200000, help="Cantidad de citas y de pacientes")
+    args = parser.parse_args()
+
+    interned_appointment = MySQLAppointmentRepository()._row_to_appointment
+    interned_patient = MySQLPatientRepository()._row_to_patient
+
+    print(f"{'':<36}  {'Sin internar':>14}  {'Internado':>14}")
+    plain_bytes = measure_memory(build_appointment_rows, args.rows, plain_appointment)
+    interned_bytes = measure_memory(build_appointment_rows, args.rows, interned_appointment)
+    print(f"{'Memoria por cita':<36}  {plain_bytes:>12.0f} B  {interned_bytes:>12.0f} B")
+    plain_bytes = measure_memory(build_patient_rows, args.rows, plain_patient)
+    interned_bytes = measure_memory(build_patient_rows, args.rows, interned_patient)
+    print(f"{'Memoria por paciente':<36}  {plain_bytes:>12.0f} B  {interned_bytes:>12.0f} B")
+
+    appointment_rows = build_appointment_rows(args.rows)
+    patient_rows = build_patient_rows(args.rows)
+
+    plain = ([plain_patient(row) for row in patient_rows], [plain_appointment(row) for row in appointment_rows])
+    interned = ([interned_patient(row) for row in patient_rows], [interned_appointment(row) for row in appointment_rows])
+
+    timings = []
+    for patients, appointments in (plain, interned):
+        upcoming = best_time(lambda: AppointmentService.get_upcoming_appointments(appointments, days=3650))
+        report = best_time(lambda: ReportService.generate_patient_report(patients, appointments, []))
+        timings.append((upcoming, report))
+
+    (plain_upcoming, plain_report), (interned_upcoming, interned_report) = timings
+    print(f"{'get_upcoming_appointments':<36}  {plain_upcoming * 1000:>11.1f} ms  {interned_upcoming * 1000:>11.1f} ms")
+    print(f"{'ReportService.generate_patient_report':<36}  {plain_report * 1000:>11.1f} ms  {interned_report * 1000:>11.1f} ms")
+    print(f"Nombres de doctor internados: {len(DOCTOR_NAMES)}")
+
+
+if __name__ == "__main__":
+    main()
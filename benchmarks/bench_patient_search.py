@@ -0,0 +1,70 @@
+"""
+Benchmark de la búsqueda de pacientes por texto (FULLTEXT) frente a LIKE '%término%'.
+
+Requiere la base de datos configurada en config.py con datos de carga, por ejemplo:
+
+    python insert_sample_data.py --skip-samples --synthetic-patients 1000000
+    python -m benchmarks.bench_patient_search
+"""
+import argparse
+import statistics
+import time
+from config import SEARCH_CONFIG
+from domain.dto import PatientSearchDTO
+from infrastructure.migrations import ensure_schema
+from infrastructure.mysql_repository import MySQLPatientRepository
+
+
+# Incluye variantes sin tilde para verificar que la búsqueda ignora acentos
+SEARCH_TERMS = [
+    'José', 'jose', 'Núñez', 'nunez', 'María López', 'maria lopez',
+    'Begoña', 'begona', 'diabetes', 'castillo araya', 'ibanez', 'sofia.rojas'
+]
+
+
+def measure(search, terms, repetitions: int) -> list:
+    """Ejecuta cada término varias veces y devuelve las latencias en milisegundos"""
+    latencies = []
+    for _ in range(repetitions):
+        for term in terms:
+            started = time.perf_counter()
+            search(term)
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def summarize(name: str, latencies: list):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<28} p50 {statistics.median(ordered):8.1f} ms   p95 {p95:8.1f} ms   máx {ordered[-1]:8.1f} ms")
+    return p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la búsqueda de pacientes")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--skip-like', action='store_true', help="No medir la búsqueda LIKE anterior")
+    args = parser.parse_args()
+
+    ensure_schema()
+    repository = MySQLPatientRepository()
+
+    # Calentar el pool y la caché de páginas de InnoDB
+    measure(repository.search_text, SEARCH_TERMS, 1)
+
+    for term in ('José', 'jose'):
+        print(f"'{term}': {len(repository.search_text(term))} resultados")
+
+    target = SEARCH_CONFIG['latency_target_ms']
+    p95 = summarize("FULLTEXT (search_text)", measure(repository.search_text, SEARCH_TERMS, args.repetitions))
+
+    if not args.skip_like:
+        def like_search(term):
+            return repository.search(PatientSearchDTO(name=term), limit=SEARCH_CONFIG['max_results'])
+        summarize("LIKE '%término%' (search)", measure(like_search, SEARCH_TERMS, args.repetitions))
+
+    print(f"Objetivo p95 < {target} ms: {'CUMPLE' if p95 < target else 'NO CUMPLE'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Tiempo por carga de pantalla con las dos formas de leer las listas: fila → entidad con value
+objects → DTO (antes) y proyección de lectura, que selecciona solo las columnas de la lista y crea
+el DTO directamente desde la fila (PatientListItemDTO, AppointmentListItemDTO, TreatmentListItemDTO).
+
+    python insert_sample_data.py --skip-samples --synthetic-patients 100000
+    python -m benchmarks.bench_read_models
+    python -m benchmarks.bench_read_models --term garcia --repeat 10
+
+Cada pantalla se carga --repeat veces con cada método y se informa el mejor tiempo.
+"""
+import argparse
+import time
+from application.use_cases import PatientUseCase, AppointmentUseCase, TreatmentUseCase
+from infrastructure.migrations import ensure_schema
+from infrastructure.mysql_repository import (
+    MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository
+)
+
+
+def best_time(load, repeat: int) -> tuple:
+    """Devuelve (filas, mejor tiempo en milisegundos) de 'repeat' cargas"""
+    best = None
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = load()
+        elapsed = (time.perf_counter() - started) * 1000
+        rows = len(result.items) if hasattr(result, 'items') else len(result)
+        best = elapsed if best is None else min(best, elapsed)
+    return rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entidades contra proyecciones de lectura por pantalla")
+    parser.add_argument('--term', default='paciente', help="Término de la búsqueda de pacientes")
+    parser.add_argument('--repeat', type=int, default=5, help="Cargas por pantalla y método (se toma la mejor)")
+    args = parser.parse_args()
+
+    ensure_schema()
+    patient_repository = MySQLPatientRepository()
+    patients = PatientUseCase(patient_repository)
+    appointments = AppointmentUseCase(MySQLAppointmentRepository(), patient_repository)
+    treatments = TreatmentUseCase(MySQLTreatmentRepository(), patient_repository)
+
+    first_page = patients.get_patient_list_page(page_size=1).items
+    patient_id = first_page[0].id if first_page else None
+
+    # (pantalla, carga con entidades, carga con la proyección)
+    screens = [
+        ("Lista de pacientes", patients.get_patients_page, patients.get_patient_list_page),
+        ("Búsqueda de pacientes",
+         lambda: patients.search_patients_text(args.term), lambda: patients.search_patient_list_text(args.term)),
+        ("Citas", appointments.get_all_appointments_with_patient, appointments.get_appointment_list),
+        ("Tratamientos activos",
+         lambda: treatments.get_all_treatments_with_patient('active'), lambda: treatments.get_treatment_list('active')),
+        ("Tratamientos (todos)", treatments.get_all_treatments_with_patient, treatments.get_treatment_list),
+    ]
+    if patient_id is not None:
+        screens += [
+            ("Citas del paciente",
+             lambda: appointments.get_appointments_by_patient(patient_id),
+             lambda: appointments.get_appointment_list_by_patient(patient_id)),
+            ("Tratamientos del paciente",
+             lambda: treatments.get_treatments_by_patient(patient_id),
+             lambda: treatments.get_treatment_list_by_patient(patient_id)),
+        ]
+
+    print(f"{'Pantalla':<26} {'Filas':>8}  {'Entidades':>12}  {'Proyección':>12}  {'Mejora':>7}")
+    for name, load_entities, load_projection in screens:
+        rows, entities_ms = best_time(load_entities, args.repeat)
+        _, projection_ms = best_time(load_projection, args.repeat)
+        speedup = entities_ms / projection_ms if projection_ms else float('inf')
+        print(f"{name:<26} {rows:>8,}  {entities_ms:>9.1f} ms  {projection_ms:>9.1f} ms  {speedup:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
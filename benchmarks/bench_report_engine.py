@@ -0,0 +1,122 @@
+"""
+Benchmark del reporte de pacientes: ReportService.generate_patient_report (recorre entidades)
+frente a VectorizedReportEngine (columnas de NumPy). No requiere base de datos.
+
+    pip install numpy
+    python -m benchmarks.bench_report_engine
+    python -m benchmarks.bench_report_engine --rows 1000000 10000000 --python-max-rows 1000000
+
+El motor de Python necesita una entidad por fila en memoria; por encima de --python-max-rows
+su tiempo se extrapola linealmente desde el mayor tamaño medido (su costo es O(n)).
+"""
+import argparse
+import time
+from datetime import datetime
+import numpy as np
+from domain.analytics import (
+    ReportColumns, VectorizedReportEngine, GENDER_CATEGORIES, APPOINTMENT_STATUSES, TREATMENT_STATUSES
+)
+from domain.entities import Patient, Appointment, Treatment
+from domain.services import ReportService
+from domain.value_objects import Age, Gender, MedicalHistory, Contact
+
+
+# Citas y tratamientos generados por cada paciente
+APPOINTMENTS_PER_PATIENT = 2
+TREATMENTS_PER_PATIENT = 1
+DAYS_OF_HISTORY = 730
+
+
+def synthetic_columns(rows: int, now: datetime, seed: int = 42) -> ReportColumns:
+    """Genera columnas aleatorias de 'rows' pacientes con sus citas y tratamientos"""
+    rng = np.random.default_rng(seed)
+    now64 = np.datetime64(now, 'us')
+    day = np.timedelta64(1, 'D').astype('timedelta64[us]')
+    appointments = rows * APPOINTMENTS_PER_PATIENT
+    treatments = rows * TREATMENTS_PER_PATIENT
+
+    return ReportColumns(
+        ages=rng.integers(0, 101, rows, dtype=np.int16),
+        gender_codes=rng.integers(0, len(GENDER_CATEGORIES), rows, dtype=np.int8),
+        created_at=now64 - rng.integers(0, DAYS_OF_HISTORY, rows) * day,
+        appointment_status_codes=rng.integers(0, len(APPOINTMENT_STATUSES), appointments, dtype=np.int8),
+        appointment_dates=now64 + rng.integers(-DAYS_OF_HISTORY, DAYS_OF_HISTORY, appointments) * day,
+        treatment_status_codes=rng.integers(0, len(TREATMENT_STATUSES), treatments, dtype=np.int8)
+    )
+
+
+def to_entities(columns: ReportColumns) -> tuple:
+    """Construye las mismas filas como entidades, para el motor de Python"""
+    created_at = columns.created_at.astype(datetime)
+    patients = [
+        Patient(None, 'Paciente', Age(int(age)), Gender(GENDER_CATEGORIES[code]),
+                MedicalHistory(''), Contact('contacto'), created, created)
+        for age, code, created in zip(columns.ages, columns.gender_codes, created_at)
+    ]
+    patient_id = patients[0].id
+    appointments = [
+        Appointment(f'apt_{i}', patient_id, date, 'Dr. Benchmark', 'Control', APPOINTMENT_STATUSES[code])
+        for i, (date, code) in enumerate(zip(columns.appointment_dates.astype(datetime),
+                                             columns.appointment_status_codes))
+    ]
+    treatments = [
+        Treatment(f'trt_{i}', patient_id, 'Diagnóstico', 'Prescripción', created_at[0],
+                  status=TREATMENT_STATUSES[code])
+        for i, code in enumerate(columns.treatment_status_codes)
+    ]
+    return patients, appointments, treatments
+
+
+def timed(function, *args) -> tuple:
+    """Ejecuta function(*args) y devuelve (resultado, milisegundos)"""
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def same_counts(legacy, vectorized) -> bool:
+    """Compara los conteos; sin entidades el motor vectorizado no arma los DTO de recientes"""
+    return (legacy.total_patients == vectorized.total_patients
+            and legacy.patients_by_gender == vectorized.patients_by_gender
+            and legacy.patients_by_age_range == vectorized.patients_by_age_range
+            and legacy.active_treatments == vectorized.active_treatments
+            and legacy.upcoming_appointments == vectorized.upcoming_appointments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor de reportes vectorizado")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000000, 10000000],
+                        help="Cantidades de pacientes a medir")
+    parser.add_argument('--python-max-rows', type=int, default=1000000,
+                        help="Máximo de filas para el motor de Python (por encima se extrapola)")
+    args = parser.parse_args()
+
+    now = datetime.now()
+    engine = VectorizedReportEngine()
+    python_ms_per_row = None
+
+    print(f"{'Filas':>12}  {'Python':>12}  {'NumPy':>10}  {'Aceleración':>11}")
+    for rows in args.rows:
+        columns = synthetic_columns(rows, now)
+        vectorized, numpy_ms = timed(engine.generate_patient_report, columns, now)
+
+        if rows <= args.python_max_rows:
+            patients, appointments, treatments = to_entities(columns)
+            legacy, python_ms = timed(ReportService.generate_patient_report, patients, appointments, treatments)
+            del patients, appointments, treatments
+            if not same_counts(legacy, vectorized):
+                raise SystemExit(f"Los motores no coinciden con {rows} filas")
+            python_ms_per_row = python_ms / rows
+            label = f"{python_ms:.0f} ms"
+        elif python_ms_per_row is not None:
+            python_ms = python_ms_per_row * rows
+            label = f"~{python_ms:.0f} ms"
+        else:
+            print(f"{rows:>12,}  {'-':>12}  {numpy_ms:7.1f} ms  {'-':>11}")
+            continue
+
+        print(f"{rows:>12,}  {label:>12}  {numpy_ms:7.1f} ms  {python_ms / numpy_ms:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Regresión de consultas por carga de pantalla: cuenta las sentencias que ejecutan las
+pestañas de citas y tratamientos con el método anterior (una consulta por fila para
+resolver el nombre del paciente) y con la consulta con JOIN.
+
+    python insert_sample_data.py
+    python -m benchmarks.bench_screen_queries
+
+Termina con código 1 si alguna pantalla supera el máximo de consultas permitido.
+"""
+import sys
+import time
+from application.use_cases import PatientUseCase, AppointmentUseCase, TreatmentUseCase
+from infrastructure.connection_pool import get_connection_pool
+from infrastructure.migrations import ensure_schema
+from infrastructure.mysql_repository import (
+    MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository
+)
+
+
+# Consultas permitidas por carga de pantalla con la consulta con JOIN
+MAX_QUERIES_PER_SCREEN = 1
+
+
+def count_queries(load) -> tuple:
+    """Ejecuta load() y devuelve (filas, consultas, milisegundos)"""
+    pool = get_connection_pool()
+    before = pool.query_count()
+    started = time.perf_counter()
+    rows = load()
+    elapsed = (time.perf_counter() - started) * 1000
+    return len(rows), pool.query_count() - before, elapsed
+
+
+def main():
+    ensure_schema()
+    patient_repository = MySQLPatientRepository()
+    patient_use_case = PatientUseCase(patient_repository)
+    appointment_use_case = AppointmentUseCase(MySQLAppointmentRepository(), patient_repository)
+    treatment_use_case = TreatmentUseCase(MySQLTreatmentRepository(), patient_repository)
+
+    def names_one_by_one(items):
+        return [
+            (item, patient_use_case.get_patient_by_id(item.patient_id))
+            for item in items
+        ]
+
+    screens = [
+        ("Citas (N+1)", lambda: names_one_by_one(appointment_use_case.get_all_appointments()), None),
+        ("Citas (JOIN)", appointment_use_case.get_all_appointments_with_patient, MAX_QUERIES_PER_SCREEN),
+        ("Tratamientos (N+1)", lambda: names_one_by_one(treatment_use_case.get_all_treatments()), None),
+        ("Tratamientos (JOIN)", treatment_use_case.get_all_treatments_with_patient, MAX_QUERIES_PER_SCREEN),
+    ]
+
+    failed = False
+    for name, load, max_queries in screens:
+        rows, queries, elapsed = count_queries(load)
+        status = ''
+        if max_queries is not None:
+            status = 'OK' if queries <= max_queries else f'REGRESIÓN (máximo {max_queries})'
+            failed = failed or queries > max_queries
+        print(f"{name:<22} {rows:>7} filas  {queries:>7} consultas  {elapsed:9.1f} ms  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
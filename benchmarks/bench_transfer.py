@@ -0,0 +1,78 @@
+"""
+Bytes leídos de la base de datos por carga de pantalla: lectura a través de entidades (todas las
+columnas, con el historial médico, las notas y la prescripción completos) contra las proyecciones
+de lectura, que traen solo el comienzo de esos textos (REPOSITORY_CONFIG['preview_length']) y
+los consultan completos al abrir un registro.
+
+    python insert_sample_data.py --skip-samples --synthetic-patients 100000
+    python -m benchmarks.bench_transfer
+    python -m benchmarks.bench_transfer --term garcia
+
+Los bytes los estima el pool con measure_transfer (ConnectionPool.transfer_count), según el
+tamaño de cada valor en el protocolo de texto de MySQL.
+"""
+import argparse
+from application.use_cases import PatientUseCase, AppointmentUseCase, TreatmentUseCase
+from infrastructure.connection_pool import get_connection_pool
+from infrastructure.migrations import ensure_schema
+from infrastructure.mysql_repository import (
+    MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository
+)
+
+
+def measure_transfer(load) -> tuple:
+    """Ejecuta load() y devuelve (filas, bytes) leídos por los cursores del pool"""
+    pool = get_connection_pool()
+    rows_before, bytes_before = pool.transfer_count()
+    load()
+    rows_after, bytes_after = pool.transfer_count()
+    return rows_after - rows_before, bytes_after - bytes_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes leídos por pantalla con entidades y con proyecciones")
+    parser.add_argument('--term', default='paciente', help="Término de la búsqueda de pacientes")
+    args = parser.parse_args()
+
+    get_connection_pool().measure_transfer = True
+    ensure_schema()
+    patient_repository = MySQLPatientRepository()
+    patients = PatientUseCase(patient_repository)
+    appointments = AppointmentUseCase(MySQLAppointmentRepository(), patient_repository)
+    treatments = TreatmentUseCase(MySQLTreatmentRepository(), patient_repository)
+
+    first_page = patients.get_patient_list_page(page_size=1).items
+    patient_id = first_page[0].id if first_page else None
+
+    # (pantalla, carga con entidades, carga con la proyección)
+    screens = [
+        ("Lista de pacientes", patients.get_patients_page, patients.get_patient_list_page),
+        ("Búsqueda de pacientes",
+         lambda: patients.search_patients_text(args.term), lambda: patients.search_patient_list_text(args.term)),
+        ("Citas", appointments.get_all_appointments_with_patient, appointments.get_appointment_list),
+        ("Tratamientos (todos)", treatments.get_all_treatments_with_patient, treatments.get_treatment_list),
+    ]
+    if patient_id is not None:
+        screens += [
+            ("Citas del paciente",
+             lambda: appointments.get_appointments_by_patient(patient_id),
+             lambda: appointments.get_appointment_list_by_patient(patient_id)),
+            ("Tratamientos del paciente",
+             lambda: treatments.get_treatments_by_patient(patient_id),
+             lambda: treatments.get_treatment_list_by_patient(patient_id)),
+        ]
+
+    print(f"{'Pantalla':<26} {'Filas':>8}  {'Entidades':>12}  {'Proyección':>12}  {'Ahorro':>7}")
+    for name, load_entities, load_projection in screens:
+        rows, entities_bytes = measure_transfer(load_entities)
+        _, projection_bytes = measure_transfer(load_projection)
+        saving = 1 - projection_bytes / entities_bytes if entities_bytes else 0.0
+        print(f"{name:<26} {rows:>8,}  {entities_bytes:>10,} B  {projection_bytes:>10,} B  {saving:>6.1%}")
+
+    if patient_id is not None:
+        _, history_bytes = measure_transfer(lambda: patients.get_patient_medical_history(patient_id))
+        print(f"Abrir el historial de un paciente: {history_bytes:,} B")
+
+
+if __name__ == "__main__":
+    main()
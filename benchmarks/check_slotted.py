@@ -0,0 +1,152 @@
+"""
+Verifica que las dataclasses con __slots__ (decorador slotted de domain/slots.py) se comporten
+igual que la dataclass original (__unslotted__): igualdad, hash, repr, copy, deepcopy, pickle
+y, en las congeladas, FrozenInstanceError al asignar o borrar cualquier atributo. Recorre todas
+las clases con slotted de domain/; no requiere base de datos.
+
+    python -m benchmarks.check_slotted
+
+Termina con código 1 si alguna clase no se comporta como la original o no tiene ejemplo.
+"""
+import copy
+import pickle
+import sys
+from dataclasses import FrozenInstanceError, fields
+from datetime import datetime
+import domain.dto
+import domain.entities
+import domain.value_objects
+from domain.dto import (
+    PatientDTO, AppointmentDTO, TreatmentDTO, PatientListItemDTO, AppointmentListItemDTO,
+    TreatmentListItemDTO, PatientSearchDTO, PatientReportDTO, BatchItemResultDTO, PageDTO
+)
+from domain.entities import Patient, Appointment, Treatment
+from domain.value_objects import (
+    PatientId, Age, Gender, Contact, MedicalHistory, Diagnosis, Prescription
+)
+
+
+def slotted_classes() -> list:
+    """Clases de domain/ creadas con slotted (las que tienen __unslotted__)"""
+    return [
+        cls
+        for module in (domain.value_objects, domain.entities, domain.dto)
+        for cls in vars(module).values()
+        if isinstance(cls, type) and cls.__module__ == module.__name__ and '__unslotted__' in cls.__dict__
+    ]
+
+
+def sample_arguments() -> dict:
+    """Argumentos de ejemplo para construir cada clase (y su versión sin slots)"""
+    now = datetime(2024, 1, 1, 9, 30)
+    patient_id = PatientId.generate()
+    list_item = PatientListItemDTO(str(patient_id), "Ana", 30, "Femenino", "ana@correo.cl", "Sin antecedentes")
+    return {
+        PatientId: (patient_id.value,),
+        Age: (30,),
+        Gender: ("Femenino",),
+        Contact: ("ana@correo.cl",),
+        MedicalHistory: ("Sin antecedentes",),
+        Diagnosis: ("Gripe",),
+        Prescription: ("Reposo",),
+        Patient: (
+            patient_id, "Ana", Age(30), Gender("Femenino"), MedicalHistory("Sin antecedentes"),
+            Contact("ana@correo.cl"), now, now
+        ),
+        Appointment: ("apt_1", patient_id, now, "Dr. Núñez", "Control", "scheduled", "Notas", 30),
+        Treatment: ("trt_1", patient_id, "Gripe", "Reposo", now, None, "active"),
+        PatientDTO: (str(patient_id), "Ana", 30, "Femenino", "Sin antecedentes", "ana@correo.cl", now, now),
+        AppointmentDTO: ("apt_1", str(patient_id), now, "Dr. Núñez", "Control", "scheduled", "Notas", "Ana", 30),
+        TreatmentDTO: ("trt_1", str(patient_id), "Gripe", "Reposo", now, None, "active", "Ana"),
+        PatientListItemDTO: tuple(getattr(list_item, field.name) for field in fields(list_item)),
+        AppointmentListItemDTO: ("apt_1", now, "Dr. Núñez", "Control", "scheduled", "Ana"),
+        TreatmentListItemDTO: ("trt_1", "Gripe", "Reposo", now, "active", "Ana"),
+        PatientSearchDTO: ("Ana", 18, 40, "Femenino", None),
+        PatientReportDTO: (
+            1, {"Femenino": 1}, {"19-30": 1},
+            [PatientDTO(str(patient_id), "Ana", 30, "Femenino", "Sin antecedentes", "ana@correo.cl", now, now)],
+            0, 0, 1
+        ),
+        BatchItemResultDTO: ("apt_1", BatchItemResultDTO.INSERTED),
+        PageDTO: ([list_item], "token"),
+    }
+
+
+def raises(error: type, action) -> bool:
+    try:
+        action()
+    except error:
+        return True
+    except Exception:
+        return False
+    return False
+
+
+def check_class(cls, arguments: tuple) -> list:
+    """Diferencias de comportamiento entre cls y cls.__unslotted__ (lista vacía si no hay)"""
+    problems = []
+    instance = cls(*arguments)
+    original = cls.__unslotted__(*arguments)
+    frozen = cls.__dataclass_params__.frozen
+    first_field = fields(cls)[0].name
+
+    if hasattr(instance, '__dict__'):
+        problems.append("tiene __dict__")
+    if repr(instance) != repr(original):
+        problems.append("repr distinto")
+    if instance != cls(*arguments):
+        problems.append("no es igual a otra instancia con los mismos valores")
+    if (cls.__hash__ is None) != (cls.__unslotted__.__hash__ is None):
+        problems.append("hash distinto")
+    elif cls.__hash__ is not None and hash(instance) != hash(cls(*arguments)):
+        problems.append("hash distinto entre instancias iguales")
+
+    for name, clone in (
+        ("copy", copy.copy),
+        ("deepcopy", copy.deepcopy),
+        ("pickle", lambda value: pickle.loads(pickle.dumps(value))),
+    ):
+        try:
+            cloned = clone(instance)
+        except Exception as e:
+            problems.append(f"{name} falla: {type(e).__name__}: {e}")
+            continue
+        if type(cloned) is not cls or cloned != instance:
+            problems.append(f"{name} no devuelve una copia igual")
+
+    if frozen:
+        actions = (
+            ("asignar un campo", lambda target: setattr(target, first_field, getattr(target, first_field))),
+            ("asignar otro atributo", lambda target: setattr(target, 'extra', 1)),
+            ("borrar un campo", lambda target: delattr(target, first_field)),
+        )
+        for name, action in actions:
+            if raises(FrozenInstanceError, lambda: action(original)) != raises(FrozenInstanceError, lambda: action(instance)):
+                problems.append(f"{name} no lanza FrozenInstanceError como la original")
+    else:
+        value = getattr(instance, first_field)
+        setattr(instance, first_field, value)
+        if getattr(instance, first_field) is not value:
+            problems.append("no permite asignar un campo")
+
+    return problems
+
+
+def main():
+    samples = sample_arguments()
+    failed = False
+    for cls in slotted_classes():
+        if cls not in samples:
+            problems = ["sin argumentos de ejemplo en sample_arguments"]
+        else:
+            problems = check_class(cls, samples[cls])
+        failed = failed or bool(problems)
+        status = 'OK' if not problems else '; '.join(problems)
+        name = f"{cls.__module__}.{cls.__name__}"
+        print(f"{name:<40} {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,56 @@ DATABASE_CONFIG = {
     'collation': 'utf8mb4_unicode_ci'
 }
 
+# Configuración del pool de conexiones compartido por los repositorios
+POOL_CONFIG = {
+    'pool_size': 5,                  # Máximo de conexiones abiertas simultáneamente
+    'idle_timeout': 300,             # Segundos antes de descartar una conexión inactiva
+    'borrow_timeout': 10,            # Segundos máximos de espera por una conexión libre
+    'health_check_on_borrow': True,  # Verifica la conexión (ping) antes de entregarla
+    'measure_transfer': False        # Estima los bytes de cada fila leída (métrica bytes_fetched)
+}
+
+# Configuración de los repositorios
+REPOSITORY_CONFIG = {
+    # 'upsert': una sola sentencia INSERT ... ON DUPLICATE KEY UPDATE por escritura
+    # 'check_then_write': comportamiento anterior (SELECT COUNT(*) y luego UPDATE o INSERT)
+    'save_mode': 'upsert',
+    # Filas por lote (y por commit) en save_many / delete_many
+    'batch_size': 1000,
+    # Filas por página en las consultas paginadas por keyset
+    'page_size': 100,
+    # Filas leídas por fetchmany en los iteradores sin buffer (iter_all / iter_search)
+    'stream_chunk_size': 1000,
+    # Caracteres de los textos largos (historial, prescripción) que leen las listas y la
+    # búsqueda; el texto completo se consulta al abrir el registro
+    'preview_length': 50
+}
+
+# Configuración de la búsqueda de pacientes por texto (índice FULLTEXT)
+SEARCH_CONFIG = {
+    # Debe coincidir con innodb_ft_min_token_size del servidor (por defecto 3)
+    'min_token_size': 3,
+    'max_results': 50,
+    # Objetivo de latencia documentado: p95 por debajo de este valor con 1M de pacientes
+    'latency_target_ms': 50,
+    # Sugerencias mostradas en los combos de pacientes al escribir (índice en memoria)
+    'typeahead_limit': 20
+}
+
+# Configuración del reporte de pacientes
+REPORT_CONFIG = {
+    # Pacientes recientes listados en el reporte (los que muestra la interfaz); el total
+    # de pacientes recientes se cuenta aparte con COUNT(*)
+    'recent_patients_limit': 10
+}
+
+# Caché de lectura de find_by_id en los repositorios (infrastructure/cached_repository.py)
+CACHE_CONFIG = {
+    'enabled': True,
+    'max_size': 1000,   # Entidades por repositorio; al superarlo se desaloja la menos usada
+    'ttl': 60           # Segundos de validez; acota lo desactualizado de cambios hechos por otros procesos
+}
+
 # Configuración de la aplicación SaludTotal
 APP_CONFIG = {
     'title': 'SaludTotal - Sistema de Gestión de Pacientes',
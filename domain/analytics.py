@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Sequence
+from .dto import PatientDTO, PatientReportDTO
+from .interning import APPOINTMENT_STATUSES, TREATMENT_STATUSES, APPOINTMENT_SCHEDULED, TREATMENT_ACTIVE
+from .services import ReportService
+from .value_objects import Gender
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: pip install saludtotal[analytics]
+    np = None
+
+
+# Categorías de las columnas codificadas: el código es la posición en la tupla
+# (los estados son APPOINTMENT_STATUSES y TREATMENT_STATUSES de domain/interning.py)
+GENDER_CATEGORIES = tuple(Gender.VALID_GENDERS)
+
+
+def numpy_available() -> bool:
+    """Indica si NumPy está instalado y el motor vectorizado se puede usar"""
+    return np is not None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "El motor de analítica vectorizado requiere NumPy: pip install saludtotal[analytics]"
+        )
+
+
+@dataclass
+class ReportColumns:
+    """
+    Datos del reporte en forma de columnas (un arreglo por atributo).
+    Los géneros y estados se guardan como códigos enteros según GENDER_CATEGORIES,
+    APPOINTMENT_STATUSES y TREATMENT_STATUSES; las fechas, como datetime64.
+    'patients' es opcional y solo se usa para armar los DTO de los pacientes recientes.
+    """
+    ages: 'np.ndarray'
+    gender_codes: 'np.ndarray'
+    created_at: 'np.ndarray'
+    appointment_status_codes: 'np.ndarray'
+    appointment_dates: 'np.ndarray'
+    treatment_status_codes: 'np.ndarray'
+    patients: Optional[Sequence] = None
+
+    @classmethod
+    def from_entities(cls, patients: Sequence, appointments: Sequence, treatments: Sequence) -> 'ReportColumns':
+        """Convierte listas de entidades a columnas"""
+        _require_numpy()
+        gender_index = {gender: code for code, gender in enumerate(GENDER_CATEGORIES)}
+        appointment_index = {status: code for code, status in enumerate(APPOINTMENT_STATUSES)}
+        treatment_index = {status: code for code, status in enumerate(TREATMENT_STATUSES)}
+
+        return cls(
+            ages=np.fromiter((p.age.value for p in patients), dtype=np.int16, count=len(patients)),
+            gender_codes=np.fromiter(
+                (gender_index[p.gender.value] for p in patients), dtype=np.int8, count=len(patients)
+            ),
+            created_at=np.array([p.created_at for p in patients], dtype='datetime64[us]'),
+            appointment_status_codes=np.fromiter(
+                (appointment_index.get(a.status, -1) for a in appointments), dtype=np.int8, count=len(appointments)
+            ),
+            appointment_dates=np.array([a.date for a in appointments], dtype='datetime64[us]'),
+            treatment_status_codes=np.fromiter(
+                (treatment_index.get(t.status, -1) for t in treatments), dtype=np.int8, count=len(treatments)
+            ),
+            patients=patients
+        )
+
+
+class VectorizedReportEngine:
+    """
+    Motor alternativo de ReportService.generate_patient_report para grandes volúmenes:
+    calcula el mismo PatientReportDTO con operaciones vectorizadas de NumPy
+    (digitize / bincount / count_nonzero) en lugar de recorrer objetos uno a uno.
+    """
+
+    def __init__(self):
+        _require_numpy()
+        labels = [label for label, _, _ in ReportService.AGE_RANGES]
+        # Bordes derechos de cada rango: con right=True, digitize asigna edad <= borde al rango
+        self._age_labels = labels
+        self._age_edges = np.array([max_age for _, _, max_age in ReportService.AGE_RANGES[:-1]])
+
+    def generate_patient_report(self, columns: ReportColumns, now: Optional[datetime] = None) -> PatientReportDTO:
+        """Genera el reporte completo a partir de las columnas"""
+        now = now or datetime.now()
+        now64 = np.datetime64(now, 'us')
+
+        # Estadísticas por género
+        gender_counts = np.bincount(columns.gender_codes, minlength=len(GENDER_CATEGORIES))
+        patients_by_gender = {
+            gender: int(count) for gender, count in zip(GENDER_CATEGORIES, gender_counts) if count
+        }
+
+        # Estadísticas por rango de edad
+        age_buckets = np.digitize(columns.ages, self._age_edges, right=True)
+        age_counts = np.bincount(age_buckets, minlength=len(self._age_labels))
+        patients_by_age_range = {label: int(count) for label, count in zip(self._age_labels, age_counts)}
+
+        # Pacientes recientes
+        since = np.datetime64(ReportService.recent_patients_since(now), 'us')
+        recent_positions = np.flatnonzero(columns.created_at >= since)
+        recent_patients = []
+        if columns.patients is not None:
+            # Del más reciente al más antiguo y, con la misma fecha de alta, por ID descendente,
+            # como ReportService.generate_patient_report (clave (created_at, str(id)) invertida)
+            recent_ids = np.array([str(columns.patients[i].id) for i in recent_positions], dtype=str)
+            newest_first = recent_positions[np.lexsort((recent_ids, columns.created_at[recent_positions]))[::-1]]
+            recent_patients = [PatientDTO.from_entity(columns.patients[i]) for i in newest_first]
+
+        # Tratamientos activos y citas próximas
+        active_treatments = int(np.count_nonzero(
+            columns.treatment_status_codes == TREATMENT_STATUSES.index(TREATMENT_ACTIVE)
+        ))
+        upcoming_appointments = int(np.count_nonzero(
+            (columns.appointment_status_codes == APPOINTMENT_STATUSES.index(APPOINTMENT_SCHEDULED))
+            & (columns.appointment_dates > now64)
+        ))
+
+        return PatientReportDTO(
+            total_patients=int(columns.ages.size),
+            patients_by_gender=patients_by_gender,
+            patients_by_age_range=patients_by_age_range,
+            recent_patients=recent_patients,
+            recent_patients_total=int(recent_positions.size),
+            active_treatments=active_treatments,
+            upcoming_appointments=upcoming_appointments
+        )
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from typing import Optional, List
 from datetime import datetime
+from .slots import slotted
 
 
+@slotted
 @dataclass
 class PatientDTO:
     """
@@ -45,6 +47,7 @@ class PatientDTO:
         }
 
 
+@slotted
 @dataclass
 class AppointmentDTO:
     """
@@ -57,9 +60,11 @@ class AppointmentDTO:
     reason: str
     status: str
     notes: Optional[str] = None
+    patient_name: Optional[str] = None  # Solo en consultas que incluyen al paciente
+    duration_minutes: Optional[int] = None
 
     @classmethod
-    def from_entity(cls, appointment):
+    def from_entity(cls, appointment, patient_name: Optional[str] = None):
         """Crea un DTO desde una entidad Appointment"""
         return cls(
             id=appointment.id,
@@ -68,7 +73,9 @@ class AppointmentDTO:
             doctor_name=appointment.doctor_name,
             reason=appointment.reason,
             status=appointment.status,
-            notes=appointment.notes
+            notes=appointment.notes,
+            patient_name=patient_name,
+            duration_minutes=appointment.duration_minutes
         )
 
     def to_dict(self):
@@ -80,10 +87,13 @@ class AppointmentDTO:
             'doctor_name': self.doctor_name,
             'reason': self.reason,
             'status': self.status,
-            'notes': self.notes
+            'notes': self.notes,
+            'patient_name': self.patient_name,
+            'duration_minutes': self.duration_minutes
         }
 
 
+@slotted
 @dataclass
 class TreatmentDTO:
     """
@@ -96,9 +106,10 @@ class TreatmentDTO:
     start_date: datetime
     end_date: Optional[datetime] = None
     status: str = 'active'
+    patient_name: Optional[str] = None  # Solo en consultas que incluyen al paciente
 
     @classmethod
-    def from_entity(cls, treatment):
+    def from_entity(cls, treatment, patient_name: Optional[str] = None):
         """Crea un DTO desde una entidad Treatment"""
         return cls(
             id=treatment.id,
@@ -107,7 +118,8 @@ class TreatmentDTO:
             prescription=treatment.prescription,
             start_date=treatment.start_date,
             end_date=treatment.end_date,
-            status=treatment.status
+            status=treatment.status,
+            patient_name=patient_name
         )
 
     def to_dict(self):
@@ -119,10 +131,94 @@ class TreatmentDTO:
             'prescription': self.prescription,
             'start_date': self.start_date.isoformat() if self.start_date else None,
             'end_date': self.end_date.isoformat() if self.end_date else None,
-            'status': self.status
+            'status': self.status,
+            'patient_name': self.patient_name
+        }
+
+
+@slotted
+@dataclass
+class PatientListItemDTO:
+    """
+    Modelo de lectura de una fila de la lista y de la búsqueda de pacientes.
+    Los repositorios lo crean directamente desde la fila, sin pasar por la entidad;
+    el orden de los campos es el de las columnas de la proyección.
+    medical_history_preview es solo el comienzo del historial (hasta preview_length + 1
+    caracteres): si es más largo que preview_length, el historial continúa.
+    """
+    id: str
+    name: str
+    age: int
+    gender: str
+    contact: str
+    medical_history_preview: str
+
+    def to_dict(self):
+        """Convierte el DTO a un diccionario"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'age': self.age,
+            'gender': self.gender,
+            'contact': self.contact,
+            'medical_history_preview': self.medical_history_preview
+        }
+
+
+@slotted
+@dataclass
+class AppointmentListItemDTO:
+    """
+    Modelo de lectura de una fila de las listas de citas, creado directamente desde la fila.
+    patient_name solo viene en las consultas que incluyen al paciente.
+    """
+    id: str
+    date: datetime
+    doctor_name: str
+    reason: str
+    status: str
+    patient_name: Optional[str] = None
+
+    def to_dict(self):
+        """Convierte el DTO a un diccionario"""
+        return {
+            'id': self.id,
+            'date': self.date.isoformat() if self.date else None,
+            'doctor_name': self.doctor_name,
+            'reason': self.reason,
+            'status': self.status,
+            'patient_name': self.patient_name
+        }
+
+
+@slotted
+@dataclass
+class TreatmentListItemDTO:
+    """
+    Modelo de lectura de una fila de las listas de tratamientos, creado directamente desde la fila.
+    prescription_preview es el comienzo de la prescripción, como en PatientListItemDTO.
+    patient_name solo viene en las consultas que incluyen al paciente.
+    """
+    id: str
+    diagnosis: str
+    prescription_preview: str
+    start_date: datetime
+    status: str
+    patient_name: Optional[str] = None
+
+    def to_dict(self):
+        """Convierte el DTO a un diccionario"""
+        return {
+            'id': self.id,
+            'diagnosis': self.diagnosis,
+            'prescription_preview': self.prescription_preview,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'status': self.status,
+            'patient_name': self.patient_name
         }
 
 
+@slotted
 @dataclass
 class PatientSearchDTO:
     """
@@ -145,10 +241,14 @@ class PatientSearchDTO:
         }
 
 
+@slotted
 @dataclass
 class PatientReportDTO:
     """
-    DTO para reportes de pacientes
+    DTO para reportes de pacientes. recent_patients lista los pacientes recientes más nuevos
+    (como máximo REPORT_CONFIG['recent_patients_limit'] en el reporte desde la base de datos)
+    y recent_patients_total es cuántos pacientes recientes hay en total; si no se indica,
+    es la cantidad de recent_patients.
     """
     total_patients: int
     patients_by_gender: dict
@@ -156,6 +256,11 @@ class PatientReportDTO:
     recent_patients: List[PatientDTO]
     active_treatments: int
     upcoming_appointments: int
+    recent_patients_total: Optional[int] = None
+
+    def __post_init__(self):
+        if self.recent_patients_total is None:
+            self.recent_patients_total = len(self.recent_patients)
 
     def to_dict(self):
         """Convierte el DTO a un diccionario"""
@@ -164,6 +269,58 @@ class PatientReportDTO:
             'patients_by_gender': self.patients_by_gender,
             'patients_by_age_range': self.patients_by_age_range,
             'recent_patients': [p.to_dict() for p in self.recent_patients],
+            'recent_patients_total': self.recent_patients_total,
             'active_treatments': self.active_treatments,
             'upcoming_appointments': self.upcoming_appointments
         }
+
+
+@slotted
+@dataclass
+class BatchItemResultDTO:
+    """
+    DTO con el resultado de una fila dentro de una operación por lotes
+    """
+    id: Optional[str]
+    outcome: str
+    error: Optional[str] = None
+
+    INSERTED = 'inserted'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    NOT_FOUND = 'not_found'
+    INVALID = 'invalid'
+    FAILED = 'failed'
+
+    def is_success(self) -> bool:
+        """Indica si la fila quedó aplicada en la base de datos"""
+        return self.outcome in (self.INSERTED, self.UPDATED, self.DELETED)
+
+    def to_dict(self):
+        """Convierte el DTO a un diccionario"""
+        return {
+            'id': self.id,
+            'outcome': self.outcome,
+            'error': self.error
+        }
+
+
+@slotted
+@dataclass
+class PageDTO:
+    """
+    DTO para una página de resultados con su token de continuación
+    """
+    items: list
+    next_token: Optional[str] = None
+
+    def has_more(self) -> bool:
+        """Indica si hay más resultados después de esta página"""
+        return self.next_token is not None
+
+    def to_dict(self):
+        """Convierte el DTO a un diccionario"""
+        return {
+            'items': [item.to_dict() for item in self.items],
+            'next_token': self.next_token
+        }
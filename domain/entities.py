@@ -1,9 +1,15 @@
 from dataclasses import dataclass
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 from .value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+from .id_generator import new_id
+from .interning import (
+    APPOINTMENT_COMPLETED, APPOINTMENT_CANCELLED, TREATMENT_ACTIVE, TREATMENT_COMPLETED, TREATMENT_DISCONTINUED
+)
+from .slots import slotted
 
 
+@slotted
 @dataclass
 class Patient:
     """
@@ -46,6 +52,11 @@ class Patient:
         )
 
 
+# Duración de una cita cuando no se indica otra
+DEFAULT_APPOINTMENT_MINUTES = 30
+
+
+@slotted
 @dataclass
 class Appointment:
     """
@@ -58,20 +69,37 @@ class Appointment:
     reason: str
     status: str  # 'scheduled', 'completed', 'cancelled'
     notes: Optional[str] = None
+    duration_minutes: int = DEFAULT_APPOINTMENT_MINUTES
 
     def __post_init__(self):
         if self.id is None:
-            self.id = f"apt_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            self.id = new_id('apt_')
+
+    @property
+    def end(self) -> datetime:
+        """Fecha y hora de término de la cita"""
+        return self.date + timedelta(minutes=self.duration_minutes)
+
+    def overlaps(self, other: 'Appointment') -> bool:
+        """Indica si los horarios de las dos citas se superponen (los extremos pueden tocarse)"""
+        return self.date < other.end and other.date < self.end
+
+    def reschedule(self, date: datetime, duration_minutes: Optional[int] = None):
+        """Cambia la fecha de la cita y, opcionalmente, su duración"""
+        self.date = date
+        if duration_minutes is not None:
+            self.duration_minutes = duration_minutes
 
     def complete(self):
         """Marca la cita como completada"""
-        self.status = 'completed'
+        self.status = APPOINTMENT_COMPLETED
 
     def cancel(self):
         """Cancela la cita"""
-        self.status = 'cancelled'
+        self.status = APPOINTMENT_CANCELLED
 
 
+@slotted
 @dataclass
 class Treatment:
     """
@@ -83,18 +111,18 @@ class Treatment:
     prescription: str
     start_date: datetime
     end_date: Optional[datetime] = None
-    status: str = 'active'  # 'active', 'completed', 'discontinued'
+    status: str = TREATMENT_ACTIVE  # 'active', 'completed', 'discontinued'
 
     def __post_init__(self):
         if self.id is None:
-            self.id = f"trt_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            self.id = new_id('trt_')
 
     def complete(self):
         """Marca el tratamiento como completado"""
-        self.status = 'completed'
+        self.status = TREATMENT_COMPLETED
         self.end_date = datetime.now()
 
     def discontinue(self):
         """Discontinúa el tratamiento"""
-        self.status = 'discontinued'
+        self.status = TREATMENT_DISCONTINUED
         self.end_date = datetime.now()
@@ -0,0 +1,88 @@
+import base64
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+
+# Alfabeto Crockford (sin I, L, O ni U) y su traducción desde el alfabeto base32 estándar
+_STANDARD_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'
+_CROCKFORD_ALPHABET = b'0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_TO_CROCKFORD = bytes.maketrans(_STANDARD_ALPHABET, _CROCKFORD_ALPHABET)
+_FROM_CROCKFORD = bytes.maketrans(_CROCKFORD_ALPHABET, _STANDARD_ALPHABET)
+
+ID_LENGTH = 26
+_RANDOM_BITS = 80
+_TIMESTAMP_BITS = 48
+_MAX_TIMESTAMP = (1 << _TIMESTAMP_BITS) - 1
+# 20 bytes = 32 caracteres base32; los 6 primeros corresponden a los 30 bits de relleno
+_ENCODED_BYTES = 20
+_PADDING_CHARS = 32 - ID_LENGTH
+
+
+def _encode(value: int) -> str:
+    encoded = base64.b32encode(value.to_bytes(_ENCODED_BYTES, 'big'))
+    return encoded[_PADDING_CHARS:].translate(_TO_CROCKFORD).decode('ascii')
+
+
+def _decode(text: str) -> int:
+    standard = (_CROCKFORD_ALPHABET[:1] * _PADDING_CHARS + text.upper().encode('ascii')).translate(_FROM_CROCKFORD)
+    return int.from_bytes(base64.b32decode(standard), 'big')
+
+
+class MonotonicIdGenerator:
+    """
+    Generador de IDs estilo ULID: 48 bits de milisegundos desde 1970 y 80 bits aleatorios,
+    en 26 caracteres Crockford base32. Los IDs se ordenan por fecha de creación (también como
+    texto), lo que mantiene las inserciones al final del índice agrupado de InnoDB.
+    Dentro de un mismo milisegundo, o si el reloj retrocede, el ID siguiente es el anterior
+    más uno, así que los IDs de un proceso son estrictamente crecientes. Entre procesos la
+    unicidad la da la parte aleatoria; después de un fork el hijo descarta el estado heredado.
+    """
+
+    def __init__(self, clock: Optional[Callable[[], int]] = None, random_bytes: Optional[Callable[[int], bytes]] = None):
+        self._clock = clock or time.time_ns
+        self._random_bytes = random_bytes or os.urandom
+        self._lock = threading.Lock()
+        self._last = -1
+
+    def new_id(self) -> str:
+        """Devuelve un ID nuevo, mayor que todos los anteriores de este generador"""
+        timestamp = self._clock() // 1_000_000
+        if timestamp > _MAX_TIMESTAMP:
+            raise ValueError("La fecha actual excede el rango del generador de IDs")
+
+        with self._lock:
+            if timestamp > self._last >> _RANDOM_BITS:
+                randomness = int.from_bytes(self._random_bytes(_RANDOM_BITS // 8), 'big')
+                value = (timestamp << _RANDOM_BITS) | randomness
+            else:
+                # Mismo milisegundo (o reloj atrasado): se incrementa el anterior
+                value = self._last + 1
+            self._last = value
+
+        return _encode(value)
+
+    def reseed(self):
+        """Olvida el último ID emitido; el próximo usa una parte aleatoria nueva"""
+        self._lock = threading.Lock()
+        self._last = -1
+
+
+_generator = MonotonicIdGenerator()
+
+if hasattr(os, 'register_at_fork'):
+    # Sin esto, padre e hijo continuarían la misma secuencia dentro del milisegundo en curso
+    os.register_at_fork(after_in_child=_generator.reseed)
+
+
+def new_id(prefix: str = '') -> str:
+    """Genera un ID único y ordenable por fecha con el generador compartido del proceso"""
+    return prefix + _generator.new_id()
+
+
+def id_timestamp(entity_id: str) -> datetime:
+    """Devuelve el instante (UTC) codificado en un ID generado por new_id, con o sin prefijo"""
+    value = _decode(entity_id[-ID_LENGTH:])
+    return datetime.fromtimestamp((value >> _RANDOM_BITS) / 1000, tz=timezone.utc)
@@ -0,0 +1,59 @@
+import sys
+from typing import Dict, Optional
+
+
+# Estados de citas y tratamientos. Son cadenas internadas: los literales del código y los
+# estados que leen los repositorios (ver intern_status) son el mismo objeto, de modo que
+# las comparaciones con == se resuelven por identidad sin comparar caracteres.
+APPOINTMENT_SCHEDULED = sys.intern('scheduled')
+APPOINTMENT_COMPLETED = sys.intern('completed')
+APPOINTMENT_CANCELLED = sys.intern('cancelled')
+APPOINTMENT_STATUSES = (APPOINTMENT_SCHEDULED, APPOINTMENT_COMPLETED, APPOINTMENT_CANCELLED)
+
+TREATMENT_ACTIVE = sys.intern('active')
+TREATMENT_COMPLETED = sys.intern('completed')
+TREATMENT_DISCONTINUED = sys.intern('discontinued')
+TREATMENT_STATUSES = (TREATMENT_ACTIVE, TREATMENT_COMPLETED, TREATMENT_DISCONTINUED)
+
+_STATUSES = {status: status for status in APPOINTMENT_STATUSES + TREATMENT_STATUSES}
+
+
+def intern_status(status: str) -> str:
+    """Devuelve la constante del estado indicado; un estado desconocido se devuelve tal cual"""
+    return _STATUSES.get(status, status)
+
+
+class InternTable:
+    """
+    Tabla de internado (flyweight) para textos de baja cardinalidad, como los nombres de
+    doctor: devuelve siempre el mismo objeto para textos iguales, así miles de filas
+    comparten unas pocas cadenas. Al llegar a max_size deja de agregar y devuelve el texto
+    recibido, para que datos inesperados no la hagan crecer sin límite.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._values: Dict[str, str] = {}
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """Devuelve la copia compartida de 'value' (None se devuelve tal cual)"""
+        if value is None:
+            return None
+        shared = self._values.get(value)
+        if shared is not None:
+            return shared
+        if len(self._values) >= self.max_size:
+            return value
+        # setdefault es atómico: si dos hilos agregan el mismo texto, ambos reciben el primero
+        return self._values.setdefault(value, value)
+
+    def clear(self):
+        """Vacía la tabla; los objetos ya entregados siguen siendo válidos"""
+        self._values.clear()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+# Nombres de doctor de las citas creadas y leídas de la base de datos
+DOCTOR_NAMES = InternTable()
@@ -0,0 +1,26 @@
+import unicodedata
+from functools import lru_cache
+
+
+# Nombres de doctor distintos cuya forma normalizada se recuerda; al superarlo se descartan
+# los menos usados, así los textos que llegan del formulario no agrandan la caché sin límite
+DOCTOR_KEY_CACHE_SIZE = 4096
+
+
+def normalize_name(name: str) -> str:
+    """
+    Pasa el nombre a minúsculas y le quita las tildes ('José Núñez' -> 'jose nunez'),
+    como lo compara la collation de MySQL
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(without_accents.casefold().split())
+
+
+@lru_cache(maxsize=DOCTOR_KEY_CACHE_SIZE)
+def doctor_key(doctor_name: str) -> str:
+    """
+    Clave de comparación de un nombre de doctor (normalize_name). Los nombres se repiten
+    en miles de citas: cada uno se normaliza una sola vez mientras siga en la caché.
+    """
+    return normalize_name(doctor_name)
@@ -1,7 +1,10 @@
-from typing import List, Optional
+import heapq
+from typing import Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
-from .entities import Patient, Appointment, Treatment
+from .entities import Patient, Appointment, Treatment, DEFAULT_APPOINTMENT_MINUTES
 from .value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+from .interning import APPOINTMENT_SCHEDULED, TREATMENT_ACTIVE, DOCTOR_NAMES
+from .normalization import doctor_key
 from .dto import PatientDTO, AppointmentDTO, TreatmentDTO, PatientSearchDTO, PatientReportDTO
 
 
@@ -23,7 +26,7 @@ class PatientService:
         """
         try:
             age_vo = Age(age)
-            gender_vo = Gender(gender)
+            gender_vo = Gender.of(gender)
             medical_history_vo = MedicalHistory(medical_history)
             contact_vo = Contact(contact)
             
@@ -84,6 +87,11 @@ class AppointmentService:
     """
     Servicio de dominio para la gestión de citas médicas
     """
+
+    # Límites de la duración de una cita. El máximo también acota la búsqueda de
+    # superposiciones: una cita que empieza antes de (inicio - máximo) no puede superponerse.
+    MIN_DURATION_MINUTES = 5
+    MAX_DURATION_MINUTES = 480
     
     @staticmethod
     def create_appointment(
@@ -91,7 +99,8 @@ class AppointmentService:
         date: datetime,
         doctor_name: str,
         reason: str,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        duration_minutes: Optional[int] = None
     ) -> Appointment:
         """
         Crea una nueva cita médica
@@ -101,17 +110,92 @@ class AppointmentService:
             
         if not doctor_name or not reason:
             raise ValueError("El nombre del doctor y la razón son obligatorios")
+
+        if duration_minutes is None:
+            duration_minutes = DEFAULT_APPOINTMENT_MINUTES
+        AppointmentService.validate_duration(duration_minutes)
             
         return Appointment(
             id=None,
             patient_id=patient_id,
             date=date,
-            doctor_name=doctor_name,
+            doctor_name=DOCTOR_NAMES.intern(doctor_name),
             reason=reason,
-            status='scheduled',
-            notes=notes
+            status=APPOINTMENT_SCHEDULED,
+            notes=notes,
+            duration_minutes=duration_minutes
         )
 
+    @staticmethod
+    def validate_duration(duration_minutes: int):
+        """Verifica que la duración esté dentro de los límites permitidos"""
+        if not (AppointmentService.MIN_DURATION_MINUTES <= duration_minutes <= AppointmentService.MAX_DURATION_MINUTES):
+            raise ValueError(
+                f"La duración de la cita debe estar entre {AppointmentService.MIN_DURATION_MINUTES} "
+                f"y {AppointmentService.MAX_DURATION_MINUTES} minutos"
+            )
+
+    @staticmethod
+    def reschedule_appointment(
+        appointment: Appointment,
+        date: datetime,
+        duration_minutes: Optional[int] = None
+    ) -> Appointment:
+        """
+        Cambia la fecha (y opcionalmente la duración) de una cita programada
+        """
+        if appointment.status != APPOINTMENT_SCHEDULED:
+            raise ValueError("Solo se pueden reprogramar citas programadas")
+
+        if date < datetime.now():
+            raise ValueError("No se puede reprogramar una cita al pasado")
+
+        if duration_minutes is not None:
+            AppointmentService.validate_duration(duration_minutes)
+
+        appointment.reschedule(date, duration_minutes)
+        return appointment
+
+    @staticmethod
+    def ensure_no_conflicts(appointment: Appointment, overlapping: List[Appointment]):
+        """
+        Rechaza la cita si el doctor ya tiene otra cita programada que se superpone
+        """
+        for other in overlapping:
+            if other.id != appointment.id and other.status == APPOINTMENT_SCHEDULED and appointment.overlaps(other):
+                raise ValueError(
+                    f"El doctor {appointment.doctor_name} ya tiene una cita de "
+                    f"{other.date.strftime('%Y-%m-%d %H:%M')} a {other.end.strftime('%H:%M')}"
+                )
+
+    @staticmethod
+    def find_conflicts(appointments: Iterable[Appointment]) -> Iterator[Tuple[Appointment, Appointment]]:
+        """
+        Devuelve los pares de citas programadas del mismo doctor que se superponen.
+        Las citas deben venir ordenadas por fecha: es un barrido en el que, por doctor,
+        se mantienen en un heap (por hora de término) solo las citas aún abiertas.
+        """
+        open_by_doctor = {}
+        previous_date = None
+
+        for appointment in appointments:
+            if previous_date is not None and appointment.date < previous_date:
+                raise ValueError("Las citas deben estar ordenadas por fecha")
+            previous_date = appointment.date
+
+            if appointment.status != APPOINTMENT_SCHEDULED:
+                continue
+
+            open_appointments = open_by_doctor.setdefault(doctor_key(appointment.doctor_name), [])
+            while open_appointments and open_appointments[0][0] <= appointment.date:
+                heapq.heappop(open_appointments)
+
+            # El heap puede conservar citas ya terminadas detrás de una que sigue abierta
+            for end, _, other in open_appointments:
+                if end > appointment.date:
+                    yield other, appointment
+            heapq.heappush(open_appointments, (appointment.end, appointment.id, appointment))
+
     @staticmethod
     def complete_appointment(appointment: Appointment) -> Appointment:
         """
@@ -128,15 +212,20 @@ class AppointmentService:
         appointment.cancel()
         return appointment
 
+    @staticmethod
+    def upcoming_cutoff(days: int = 7) -> datetime:
+        """Fecha límite de las citas próximas: ahora más los días indicados"""
+        return datetime.now() + timedelta(days=days)
+
     @staticmethod
     def get_upcoming_appointments(appointments: List[Appointment], days: int = 7) -> List[Appointment]:
         """
         Obtiene las citas próximas en los próximos días especificados
         """
-        cutoff_date = datetime.now() + timedelta(days=days)
+        cutoff_date = AppointmentService.upcoming_cutoff(days)
         return [
             apt for apt in appointments 
-            if apt.status == 'scheduled' and apt.date <= cutoff_date
+            if apt.status == APPOINTMENT_SCHEDULED and apt.date <= cutoff_date
         ]
 
 
@@ -167,7 +256,7 @@ class TreatmentService:
             diagnosis=diagnosis,
             prescription=prescription,
             start_date=start_date,
-            status='active'
+            status=TREATMENT_ACTIVE
         )
 
     @staticmethod
@@ -191,13 +280,152 @@ class TreatmentService:
         """
         Obtiene todos los tratamientos activos
         """
-        return [trt for trt in treatments if trt.status == 'active']
+        return [trt for trt in treatments if trt.status == TREATMENT_ACTIVE]
 
 
 class ReportService:
     """
     Servicio de dominio para la generación de reportes
     """
+
+    # Rangos de edad del reporte: (etiqueta, edad mínima, edad máxima o None si no tiene tope)
+    # La migración 4 cargó los contadores con estos rangos; al cambiarlos hay que reconciliarlos
+    AGE_RANGES = (
+        ('0-18', 0, 18),
+        ('19-30', 19, 30),
+        ('31-50', 31, 50),
+        ('51-70', 51, 70),
+        ('71+', 71, None)
+    )
+    RECENT_PATIENT_DAYS = 30
+
+    # Claves de los contadores materializados del reporte
+    GENDER_COUNTER_PREFIX = 'pacientes.genero.'
+    AGE_RANGE_COUNTER_PREFIX = 'pacientes.edad.'
+    ACTIVE_TREATMENTS_COUNTER = 'tratamientos.activos'
+    # Citas programadas por día ('citas.programadas.AAAA-MM-DD'); el orden de las claves es el de las fechas
+    SCHEDULED_DAY_COUNTER_PREFIX = 'citas.programadas.'
+
+    @classmethod
+    def age_range_label(cls, age: int) -> str:
+        """Devuelve la etiqueta del rango de edad que corresponde a la edad indicada"""
+        for label, _, max_age in cls.AGE_RANGES:
+            if max_age is None or age <= max_age:
+                return label
+        return cls.AGE_RANGES[-1][0]
+
+    @classmethod
+    def recent_patients_since(cls, now: Optional[datetime] = None) -> datetime:
+        """Fecha de alta a partir de la cual un paciente se considera reciente"""
+        return (now or datetime.now()) - timedelta(days=cls.RECENT_PATIENT_DAYS)
+
+    @classmethod
+    def scheduled_day_counter(cls, day: datetime) -> str:
+        """Clave del contador de citas programadas del día indicado"""
+        return f"{cls.SCHEDULED_DAY_COUNTER_PREFIX}{day:%Y-%m-%d}"
+
+    @classmethod
+    def counter_keys(cls, entity) -> List[str]:
+        """
+        Contadores del reporte en los que cuenta la entidad en su estado actual.
+        Un paciente cuenta en su género y su rango de edad; una cita programada, en su día;
+        un tratamiento activo, en los tratamientos activos.
+        """
+        if entity is None:
+            return []
+        if isinstance(entity, Patient):
+            return [
+                cls.GENDER_COUNTER_PREFIX + entity.gender.value,
+                cls.AGE_RANGE_COUNTER_PREFIX + cls.age_range_label(entity.age.value)
+            ]
+        if isinstance(entity, Appointment):
+            return [cls.scheduled_day_counter(entity.date)] if entity.status == APPOINTMENT_SCHEDULED else []
+        if isinstance(entity, Treatment):
+            return [cls.ACTIVE_TREATMENTS_COUNTER] if entity.status == TREATMENT_ACTIVE else []
+        raise ValueError(f"Entidad no soportada por los contadores del reporte: {type(entity).__name__}")
+
+    @staticmethod
+    def counter_deltas(before: List[str], after: List[str]) -> dict:
+        """
+        Variación de los contadores al pasar de las claves 'before' a las claves 'after'.
+        Para un alta before es [] y para una baja after es [].
+        """
+        deltas = {}
+        for key in before:
+            deltas[key] = deltas.get(key, 0) - 1
+        for key in after:
+            deltas[key] = deltas.get(key, 0) + 1
+        return {key: delta for key, delta in deltas.items() if delta}
+
+    @classmethod
+    def expected_counters(
+        cls,
+        patients_by_gender: dict,
+        patients_by_age_range: dict,
+        active_treatments: int,
+        scheduled_by_day: dict
+    ) -> dict:
+        """Arma el juego completo de contadores a partir de conteos calculados desde cero"""
+        counters = {}
+        for gender, count in patients_by_gender.items():
+            counters[cls.GENDER_COUNTER_PREFIX + gender] = count
+        for label, count in patients_by_age_range.items():
+            counters[cls.AGE_RANGE_COUNTER_PREFIX + label] = count
+        counters[cls.ACTIVE_TREATMENTS_COUNTER] = active_treatments
+        for day, count in scheduled_by_day.items():
+            counters[cls.scheduled_day_counter(day)] = count
+        return {key: count for key, count in counters.items() if count}
+
+    @classmethod
+    def build_report_from_counters(
+        cls,
+        counters: dict,
+        recent_patients: List[Patient],
+        upcoming_appointments: int,
+        recent_patients_total: Optional[int] = None
+    ) -> PatientReportDTO:
+        """Arma el reporte a partir de los contadores materializados"""
+        patients_by_gender = {
+            key[len(cls.GENDER_COUNTER_PREFIX):]: count
+            for key, count in counters.items()
+            if key.startswith(cls.GENDER_COUNTER_PREFIX) and count
+        }
+        patients_by_age_range = {
+            key[len(cls.AGE_RANGE_COUNTER_PREFIX):]: count
+            for key, count in counters.items()
+            if key.startswith(cls.AGE_RANGE_COUNTER_PREFIX)
+        }
+        return cls.build_patient_report(
+            patients_by_gender, patients_by_age_range, recent_patients,
+            counters.get(cls.ACTIVE_TREATMENTS_COUNTER, 0), upcoming_appointments, recent_patients_total
+        )
+
+    @classmethod
+    def build_patient_report(
+        cls,
+        patients_by_gender: dict,
+        patients_by_age_range: dict,
+        recent_patients: List[Patient],
+        active_treatments: int,
+        upcoming_appointments: int,
+        recent_patients_total: Optional[int] = None
+    ) -> PatientReportDTO:
+        """
+        Arma el reporte a partir de conteos ya calculados (por ejemplo, con GROUP BY en SQL).
+        recent_patients son los pacientes recientes que se listan y recent_patients_total,
+        cuántos hay en total (por defecto, los listados)
+        """
+        return PatientReportDTO(
+            total_patients=sum(patients_by_gender.values()),
+            patients_by_gender=dict(patients_by_gender),
+            patients_by_age_range={
+                label: patients_by_age_range.get(label, 0) for label, _, _ in cls.AGE_RANGES
+            },
+            recent_patients=[PatientDTO.from_entity(p) for p in recent_patients],
+            recent_patients_total=recent_patients_total,
+            active_treatments=active_treatments,
+            upcoming_appointments=upcoming_appointments
+        )
     
     @staticmethod
     def generate_patient_report(
@@ -215,48 +443,33 @@ class ReportService:
             patients_by_gender[gender] = patients_by_gender.get(gender, 0) + 1
 
         # Estadísticas por rango de edad
-        patients_by_age_range = {
-            '0-18': 0,
-            '19-30': 0,
-            '31-50': 0,
-            '51-70': 0,
-            '71+': 0
-        }
+        patients_by_age_range = {label: 0 for label, _, _ in ReportService.AGE_RANGES}
         
         for patient in patients:
-            age = patient.age.value
-            if age <= 18:
-                patients_by_age_range['0-18'] += 1
-            elif age <= 30:
-                patients_by_age_range['19-30'] += 1
-            elif age <= 50:
-                patients_by_age_range['31-50'] += 1
-            elif age <= 70:
-                patients_by_age_range['51-70'] += 1
-            else:
-                patients_by_age_range['71+'] += 1
+            patients_by_age_range[ReportService.age_range_label(patient.age.value)] += 1
 
         # Pacientes recientes (últimos 30 días)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_patients = [
-            PatientDTO.from_entity(p) for p in patients 
-            if p.created_at >= thirty_days_ago
-        ]
+        thirty_days_ago = ReportService.recent_patients_since()
+        recent_patients = sorted(
+            (p for p in patients if p.created_at >= thirty_days_ago),
+            key=lambda p: (p.created_at, str(p.id)), reverse=True
+        )
 
         # Tratamientos activos
-        active_treatments = len([t for t in treatments if t.status == 'active'])
+        active_treatments = len([t for t in treatments if t.status == TREATMENT_ACTIVE])
 
         # Citas próximas
         upcoming_appointments = len([
             a for a in appointments 
-            if a.status == 'scheduled' and a.date > datetime.now()
+            if a.status == APPOINTMENT_SCHEDULED and a.date > datetime.now()
         ])
 
         return PatientReportDTO(
             total_patients=len(patients),
             patients_by_gender=patients_by_gender,
             patients_by_age_range=patients_by_age_range,
-            recent_patients=recent_patients,
+            recent_patients=[PatientDTO.from_entity(p) for p in recent_patients],
+            recent_patients_total=len(recent_patients),
             active_treatments=active_treatments,
             upcoming_appointments=upcoming_appointments
         )
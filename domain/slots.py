@@ -0,0 +1,52 @@
+from dataclasses import FrozenInstanceError, fields
+
+
+def _frozen_getstate(self):
+    return [getattr(self, field.name) for field in fields(self)]
+
+
+def _frozen_setattr(self, name, value):
+    # El __setattr__ generado por @dataclass(frozen=True) llama a super() con la clase original,
+    # que ya no es la de la instancia: la clase con slots define el suyo y rechaza todo nombre
+    raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+
+def _frozen_setstate(self, state):
+    # Una dataclass congelada no admite setattr: copy y pickle restauran con object.__setattr__
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+
+def slotted(cls):
+    """
+    Convierte una dataclass en una clase con __slots__ (sin __dict__ por instancia).
+    Equivale a @dataclass(slots=True) de Python 3.10, que no existe en 3.8: se aplica sobre
+    @dataclass y crea la clase de nuevo con un slot por campo, ya que los valores por defecto
+    de los campos ocupan los mismos nombres como atributos de clase.
+    La clase original (con __dict__) queda en __unslotted__ para comparar el consumo de memoria.
+    """
+    if '__slots__' in cls.__dict__:
+        raise TypeError(f"{cls.__name__} ya define __slots__")
+
+    field_names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = field_names
+    namespace['__unslotted__'] = cls
+
+    if cls.__dataclass_params__.frozen:
+        namespace['__setattr__'] = _frozen_setattr
+        namespace['__delattr__'] = _frozen_delattr
+        namespace['__getstate__'] = _frozen_getstate
+        namespace['__setstate__'] = _frozen_setstate
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
@@ -1,9 +1,28 @@
-import uuid
 from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
+from .id_generator import new_id
+from .slots import slotted
 
 
+def _trusted_constructor(cls):
+    """
+    Constructor de cls que no ejecuta __init__ ni __post_init__: escribe el valor directamente
+    en el slot 'value', sin el __setattr__ que bloquea las dataclasses congeladas.
+    Solo para valores que ya se validaron al guardarse, como los que leen los repositorios.
+    """
+    new = object.__new__
+    set_value = cls.value.__set__
+
+    def from_trusted(value):
+        instance = new(cls)
+        set_value(instance, value)
+        return instance
+
+    return from_trusted
+
+
+@slotted
 @dataclass(frozen=True)
 class PatientId:
     """
@@ -13,8 +32,8 @@ class PatientId:
 
     @classmethod
     def generate(cls) -> 'PatientId':
-        """Genera un nuevo ID único para el paciente"""
-        return cls(str(uuid.uuid4()))
+        """Genera un nuevo ID único para el paciente, ordenado por fecha de creación"""
+        return cls(new_id())
 
     @classmethod
     def from_string(cls, value: str) -> 'PatientId':
@@ -25,6 +44,7 @@ class PatientId:
         return self.value
 
 
+@slotted
 @dataclass(frozen=True)
 class Age:
     """
@@ -46,6 +66,7 @@ class Age:
         return str(self.value)
 
 
+@slotted
 @dataclass(frozen=True)
 class Gender:
     """
@@ -54,19 +75,28 @@ class Gender:
     value: str
 
     VALID_GENDERS = ['Masculino', 'Femenino', 'Otro']
+    # Conjunto para la validación: evita recorrer la lista en cada paciente creado
+    _VALID_SET = frozenset(VALID_GENDERS)
 
     def __post_init__(self):
-        if self.value not in self.VALID_GENDERS:
+        if self.value not in self._VALID_SET:
             raise ValueError(f"El género debe ser uno de: {', '.join(self.VALID_GENDERS)}")
 
+    @classmethod
+    def of(cls, value: str) -> 'Gender':
+        """Devuelve la instancia compartida del género (flyweight); valida igual que Gender(value)"""
+        gender = _SHARED_GENDERS.get(value)
+        return gender if gender is not None else cls(value)
+
     def is_valid(self) -> bool:
         """Valida que el género sea válido"""
-        return self.value in self.VALID_GENDERS
+        return self.value in self._VALID_SET
 
     def __str__(self) -> str:
         return self.value
 
 
+@slotted
 @dataclass(frozen=True)
 class Contact:
     """
@@ -86,6 +116,7 @@ class Contact:
         return self.value
 
 
+@slotted
 @dataclass(frozen=True)
 class MedicalHistory:
     """
@@ -105,6 +136,7 @@ class MedicalHistory:
         return self.value or "Sin historial médico"
 
 
+@slotted
 @dataclass(frozen=True)
 class Diagnosis:
     """
@@ -124,6 +156,7 @@ class Diagnosis:
         return self.value
 
 
+@slotted
 @dataclass(frozen=True)
 class Prescription:
     """
@@ -141,3 +174,20 @@ class Prescription:
 
     def __str__(self) -> str:
         return self.value
+
+
+# Una instancia por género válido: Gender.of y las lecturas de los repositorios la comparten
+_SHARED_GENDERS = {value: Gender(value) for value in Gender.VALID_GENDERS}
+_new_trusted_gender = _trusted_constructor(Gender)
+
+
+def _trusted_gender(value: str) -> Gender:
+    gender = _SHARED_GENDERS.get(value)
+    return gender if gender is not None else _new_trusted_gender(value)
+
+
+# Hidratación sin validación para las lecturas de los repositorios (ver _trusted_constructor)
+Age.from_trusted = staticmethod(_trusted_constructor(Age))
+Gender.from_trusted = staticmethod(_trusted_gender)
+Contact.from_trusted = staticmethod(_trusted_constructor(Contact))
+MedicalHistory.from_trusted = staticmethod(_trusted_constructor(MedicalHistory))
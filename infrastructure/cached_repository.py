@@ -0,0 +1,168 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+from domain.dto import BatchItemResultDTO
+from config import CACHE_CONFIG
+
+
+class LRUCache:
+    """
+    Caché acotada con desalojo LRU y vencimiento por TTL
+    """
+
+    def __init__(self, max_size: int = CACHE_CONFIG['max_size'], ttl: float = CACHE_CONFIG['ttl'], clock=None):
+        if max_size < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # clave -> (valor, instante de vencimiento)
+        self._metrics = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key) -> Tuple[bool, object]:
+        """Devuelve (encontrado, valor); una entrada vencida cuenta como fallo"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._metrics['hits'] += 1
+                    return True, value
+                del self._entries[key]
+                self._metrics['expirations'] += 1
+
+            self._metrics['misses'] += 1
+            return False, None
+
+    def put(self, key, value):
+        """Guarda un valor, desalojando el menos usado si la caché está llena"""
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._metrics['evictions'] += 1
+
+    def invalidate(self, key):
+        """Quita una clave de la caché; no falla si no estaba"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._metrics['invalidations'] += 1
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Devuelve las métricas actuales de la caché"""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['size'] = len(self._entries)
+            stats['max_size'] = self.max_size
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            return stats
+
+
+class CachedRepository:
+    """
+    Envoltura de lectura a través de caché para un repositorio MySQL.
+    find_by_id consulta primero la caché; save, delete y las operaciones por lotes
+    invalidan las entidades afectadas. El resto de los métodos se delega sin cambios.
+    Las entidades se copian al guardarlas y al devolverlas, para que las modificaciones
+    de quien las recibe no alteren la caché.
+    """
+
+    def __init__(self, repository, cache: Optional[LRUCache] = None):
+        self.repository = repository
+        self.cache = cache or LRUCache()
+
+    def find_by_id(self, entity_id):
+        """
+        Busca una entidad por su ID, usando la caché si está vigente. Dentro de una transacción
+        lee siempre con la conexión de la transacción y no guarda el resultado: una entrada
+        desactualizada rompería el leer-y-escribir del UnitOfWork, y la transacción podría revertirse.
+        """
+        if self.repository.pool.in_transaction():
+            return self.repository.find_by_id(entity_id)
+
+        key = str(entity_id)
+        found, entity = self.cache.get(key)
+        if found:
+            return copy.deepcopy(entity)
+
+        entity = self.repository.find_by_id(entity_id)
+        if entity is not None:
+            self.cache.put(key, copy.deepcopy(entity))
+        return entity
+
+    def save(self, entity):
+        """Guarda la entidad e invalida su entrada en la caché"""
+        try:
+            return self.repository.save(entity)
+        finally:
+            self.cache.invalidate(str(entity.id))
+
+    def upsert(self, entity) -> str:
+        """Inserta o actualiza la entidad e invalida su entrada en la caché"""
+        try:
+            return self.repository.upsert(entity)
+        finally:
+            self.cache.invalidate(str(entity.id))
+
+    def delete(self, entity_id) -> bool:
+        """Elimina la entidad e invalida su entrada en la caché"""
+        try:
+            return self.repository.delete(entity_id)
+        finally:
+            self.cache.invalidate(str(entity_id))
+
+    def save_many(self, entities: Iterable, batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """Guarda por lotes e invalida cada entidad enviada, aunque el guardado falle a mitad"""
+        ids = []
+
+        def tracked():
+            for entity in entities:
+                ids.append(str(entity.id))
+                yield entity
+
+        try:
+            return self.repository.save_many(tracked(), batch_size)
+        finally:
+            for entity_id in ids:
+                self.cache.invalidate(entity_id)
+
+    def delete_many(self, ids: Iterable, batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """Elimina por lotes e invalida cada ID indicado"""
+        ids = [str(entity_id) for entity_id in ids]
+        try:
+            return self.repository.delete_many(ids, batch_size)
+        finally:
+            for entity_id in ids:
+                self.cache.invalidate(entity_id)
+
+    def cache_stats(self) -> dict:
+        """Devuelve las métricas de la caché (aciertos, fallos, desalojos)"""
+        return self.cache.stats()
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+
+def cached(repository):
+    """Envuelve el repositorio en un CachedRepository si la caché está habilitada en CACHE_CONFIG"""
+    if not CACHE_CONFIG['enabled']:
+        return repository
+    return CachedRepository(repository, LRUCache(CACHE_CONFIG['max_size'], CACHE_CONFIG['ttl']))
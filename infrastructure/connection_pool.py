@@ -0,0 +1,439 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import mysql.connector
+from config import DATABASE_CONFIG, POOL_CONFIG
+
+
+class PoolExhaustedError(Exception):
+    """
+    Se lanza cuando no se obtiene una conexión libre dentro del tiempo de espera
+    """
+
+
+def _length_prefix(size: int) -> int:
+    # Entero de largo variable que precede a cada valor en el protocolo de texto de MySQL
+    if size < 251:
+        return 1
+    if size < 1 << 16:
+        return 3
+    if size < 1 << 24:
+        return 4
+    return 9
+
+
+def estimate_row_bytes(row) -> int:
+    """
+    Bytes aproximados de una fila en el protocolo de texto de MySQL: encabezado del paquete
+    y, por valor, su texto UTF-8 con el prefijo de largo (NULL ocupa un byte)
+    """
+    total = 4
+    for value in row:
+        if value is None:
+            total += 1
+            continue
+        if isinstance(value, str):
+            size = len(value) if value.isascii() else len(value.encode('utf-8'))
+        elif isinstance(value, (bytes, bytearray)):
+            size = len(value)
+        else:
+            size = len(str(value))
+        total += size + _length_prefix(size)
+    return total
+
+
+class CountingCursor:
+    """
+    Envoltura de un cursor que cuenta en las métricas del pool las sentencias ejecutadas
+    y las filas leídas; con measure_transfer también estima los bytes de esas filas
+    """
+
+    def __init__(self, pool: 'ConnectionPool', cursor):
+        self._pool = pool
+        self._cursor = cursor
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._pool._count_query()
+        return self._cursor.execute(operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._pool._count_query()
+        return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._pool._count_rows((row,))
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._pool._count_rows(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._pool._count_rows(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._pool._count_rows((row,))
+            yield row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cursor.close()
+
+
+class PooledConnection:
+    """
+    Envoltura de una conexión MySQL prestada por el pool.
+    Al cerrarla la conexión vuelve al pool en lugar de cerrarse físicamente.
+    """
+
+    def __init__(self, pool: 'ConnectionPool', connection):
+        self._pool = pool
+        self._connection = connection
+        self._released = False
+
+    def close(self):
+        """Devuelve la conexión al pool"""
+        if not self._released:
+            self._released = True
+            self._pool._release(self._connection)
+
+    def cursor(self, *args, **kwargs) -> CountingCursor:
+        """Crea un cursor cuyas sentencias se cuentan en las métricas del pool"""
+        return CountingCursor(self._pool, self._connection.cursor(*args, **kwargs))
+
+    def invalidate(self):
+        """
+        Cierra físicamente la conexión y libera su lugar en el pool.
+        Se usa cuando la conexión quedó en un estado no reutilizable,
+        por ejemplo con un resultado sin leer de un cursor sin buffer.
+        """
+        if not self._released:
+            self._released = True
+            self._pool._discard(self._connection)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TransactionConnection:
+    """
+    Conexión ligada a una transacción del pool (ConnectionPool.transaction).
+    Los repositorios la reciben de get_connection dentro de la transacción:
+    close y commit no hacen nada, porque la transacción se confirma una sola vez al salir.
+    """
+
+    def __init__(self, connection: PooledConnection):
+        self._connection = connection
+        self.rollback_only = False
+        self.invalidated = False
+
+    def cursor(self, *args, **kwargs) -> CountingCursor:
+        return self._connection.cursor(*args, **kwargs)
+
+    def commit(self):
+        """La confirmación se hace al cerrar la transacción"""
+
+    def rollback(self):
+        """Marca la transacción para revertirse completa al salir"""
+        self.rollback_only = True
+
+    def close(self):
+        """La conexión vuelve al pool al cerrar la transacción"""
+
+    def invalidate(self):
+        """La conexión quedó inutilizable; la transacción se revierte y la conexión se descarta"""
+        self.invalidated = True
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones MySQL compartido por todos los repositorios
+    """
+
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        pool_size: int = POOL_CONFIG['pool_size'],
+        idle_timeout: float = POOL_CONFIG['idle_timeout'],
+        borrow_timeout: float = POOL_CONFIG['borrow_timeout'],
+        health_check_on_borrow: bool = POOL_CONFIG['health_check_on_borrow'],
+        measure_transfer: bool = POOL_CONFIG['measure_transfer'],
+        connect=None
+    ):
+        if pool_size < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1")
+
+        self.config = config or DATABASE_CONFIG
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.borrow_timeout = borrow_timeout
+        self.health_check_on_borrow = health_check_on_borrow
+        self.measure_transfer = measure_transfer
+        self._connect = connect or mysql.connector.connect
+
+        self._condition = threading.Condition()
+        self._local = threading.local()  # transacción activa de cada hilo
+        self._idle = deque()  # (conexión, instante en que volvió al pool)
+        self._open_connections = 0
+        self._metrics = {
+            'borrowed': 0,
+            'waited': 0,
+            'created': 0,
+            'discarded': 0,
+            'wait_seconds': 0.0,
+            'queries': 0,
+            'rows_fetched': 0,
+            'bytes_fetched': 0
+        }
+
+    def get_connection(self) -> PooledConnection:
+        """
+        Presta una conexión del pool, esperando si todas están en uso.
+        Dentro de transaction() devuelve siempre la conexión de la transacción del hilo.
+        """
+        bound = getattr(self._local, 'transaction', None)
+        if bound is not None:
+            return bound
+
+        started = time.monotonic()
+        deadline = started + self.borrow_timeout
+        waited = False
+        expired = []
+        connection = None
+
+        with self._condition:
+            while True:
+                expired.extend(self._pop_expired_locked())
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    break
+                if self._open_connections < self.pool_size:
+                    self._open_connections += 1
+                    break
+
+                if not waited:
+                    waited = True
+                    self._metrics['waited'] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(
+                        f"No hay conexiones libres tras {self.borrow_timeout} segundos "
+                        f"(tamaño del pool: {self.pool_size})"
+                    )
+                self._condition.wait(remaining)
+
+            self._metrics['borrowed'] += 1
+            if waited:
+                self._metrics['wait_seconds'] += time.monotonic() - started
+
+        for stale in expired:
+            self._close_quietly(stale)
+
+        if connection is not None and self.health_check_on_borrow and not self._is_healthy(connection):
+            self._close_quietly(connection)
+            with self._condition:
+                self._metrics['discarded'] += 1
+            connection = None
+
+        if connection is None:
+            connection = self._create_connection()
+
+        return PooledConnection(self, connection)
+
+    def in_transaction(self) -> bool:
+        """Indica si el hilo actual está dentro de un bloque transaction()"""
+        return getattr(self._local, 'transaction', None) is not None
+
+    @contextmanager
+    def transaction(self) -> Iterator[TransactionConnection]:
+        """
+        Liga una conexión al hilo actual durante el bloque: todas las consultas de los
+        repositorios que usan este pool comparten esa conexión y se confirman con un único
+        commit al salir. Si hay una excepción (o un repositorio pidió rollback) se revierte todo.
+        Un bloque anidado se une a la transacción externa.
+        """
+        current = getattr(self._local, 'transaction', None)
+        if current is not None:
+            yield current
+            return
+
+        connection = self.get_connection()
+        bound = TransactionConnection(connection)
+        self._local.transaction = bound
+        try:
+            yield bound
+            if bound.invalidated:
+                raise RuntimeError("La conexión de la transacción quedó inutilizable; se revirtieron los cambios")
+            if bound.rollback_only:
+                connection.rollback()
+            else:
+                connection.commit()
+
+        except BaseException:
+            if bound.invalidated:
+                connection.invalidate()
+            else:
+                try:
+                    connection.rollback()
+                except Exception:
+                    connection.invalidate()
+            raise
+
+        finally:
+            self._local.transaction = None
+            connection.close()
+
+    def stats(self) -> dict:
+        """Devuelve las métricas actuales del pool"""
+        with self._condition:
+            stats = dict(self._metrics)
+            stats['size'] = self.pool_size
+            stats['open'] = self._open_connections
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._open_connections - len(self._idle)
+            return stats
+
+    def query_count(self) -> int:
+        """Sentencias ejecutadas por los cursores del pool desde su creación"""
+        with self._condition:
+            return self._metrics['queries']
+
+    def transfer_count(self) -> tuple:
+        """
+        (filas, bytes) leídos por los cursores del pool desde su creación.
+        Los bytes son una estimación y solo se cuentan con measure_transfer.
+        """
+        with self._condition:
+            return self._metrics['rows_fetched'], self._metrics['bytes_fetched']
+
+    def close_all(self):
+        """Cierra todas las conexiones inactivas del pool"""
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._open_connections -= len(idle)
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def _count_query(self):
+        with self._condition:
+            self._metrics['queries'] += 1
+
+    def _count_rows(self, rows):
+        # Los bytes se estiman fuera del lock: recorren todos los valores de las filas
+        transferred = sum(estimate_row_bytes(row) for row in rows) if self.measure_transfer else 0
+        with self._condition:
+            self._metrics['rows_fetched'] += len(rows)
+            self._metrics['bytes_fetched'] += transferred
+
+    def _create_connection(self):
+        """Abre una conexión física nueva; el cupo ya fue reservado por el llamador"""
+        try:
+            connection = self._connect(**self.config)
+        except Exception:
+            with self._condition:
+                self._open_connections -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._metrics['created'] += 1
+        return connection
+
+    def _release(self, connection):
+        """Recibe una conexión devuelta por un PooledConnection"""
+        healthy = True
+        try:
+            if getattr(connection, 'in_transaction', False):
+                connection.rollback()
+        except Exception:
+            healthy = False
+
+        if not healthy:
+            self._close_quietly(connection)
+
+        with self._condition:
+            if healthy:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._open_connections -= 1
+                self._metrics['discarded'] += 1
+            self._condition.notify()
+
+    def _discard(self, connection):
+        """Cierra una conexión prestada sin devolverla al pool"""
+        self._close_quietly(connection)
+        with self._condition:
+            self._open_connections -= 1
+            self._metrics['discarded'] += 1
+            self._condition.notify()
+
+    def _pop_expired_locked(self) -> list:
+        """Retira las conexiones inactivas que superaron el idle_timeout"""
+        expired = []
+        limit = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < limit:
+            connection, _ = self._idle.popleft()
+            expired.append(connection)
+            self._open_connections -= 1
+            self._metrics['discarded'] += 1
+        return expired
+
+    @staticmethod
+    def _is_healthy(connection) -> bool:
+        """Verifica que la conexión siga viva antes de prestarla"""
+        try:
+            return connection.is_connected()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_shared_pool: Optional[ConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Obtiene el pool compartido, creándolo la primera vez que se usa"""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = ConnectionPool()
+    return _shared_pool
@@ -1,11 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from typing import List, Optional
+from typing import Callable, List, Optional
 from datetime import datetime, timedelta
-from domain.dto import PatientDTO, AppointmentDTO, TreatmentDTO, PatientSearchDTO, PatientReportDTO
+from domain.entities import DEFAULT_APPOINTMENT_MINUTES
+from domain.dto import PatientDTO, AppointmentDTO, TreatmentDTO, PatientSearchDTO, PatientReportDTO, PatientListItemDTO
 from application.use_cases import PatientUseCase, AppointmentUseCase, TreatmentUseCase, ReportUseCase
-from infrastructure.mysql_repository import MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository
-from config import APP_CONFIG
+from infrastructure.mysql_repository import (
+    MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository, MySQLReportRepository,
+    MySQLStatisticsRepository
+)
+from infrastructure.cached_repository import cached
+from config import APP_CONFIG, REPORT_CONFIG, REPOSITORY_CONFIG
+
+
+def _preview(text: str) -> str:
+    """Texto de una columna de lista: el comienzo que leyó el repositorio, con '...' si continúa"""
+    length = REPOSITORY_CONFIG['preview_length']
+    return text[:length] + "..." if len(text) > length else text
 
 
 class SaludTotalGUI:
@@ -18,19 +29,36 @@ class SaludTotalGUI:
         self.root.title(APP_CONFIG['title'])
         self.root.geometry(APP_CONFIG['window_size'])
         
-        # Inicializar repositorios
-        self.patient_repository = MySQLPatientRepository()
-        self.appointment_repository = MySQLAppointmentRepository()
-        self.treatment_repository = MySQLTreatmentRepository()
+        # Inicializar repositorios (con caché de lectura por ID si está habilitada)
+        self.patient_repository = cached(MySQLPatientRepository())
+        self.appointment_repository = cached(MySQLAppointmentRepository())
+        self.treatment_repository = cached(MySQLTreatmentRepository())
+        self.statistics_repository = MySQLStatisticsRepository()
         
         # Inicializar casos de uso
-        self.patient_use_case = PatientUseCase(self.patient_repository)
-        self.appointment_use_case = AppointmentUseCase(self.appointment_repository, self.patient_repository)
-        self.treatment_use_case = TreatmentUseCase(self.treatment_repository, self.patient_repository)
-        self.report_use_case = ReportUseCase(self.patient_repository, self.appointment_repository, self.treatment_repository)
+        self.patient_use_case = PatientUseCase(self.patient_repository, statistics_repository=self.statistics_repository)
+        self.appointment_use_case = AppointmentUseCase(
+            self.appointment_repository, self.patient_repository, self.statistics_repository
+        )
+        self.treatment_use_case = TreatmentUseCase(
+            self.treatment_repository, self.patient_repository, self.statistics_repository
+        )
+        self.report_use_case = ReportUseCase(
+            self.patient_repository, self.appointment_repository, self.treatment_repository,
+            MySQLReportRepository(), self.statistics_repository
+        )
+        
+        # Token de la página siguiente de las tablas de pacientes, citas y tratamientos
+        self.patients_next_token = None
+        self.appointments_next_token = None
+        self.treatments_next_token = None
+        # Estado con el que se pidió la página actual de tratamientos (el token depende de él)
+        self.treatments_status = None
+        
+        # Consultas de autocompletado pendientes por combo (after id de Tkinter)
+        self.typeahead_jobs = {}
         
         self.setup_ui()
-        self.load_patients()
 
     def setup_ui(self):
         """Configura la interfaz de usuario"""
@@ -104,9 +132,10 @@ class SaludTotalGUI:
         search_frame = ttk.LabelFrame(main_frame, text="Buscar Pacientes")
         search_frame.pack(fill=tk.X, pady=(0, 10))
         
-        ttk.Label(search_frame, text="Buscar por nombre:").pack(side=tk.LEFT, padx=5)
+        ttk.Label(search_frame, text="Buscar (nombre, contacto o historial):").pack(side=tk.LEFT, padx=5)
         self.search_entry = ttk.Entry(search_frame, width=30)
         self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_entry.bind('<Return>', lambda event: self.search_patients())
         ttk.Button(search_frame, text="Buscar", 
                   command=self.search_patients).pack(side=tk.LEFT, padx=5)
         ttk.Button(search_frame, text="Mostrar Todos", 
@@ -131,6 +160,7 @@ class SaludTotalGUI:
         
         self.patients_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.bind_full_text(self.patients_tree, "Historial Médico", self.patient_use_case.get_patient_medical_history)
         
         # Botones de acción
         action_frame = ttk.Frame(main_frame)
@@ -144,6 +174,8 @@ class SaludTotalGUI:
                   command=self.view_patient_appointments).pack(side=tk.LEFT, padx=5)
         ttk.Button(action_frame, text="Ver Tratamientos", 
                   command=self.view_patient_treatments).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Cargar Más", 
+                  command=self.load_more_patients).pack(side=tk.RIGHT, padx=5)
 
     def setup_appointments_tab(self):
         """Configura la pestaña de citas médicas"""
@@ -159,12 +191,18 @@ class SaludTotalGUI:
         self.patient_var = tk.StringVar()
         self.patient_combo = ttk.Combobox(form_frame, textvariable=self.patient_var, width=30)
         self.patient_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.bind_patient_typeahead(self.patient_combo)
         
         ttk.Label(form_frame, text="Fecha:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
         self.date_entry = ttk.Entry(form_frame, width=20)
         self.date_entry.grid(row=0, column=3, padx=5, pady=5)
         self.date_entry.insert(0, datetime.now().strftime("%Y-%m-%d %H:%M"))
         
+        ttk.Label(form_frame, text="Duración (min):").grid(row=0, column=4, sticky=tk.W, padx=5, pady=5)
+        self.duration_entry = ttk.Entry(form_frame, width=6)
+        self.duration_entry.grid(row=0, column=5, padx=5, pady=5)
+        self.duration_entry.insert(0, str(DEFAULT_APPOINTMENT_MINUTES))
+        
         ttk.Label(form_frame, text="Doctor:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
         self.doctor_entry = ttk.Entry(form_frame, width=30)
         self.doctor_entry.grid(row=1, column=1, padx=5, pady=5)
@@ -202,6 +240,7 @@ class SaludTotalGUI:
         
         self.appointments_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.bind_full_text(self.appointments_tree, "Notas de la Cita", self.appointment_use_case.get_appointment_notes)
         
         # Botones de acción
         action_frame = ttk.Frame(main_frame)
@@ -211,8 +250,16 @@ class SaludTotalGUI:
                   command=self.complete_appointment).pack(side=tk.LEFT, padx=5)
         ttk.Button(action_frame, text="Cancelar Cita", 
                   command=self.cancel_appointment).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Reprogramar Cita", 
+                  command=self.reschedule_appointment).pack(side=tk.LEFT, padx=5)
         ttk.Button(action_frame, text="Cargar Citas", 
                   command=self.load_appointments).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Agenda de Hoy", 
+                  command=lambda: self.view_schedule(week=False)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Agenda de la Semana", 
+                  command=lambda: self.view_schedule(week=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Cargar Más", 
+                  command=self.load_more_appointments).pack(side=tk.RIGHT, padx=5)
 
     def setup_treatments_tab(self):
         """Configura la pestaña de tratamientos"""
@@ -228,6 +275,7 @@ class SaludTotalGUI:
         self.treatment_patient_var = tk.StringVar()
         self.treatment_patient_combo = ttk.Combobox(form_frame, textvariable=self.treatment_patient_var, width=30)
         self.treatment_patient_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.bind_patient_typeahead(self.treatment_patient_combo)
         
         ttk.Label(form_frame, text="Diagnóstico:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
         self.diagnosis_entry = ttk.Entry(form_frame, width=30)
@@ -262,6 +310,7 @@ class SaludTotalGUI:
         
         self.treatments_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.bind_full_text(self.treatments_tree, "Prescripción", self.treatment_use_case.get_treatment_prescription)
         
         # Botones de acción
         action_frame = ttk.Frame(main_frame)
@@ -273,6 +322,13 @@ class SaludTotalGUI:
                   command=self.discontinue_treatment).pack(side=tk.LEFT, padx=5)
         ttk.Button(action_frame, text="Cargar Tratamientos", 
                   command=self.load_treatments).pack(side=tk.LEFT, padx=5)
+        
+        # Por defecto solo se listan los tratamientos activos
+        self.treatment_active_only_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(action_frame, text="Solo activos", variable=self.treatment_active_only_var,
+                        command=self.load_treatments).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Cargar Más", 
+                  command=self.load_more_treatments).pack(side=tk.RIGHT, padx=5)
 
     def setup_reports_tab(self):
         """Configura la pestaña de reportes"""
@@ -327,55 +383,67 @@ class SaludTotalGUI:
         self.history_text.delete("1.0", tk.END)
 
     def load_patients(self):
-        """Carga la lista de pacientes"""
+        """Carga la primera página de la lista de pacientes"""
+        self._load_patients_page(reset=True)
+
+    def search_patients(self):
+        """Busca pacientes por nombre, contacto o historial médico, ordenados por relevancia"""
+        search_term = self.search_entry.get().strip()
+        if not search_term:
+            self.load_patients()
+            return
+        
         try:
-            # Limpiar tabla
+            patients = self.patient_use_case.search_patient_list_text(search_term)
+            
+            # Limpiar tabla; los resultados por relevancia no se paginan
             for item in self.patients_tree.get_children():
                 self.patients_tree.delete(item)
+            self.patients_next_token = None
             
-            # Cargar pacientes
-            patients = self.patient_use_case.get_all_patients()
             for patient in patients:
-                self.patients_tree.insert('', 'end', values=(
-                    patient.id,
-                    patient.name,
-                    patient.age,
-                    patient.gender,
-                    patient.contact,
-                    patient.medical_history[:50] + "..." if len(patient.medical_history) > 50 else patient.medical_history
-                ))
+                self._insert_patient_row(patient)
                 
         except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar pacientes: {str(e)}")
+            messagebox.showerror("Error", f"Error al buscar pacientes: {str(e)}")
 
-    def search_patients(self):
-        """Busca pacientes según criterios"""
+    def load_more_patients(self):
+        """Agrega la siguiente página de pacientes a la tabla"""
+        if not self.patients_next_token:
+            messagebox.showinfo("Información", "No hay más pacientes para mostrar")
+            return
+        
+        self._load_patients_page(reset=False)
+
+    def _load_patients_page(self, reset: bool):
+        """Muestra una página de la lista de pacientes"""
         try:
-            search_term = self.search_entry.get().strip()
-            if not search_term:
-                self.load_patients()
-                return
+            if reset:
+                # Limpiar tabla
+                for item in self.patients_tree.get_children():
+                    self.patients_tree.delete(item)
+                self.patients_next_token = None
             
-            search_dto = PatientSearchDTO(name=search_term)
-            patients = self.patient_use_case.search_patients(search_dto)
+            page = self.patient_use_case.get_patient_list_page(page_token=self.patients_next_token)
             
-            # Limpiar tabla
-            for item in self.patients_tree.get_children():
-                self.patients_tree.delete(item)
+            for patient in page.items:
+                self._insert_patient_row(patient)
             
-            # Mostrar resultados
-            for patient in patients:
-                self.patients_tree.insert('', 'end', values=(
-                    patient.id,
-                    patient.name,
-                    patient.age,
-                    patient.gender,
-                    patient.contact,
-                    patient.medical_history[:50] + "..." if len(patient.medical_history) > 50 else patient.medical_history
-                ))
+            self.patients_next_token = page.next_token
                 
         except Exception as e:
-            messagebox.showerror("Error", f"Error al buscar pacientes: {str(e)}")
+            messagebox.showerror("Error", f"Error al cargar pacientes: {str(e)}")
+
+    def _insert_patient_row(self, patient: PatientListItemDTO):
+        """Agrega un paciente a la tabla de pacientes"""
+        self.patients_tree.insert('', 'end', values=(
+            patient.id,
+            patient.name,
+            patient.age,
+            patient.gender,
+            patient.contact,
+            _preview(patient.medical_history_preview)
+        ))
 
     def edit_patient(self):
         """Edita un paciente seleccionado"""
@@ -449,16 +517,18 @@ class SaludTotalGUI:
             doctor = self.doctor_entry.get().strip()
             reason = self.reason_entry.get().strip()
             notes = self.notes_text.get("1.0", tk.END).strip()
+            duration_str = self.duration_entry.get().strip()
             
             if not all([patient_id, date_str, doctor, reason]):
                 messagebox.showerror("Error", "Todos los campos obligatorios deben estar completos")
                 return
             
-            # Parsear fecha
+            # Parsear fecha y duración
             appointment_date = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
+            duration_minutes = int(duration_str) if duration_str else None
             
             appointment_dto = self.appointment_use_case.create_appointment(
-                patient_id, appointment_date, doctor, reason, notes
+                patient_id, appointment_date, doctor, reason, notes, duration_minutes
             )
             
             messagebox.showinfo("Éxito", "Cita programada correctamente")
@@ -475,23 +545,37 @@ class SaludTotalGUI:
         self.patient_var.set('')
         self.date_entry.delete(0, tk.END)
         self.date_entry.insert(0, datetime.now().strftime("%Y-%m-%d %H:%M"))
+        self.duration_entry.delete(0, tk.END)
+        self.duration_entry.insert(0, str(DEFAULT_APPOINTMENT_MINUTES))
         self.doctor_entry.delete(0, tk.END)
         self.reason_entry.delete(0, tk.END)
         self.notes_text.delete("1.0", tk.END)
 
     def load_appointments(self):
-        """Carga la lista de citas"""
+        """Carga la primera página de la lista de citas"""
+        self._load_appointments_page(reset=True)
+
+    def load_more_appointments(self):
+        """Agrega la siguiente página de citas a la tabla"""
+        if not self.appointments_next_token:
+            messagebox.showinfo("Información", "No hay más citas para mostrar")
+            return
+        
+        self._load_appointments_page(reset=False)
+
+    def _load_appointments_page(self, reset: bool):
+        """Muestra una página de la lista de citas"""
         try:
-            # Limpiar tabla
-            for item in self.appointments_tree.get_children():
-                self.appointments_tree.delete(item)
-            
-            # Cargar citas
-            appointments = self.appointment_use_case.get_all_appointments()
-            for appointment in appointments:
-                # Obtener nombre del paciente
-                patient = self.patient_use_case.get_patient_by_id(appointment.patient_id)
-                patient_name = patient.name if patient else "Paciente no encontrado"
+            if reset:
+                # Limpiar tabla
+                for item in self.appointments_tree.get_children():
+                    self.appointments_tree.delete(item)
+                self.appointments_next_token = None
+            
+            # Cargar las filas de la página con el nombre del paciente en una sola consulta
+            page = self.appointment_use_case.get_appointment_list_page(page_token=self.appointments_next_token)
+            for appointment in page.items:
+                patient_name = appointment.patient_name or "Paciente no encontrado"
                 
                 self.appointments_tree.insert('', 'end', values=(
                     appointment.id,
@@ -501,6 +585,8 @@ class SaludTotalGUI:
                     appointment.reason,
                     appointment.status
                 ))
+            
+            self.appointments_next_token = page.next_token
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar citas: {str(e)}")
@@ -538,6 +624,35 @@ class SaludTotalGUI:
             except Exception as e:
                 messagebox.showerror("Error", f"Error al cancelar cita: {str(e)}")
 
+    def reschedule_appointment(self):
+        """Cambia la fecha de una cita; la duración se mantiene salvo que se indique otra"""
+        selection = self.appointments_tree.selection()
+        if not selection:
+            messagebox.showwarning("Advertencia", "Por favor seleccione una cita para reprogramar")
+            return
+        
+        values = self.appointments_tree.item(selection[0])['values']
+        appointment_id, current_date = values[0], values[2]
+        
+        date_str = simpledialog.askstring(
+            "Reprogramar Cita", "Nueva fecha (AAAA-MM-DD HH:MM):", initialvalue=current_date, parent=self.root
+        )
+        if not date_str:
+            return
+        duration_minutes = simpledialog.askinteger(
+            "Reprogramar Cita", "Duración en minutos (vacío para mantenerla):", parent=self.root
+        )
+        
+        try:
+            new_date = datetime.strptime(date_str.strip(), "%Y-%m-%d %H:%M")
+            self.appointment_use_case.reschedule_appointment(appointment_id, new_date, duration_minutes)
+            messagebox.showinfo("Éxito", "Cita reprogramada correctamente")
+            self.load_appointments()
+        except ValueError as e:
+            messagebox.showerror("Error de Validación", str(e))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al reprogramar cita: {str(e)}")
+
     def register_treatment(self):
         """Registra un nuevo tratamiento"""
         try:
@@ -566,27 +681,44 @@ class SaludTotalGUI:
         self.prescription_text.delete("1.0", tk.END)
 
     def load_treatments(self):
-        """Carga la lista de tratamientos"""
+        """Carga la primera página de la lista de tratamientos"""
+        self._load_treatments_page(reset=True)
+
+    def load_more_treatments(self):
+        """Agrega la siguiente página de tratamientos a la tabla"""
+        if not self.treatments_next_token:
+            messagebox.showinfo("Información", "No hay más tratamientos para mostrar")
+            return
+        
+        self._load_treatments_page(reset=False)
+
+    def _load_treatments_page(self, reset: bool):
+        """Muestra una página de la lista de tratamientos"""
         try:
-            # Limpiar tabla
-            for item in self.treatments_tree.get_children():
-                self.treatments_tree.delete(item)
-            
-            # Cargar tratamientos
-            treatments = self.treatment_use_case.get_all_treatments()
-            for treatment in treatments:
-                # Obtener nombre del paciente
-                patient = self.patient_use_case.get_patient_by_id(treatment.patient_id)
-                patient_name = patient.name if patient else "Paciente no encontrado"
+            if reset:
+                # Limpiar tabla
+                for item in self.treatments_tree.get_children():
+                    self.treatments_tree.delete(item)
+                self.treatments_next_token = None
+                self.treatments_status = 'active' if self.treatment_active_only_var.get() else None
+            
+            # Cargar las filas de la página con el nombre del paciente en una sola consulta
+            page = self.treatment_use_case.get_treatment_list_page(
+                self.treatments_status, page_token=self.treatments_next_token
+            )
+            for treatment in page.items:
+                patient_name = treatment.patient_name or "Paciente no encontrado"
                 
                 self.treatments_tree.insert('', 'end', values=(
                     treatment.id,
                     patient_name,
                     treatment.diagnosis,
-                    treatment.prescription[:50] + "..." if len(treatment.prescription) > 50 else treatment.prescription,
+                    _preview(treatment.prescription_preview),
                     treatment.start_date.strftime("%Y-%m-%d"),
                     treatment.status
                 ))
+            
+            self.treatments_next_token = page.next_token
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar tratamientos: {str(e)}")
@@ -651,8 +783,8 @@ DISTRIBUCIÓN POR GÉNERO:
             for age_range, count in report.patients_by_age_range.items():
                 report_content += f"- {age_range} años: {count} pacientes\n"
             
-            report_content += f"\nPACIENTES RECIENTES (últimos 30 días):\n"
-            for patient in report.recent_patients[:10]:  # Mostrar solo los primeros 10
+            report_content += f"\nPACIENTES RECIENTES (últimos 30 días): {report.recent_patients_total}\n"
+            for patient in report.recent_patients[:REPORT_CONFIG['recent_patients_limit']]:
                 report_content += f"- {patient.name} ({patient.age} años, {patient.gender})\n"
             
             self.report_text.insert("1.0", report_content)
@@ -661,20 +793,45 @@ DISTRIBUCIÓN POR GÉNERO:
             messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
 
     def update_patient_combos(self):
-        """Actualiza los combos de pacientes en todas las pestañas"""
+        """
+        Prepara los combos de pacientes. Ya no se cargan todos los pacientes:
+        se carga el índice de nombres y cada combo muestra solo las sugerencias de lo escrito.
+        """
         try:
-            patients = self.patient_use_case.get_all_patients()
-            patient_options = [f"{p.id} - {p.name}" for p in patients]
-            
-            # Actualizar combo en pestaña de citas
-            self.patient_combo['values'] = patient_options
+            self.patient_use_case.load_name_index()
             
-            # Actualizar combo en pestaña de tratamientos
-            self.treatment_patient_combo['values'] = patient_options
+            # Limpiar sugerencias en las pestañas de citas y tratamientos
+            self.patient_combo['values'] = ()
+            self.treatment_patient_combo['values'] = ()
             
         except Exception as e:
             print(f"Error al actualizar combos de pacientes: {str(e)}")
 
+    def bind_patient_typeahead(self, combo: ttk.Combobox):
+        """Convierte un combo de pacientes en un campo de autocompletado"""
+        combo.bind('<KeyRelease>', lambda event: self.schedule_patient_suggestions(combo, event))
+
+    def schedule_patient_suggestions(self, combo: ttk.Combobox, event):
+        """Espera a que el usuario deje de escribir antes de consultar el índice"""
+        if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        
+        pending = self.typeahead_jobs.pop(combo, None)
+        if pending:
+            self.root.after_cancel(pending)
+        self.typeahead_jobs[combo] = self.root.after(150, lambda: self.show_patient_suggestions(combo))
+
+    def show_patient_suggestions(self, combo: ttk.Combobox):
+        """Muestra en el combo los pacientes que coinciden con el texto escrito"""
+        self.typeahead_jobs.pop(combo, None)
+        text = combo.get().strip()
+        
+        try:
+            suggestions = self.patient_use_case.suggest_patients(text) if text else []
+            combo['values'] = [f"{patient_id} - {name}" for patient_id, name in suggestions]
+        except Exception as e:
+            print(f"Error al sugerir pacientes: {str(e)}")
+
     def view_patient_appointments(self):
         """Muestra las citas de un paciente seleccionado"""
         selection = self.patients_tree.selection()
@@ -686,7 +843,7 @@ DISTRIBUCIÓN POR GÉNERO:
         patient_name = self.patients_tree.item(selection[0])['values'][1]
         
         try:
-            appointments = self.appointment_use_case.get_appointments_by_patient(patient_id)
+            appointments = self.appointment_use_case.get_appointment_list_by_patient(patient_id)
             
             # Crear ventana para mostrar citas
             appointments_window = tk.Toplevel(self.root)
@@ -711,6 +868,7 @@ DISTRIBUCIÓN POR GÉNERO:
                 ))
             
             tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            self.bind_full_text(tree, "Notas de la Cita", self.appointment_use_case.get_appointment_notes)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar citas: {str(e)}")
@@ -726,7 +884,7 @@ DISTRIBUCIÓN POR GÉNERO:
         patient_name = self.patients_tree.item(selection[0])['values'][1]
         
         try:
-            treatments = self.treatment_use_case.get_treatments_by_patient(patient_id)
+            treatments = self.treatment_use_case.get_treatment_list_by_patient(patient_id)
             
             # Crear ventana para mostrar tratamientos
             treatments_window = tk.Toplevel(self.root)
@@ -745,23 +903,101 @@ DISTRIBUCIÓN POR GÉNERO:
                 tree.insert('', 'end', values=(
                     treatment.id,
                     treatment.diagnosis,
-                    treatment.prescription[:50] + "..." if len(treatment.prescription) > 50 else treatment.prescription,
+                    _preview(treatment.prescription_preview),
                     treatment.start_date.strftime("%Y-%m-%d"),
                     treatment.status
                 ))
             
             tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            self.bind_full_text(tree, "Prescripción", self.treatment_use_case.get_treatment_prescription)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar tratamientos: {str(e)}")
 
+    def bind_full_text(self, tree: ttk.Treeview, title: str, load_text: Callable[[str], str]):
+        """
+        Al hacer doble clic en una fila, muestra su texto completo. Las listas solo leen el
+        comienzo de los textos largos; el texto se consulta aquí, al abrir el registro.
+        """
+        tree.bind('<Double-1>', lambda event: self.show_full_text(tree, title, load_text))
+
+    def show_full_text(self, tree: ttk.Treeview, title: str, load_text: Callable[[str], str]):
+        """Consulta el texto de la fila seleccionada y lo muestra en una ventana"""
+        selection = tree.selection()
+        if not selection:
+            return
+        
+        record_id = str(tree.item(selection[0])['values'][0])
+        
+        try:
+            text = load_text(record_id)
+            
+            text_window = tk.Toplevel(self.root)
+            text_window.title(title)
+            text_window.geometry("500x300")
+            
+            text_widget = tk.Text(text_window, wrap=tk.WORD)
+            text_widget.insert("1.0", text or "(sin texto)")
+            text_widget.configure(state=tk.DISABLED)
+            text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def view_schedule(self, week: bool):
+        """Muestra la agenda de hoy o de la semana; si hay un doctor en el formulario, solo la suya"""
+        doctor_name = self.doctor_entry.get().strip() or None
+        today = datetime.now().date()
+        
+        try:
+            if week:
+                appointments = self.appointment_use_case.get_week_schedule(today, doctor_name)
+                title = "Agenda de la semana"
+            else:
+                appointments = self.appointment_use_case.get_day_schedule(today, doctor_name)
+                title = "Agenda de hoy"
+            if doctor_name:
+                title += f" - {doctor_name}"
+            
+            # Crear ventana para mostrar la agenda
+            schedule_window = tk.Toplevel(self.root)
+            schedule_window.title(title)
+            schedule_window.geometry("900x400")
+            
+            # Crear tabla
+            columns = ('Fecha', 'Paciente', 'Doctor', 'Razón', 'Estado')
+            tree = ttk.Treeview(schedule_window, columns=columns, show='headings')
+            
+            for col in columns:
+                tree.heading(col, text=col)
+                tree.column(col, width=150)
+            
+            for appointment in appointments:
+                patient_name = self.patient_use_case.get_patient_name(appointment.patient_id)
+                tree.insert('', 'end', values=(
+                    appointment.date.strftime("%Y-%m-%d %H:%M"),
+                    patient_name or "Paciente no encontrado",
+                    appointment.doctor_name,
+                    appointment.reason,
+                    appointment.status
+                ))
+            
+            tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al cargar la agenda: {str(e)}")
+
+    def load_secondary_data(self):
+        """Carga los datos de las pestañas que no se ven al iniciar"""
+        self.load_appointments()
+        self.load_treatments()
+        self.update_patient_combos()
+
     def run(self):
         """Ejecuta la aplicación"""
         # Cargar datos iniciales
         self.load_patients()
-        self.load_appointments()
-        self.load_treatments()
-        self.update_patient_combos()
+        self.load_secondary_data()
         
         # Ejecutar la aplicación
         self.root.mainloop()
@@ -0,0 +1,273 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+import mysql.connector
+from infrastructure.connection_pool import ConnectionPool, get_connection_pool
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Cambio versionado del esquema de la base de datos
+    """
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+# Migraciones en orden de aplicación. Nunca se modifica una migración ya publicada:
+# los cambios nuevos se agregan como una versión nueva al final de la lista.
+MIGRATIONS = [
+    Migration(1, "Tablas de pacientes, citas y tratamientos", (
+        """
+        CREATE TABLE IF NOT EXISTS Pacientes (
+            ID VARCHAR(36) PRIMARY KEY,
+            Nombre VARCHAR(100) NOT NULL,
+            Edad INT NOT NULL,
+            Genero VARCHAR(10) NOT NULL,
+            HistorialMedico TEXT,
+            Contacto VARCHAR(100) NOT NULL,
+            CreatedAt DATETIME NOT NULL,
+            UpdatedAt DATETIME NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Citas (
+            ID VARCHAR(50) PRIMARY KEY,
+            PatientID VARCHAR(36) NOT NULL,
+            Fecha DATETIME NOT NULL,
+            Doctor VARCHAR(100) NOT NULL,
+            Razon VARCHAR(200) NOT NULL,
+            Estado VARCHAR(20) NOT NULL,
+            Notas TEXT,
+            FOREIGN KEY (PatientID) REFERENCES Pacientes(ID)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Tratamientos (
+            ID VARCHAR(50) PRIMARY KEY,
+            PatientID VARCHAR(36) NOT NULL,
+            Diagnostico VARCHAR(200) NOT NULL,
+            Prescripcion TEXT NOT NULL,
+            FechaInicio DATETIME NOT NULL,
+            FechaFin DATETIME,
+            Estado VARCHAR(20) NOT NULL,
+            FOREIGN KEY (PatientID) REFERENCES Pacientes(ID)
+        )
+        """,
+    )),
+    Migration(2, "Índices secundarios para búsquedas, listados paginados y reportes", (
+        # Búsqueda y listado de pacientes (keyset por Nombre, ID)
+        "CREATE INDEX idx_pacientes_nombre ON Pacientes (Nombre, ID)",
+        "CREATE INDEX idx_pacientes_edad ON Pacientes (Edad)",
+        "CREATE INDEX idx_pacientes_genero ON Pacientes (Genero)",
+        "CREATE INDEX idx_pacientes_contacto ON Pacientes (Contacto)",
+        "CREATE INDEX idx_pacientes_created_at ON Pacientes (CreatedAt)",
+        # Listado de citas (keyset por Fecha, ID), citas por paciente y filtros por estado
+        "CREATE INDEX idx_citas_fecha ON Citas (Fecha, ID)",
+        "CREATE INDEX idx_citas_paciente_fecha ON Citas (PatientID, Fecha, ID)",
+        "CREATE INDEX idx_citas_estado ON Citas (Estado)",
+        # Listado de tratamientos (keyset por FechaInicio, ID), tratamientos por paciente y estado
+        "CREATE INDEX idx_tratamientos_fecha_inicio ON Tratamientos (FechaInicio, ID)",
+        "CREATE INDEX idx_tratamientos_paciente_fecha ON Tratamientos (PatientID, FechaInicio, ID)",
+        "CREATE INDEX idx_tratamientos_estado ON Tratamientos (Estado)",
+    )),
+    Migration(3, "Índice FULLTEXT para la búsqueda de pacientes por texto", (
+        # La collation utf8mb4_unicode_ci hace que la búsqueda ignore mayúsculas y tildes
+        "ALTER TABLE Pacientes ADD FULLTEXT INDEX ftx_pacientes_texto (Nombre, Contacto, HistorialMedico)",
+    )),
+    Migration(4, "Contadores materializados del reporte", (
+        """
+        CREATE TABLE IF NOT EXISTS EstadisticasReporte (
+            Clave VARCHAR(100) PRIMARY KEY,
+            Valor BIGINT NOT NULL
+        )
+        """,
+        # Carga inicial de los contadores con los datos existentes (ReportService.counter_keys).
+        # El SQL queda fijo como se publicó: si cambian AGE_RANGES, los prefijos o los estados,
+        # los contadores se corrigen con reconcile_statistics (--reconcile-stats) o una migración nueva
+        """
+        INSERT INTO EstadisticasReporte (Clave, Valor)
+        SELECT CONCAT('pacientes.genero.', Genero), COUNT(*) FROM Pacientes GROUP BY Genero
+        ON DUPLICATE KEY UPDATE Valor = VALUES(Valor)
+        """,
+        """
+        INSERT INTO EstadisticasReporte (Clave, Valor)
+        SELECT CONCAT('pacientes.edad.', Rango), COUNT(*) FROM (
+            SELECT CASE
+                WHEN Edad <= 18 THEN '0-18'
+                WHEN Edad <= 30 THEN '19-30'
+                WHEN Edad <= 50 THEN '31-50'
+                WHEN Edad <= 70 THEN '51-70'
+                ELSE '71+'
+            END AS Rango
+            FROM Pacientes
+        ) AS Rangos
+        GROUP BY Rango
+        ON DUPLICATE KEY UPDATE Valor = VALUES(Valor)
+        """,
+        """
+        INSERT INTO EstadisticasReporte (Clave, Valor)
+        SELECT 'tratamientos.activos', COUNT(*) FROM Tratamientos WHERE Estado = 'active'
+        ON DUPLICATE KEY UPDATE Valor = VALUES(Valor)
+        """,
+        """
+        INSERT INTO EstadisticasReporte (Clave, Valor)
+        SELECT CONCAT('citas.programadas.', CAST(DATE(Fecha) AS CHAR)), COUNT(*)
+        FROM Citas WHERE Estado = 'scheduled' GROUP BY DATE(Fecha)
+        ON DUPLICATE KEY UPDATE Valor = VALUES(Valor)
+        """,
+    )),
+    Migration(5, "Índice de citas por estado y fecha para consultas por rango", (
+        # InnoDB agrega el ID al final de cada índice secundario: el rango Estado = %s AND Fecha
+        # BETWEEN ... se resuelve y se ordena por (Fecha, ID) sin recorrer la tabla
+        "CREATE INDEX idx_citas_estado_fecha ON Citas (Estado, Fecha)",
+        # idx_citas_estado queda cubierto por el prefijo del índice nuevo
+        "DROP INDEX idx_citas_estado ON Citas",
+    )),
+    Migration(6, "Índice de tratamientos por estado y fecha de inicio", (
+        # Listado por estado en orden (FechaInicio, ID) descendente, sin recorrer la tabla
+        "CREATE INDEX idx_tratamientos_estado_fecha ON Tratamientos (Estado, FechaInicio)",
+        # idx_tratamientos_estado queda cubierto por el prefijo del índice nuevo
+        "DROP INDEX idx_tratamientos_estado ON Tratamientos",
+    )),
+    Migration(7, "Duración de las citas e índice por doctor y fecha", (
+        "ALTER TABLE Citas ADD COLUMN DuracionMinutos INT NOT NULL DEFAULT 30",
+        # Búsqueda de superposiciones de un doctor (find_overlapping) como rango del índice
+        "CREATE INDEX idx_citas_doctor_fecha ON Citas (Doctor, Fecha)",
+    )),
+]
+
+# Errores de MySQL que indican que el objeto ya existe; permiten reanudar una migración
+# que quedó a medias, ya que en MySQL cada sentencia DDL se confirma por separado
+ER_TABLE_EXISTS = 1050
+ER_DUP_FIELDNAME = 1060
+ER_DUP_KEYNAME = 1061
+ER_CANT_DROP_FIELD_OR_KEY = 1091
+ALREADY_APPLIED_ERRORS = (ER_TABLE_EXISTS, ER_DUP_FIELDNAME, ER_DUP_KEYNAME, ER_CANT_DROP_FIELD_OR_KEY)
+
+MIGRATION_LOCK_NAME = 'saludtotal_schema_migrations'
+MIGRATION_LOCK_TIMEOUT = 60
+
+
+class MigrationRunner:
+    """
+    Aplica las migraciones pendientes y registra las versiones en la tabla SchemaVersion
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool] = None, migrations: Optional[List[Migration]] = None):
+        self.pool = pool or get_connection_pool()
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda migration: migration.version)
+
+    def applied_versions(self) -> Set[int]:
+        """Devuelve las versiones ya aplicadas en la base de datos"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            self._create_version_table(cursor)
+            return self._read_applied_versions(cursor)
+
+        finally:
+            cursor.close()
+            connection.close()
+
+    def pending_migrations(self) -> List[Migration]:
+        """Devuelve las migraciones que aún no se aplicaron"""
+        applied = self.applied_versions()
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    def run(self) -> List[int]:
+        """
+        Aplica en orden las migraciones pendientes y devuelve las versiones aplicadas.
+        Es idempotente: si no hay pendientes solo consulta la tabla de versiones.
+        """
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            self._create_version_table(cursor)
+
+            # Bloqueo con nombre para que dos instancias no migren a la vez
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT))
+            if cursor.fetchone()[0] != 1:
+                raise RuntimeError("No se pudo obtener el bloqueo de migraciones del esquema")
+
+            try:
+                applied = self._read_applied_versions(cursor)
+                newly_applied = []
+                for migration in self.migrations:
+                    if migration.version in applied:
+                        continue
+                    self._apply(cursor, migration)
+                    connection.commit()
+                    newly_applied.append(migration.version)
+                return newly_applied
+
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+                cursor.fetchone()
+
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _apply(self, cursor, migration: Migration):
+        """Ejecuta las sentencias de una migración y registra su versión"""
+        for statement in migration.statements:
+            try:
+                cursor.execute(statement)
+            except mysql.connector.Error as e:
+                if e.errno not in ALREADY_APPLIED_ERRORS:
+                    raise
+
+        cursor.execute(
+            "INSERT INTO SchemaVersion (Version, Descripcion, AplicadaEn) VALUES (%s, %s, %s)",
+            (migration.version, migration.description, datetime.now())
+        )
+
+    @staticmethod
+    def _create_version_table(cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS SchemaVersion (
+                Version INT PRIMARY KEY,
+                Descripcion VARCHAR(200) NOT NULL,
+                AplicadaEn DATETIME NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def _read_applied_versions(cursor) -> Set[int]:
+        cursor.execute("SELECT Version FROM SchemaVersion")
+        return {row[0] for row in cursor.fetchall()}
+
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def ensure_schema(pool: Optional[ConnectionPool] = None) -> List[int]:
+    """
+    Aplica las migraciones pendientes una sola vez por proceso.
+    Las llamadas siguientes no vuelven a consultar la base de datos.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return []
+
+    with _schema_lock:
+        if _schema_ready:
+            return []
+        applied = MigrationRunner(pool).run()
+        _schema_ready = True
+        return applied
+
+
+if __name__ == "__main__":
+    runner = MigrationRunner()
+    versions = runner.run()
+    if versions:
+        print(f"Migraciones aplicadas: {', '.join(str(version) for version in versions)}")
+    else:
+        print("El esquema ya está actualizado")
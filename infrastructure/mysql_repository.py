@@ -1,84 +1,465 @@
+import re
 import mysql.connector
-from typing import List, Optional
-from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
 from domain.entities import Patient, Appointment, Treatment
+from domain.services import AppointmentService
 from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
-from domain.dto import PatientSearchDTO
-from config import DATABASE_CONFIG
+from domain.interning import APPOINTMENT_SCHEDULED, DOCTOR_NAMES, intern_status
+from domain.dto import (
+    PatientSearchDTO, BatchItemResultDTO, PatientListItemDTO, AppointmentListItemDTO, TreatmentListItemDTO
+)
+from config import DATABASE_CONFIG, REPOSITORY_CONFIG, SEARCH_CONFIG
+from infrastructure.connection_pool import ConnectionPool, get_connection_pool
+
+
+# Modos de guardado soportados por los repositorios
+SAVE_MODE_UPSERT = 'upsert'
+SAVE_MODE_CHECK_THEN_WRITE = 'check_then_write'
+SAVE_MODES = (SAVE_MODE_UPSERT, SAVE_MODE_CHECK_THEN_WRITE)
+
+# Lista de stopwords por defecto de InnoDB (las de largo indexable); si una palabra
+# obligatoria (+palabra) es stopword, la búsqueda FULLTEXT no devuelve resultados
+FULLTEXT_STOPWORDS = frozenset({
+    'about', 'are', 'com', 'for', 'from', 'how', 'that', 'the', 'this',
+    'was', 'what', 'when', 'where', 'who', 'will', 'with', 'und', 'www'
+})
+
+# Caracteres de los textos largos que leen las listas (ver list_item_columns)
+PREVIEW_LENGTH = REPOSITORY_CONFIG['preview_length']
+
+# Resultado de una operación de guardado
+SAVE_INSERTED = BatchItemResultDTO.INSERTED
+SAVE_UPDATED = BatchItemResultDTO.UPDATED
 
 
 class MySQLRepository:
     """
     Clase base para repositorios MySQL
     """
+
+    # Metadatos de la tabla que definen las subclases
+    table_name = None
+    insert_columns = ()
+    update_columns = ()
+    # Columnas que leen las consultas de entidades, en el orden en que _row_to_entity
+    # desempaca la fila: se usan cursores de tuplas en vez de cursores con diccionarios
+    select_columns = ()
+    # Columnas (orden, desempate) para la paginación por keyset
+    keyset_columns = ()
+    keyset_descending = False
     
-    def __init__(self):
+    def __init__(self, pool: Optional[ConnectionPool] = None, save_mode: Optional[str] = None):
+        # No abre conexiones ni ejecuta DDL: el esquema se prepara una sola vez al iniciar
+        # la aplicación (ensure_schema) y la primera conexión se toma en la primera consulta
         self.config = DATABASE_CONFIG
-        self._create_tables()
+        self._pool = pool
+        self.save_mode = save_mode or REPOSITORY_CONFIG['save_mode']
+        if self.save_mode not in SAVE_MODES:
+            raise ValueError(f"Modo de guardado no soportado: {self.save_mode}")
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Pool de conexiones del repositorio; usa el compartido si no se indicó otro"""
+        if self._pool is None:
+            self._pool = get_connection_pool()
+        return self._pool
+
+    def _select_list(self, alias: Optional[str] = None, columns: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        Lista de columnas para el SELECT (select_columns si no se indican otras),
+        calificada con 'alias' en consultas con JOIN. Las expresiones (LEFT, COALESCE)
+        van sin calificar, así que solo deben usar columnas que no se repiten en el JOIN.
+        """
+        prefix = f"{alias}." if alias else ''
+        return ', '.join(
+            prefix + column if column.isidentifier() else column
+            for column in columns or self.select_columns
+        )
 
     def _get_connection(self):
-        """Obtiene una conexión a la base de datos"""
-        return mysql.connector.connect(**self.config)
+        """Obtiene una conexión del pool compartido; al cerrarla vuelve al pool"""
+        return self.pool.get_connection()
+
+    def transaction(self):
+        """
+        Abre una transacción del pool: los repositorios que comparten el pool usan una
+        sola conexión hasta el final del bloque y se confirma una sola vez
+        """
+        return self.pool.transaction()
+
+    def save(self, entity):
+        """
+        Guarda o actualiza una entidad en la base de datos.
+        Para saber si se insertó o actualizó, usar upsert(), que devuelve el resultado.
+        """
+        if self.save_mode == SAVE_MODE_UPSERT:
+            self.upsert(entity)
+        else:
+            self._save_check_then_write(entity)
+        return entity
 
-    def _create_tables(self):
-        """Crea las tablas necesarias si no existen"""
+    def upsert(self, entity) -> str:
+        """
+        Inserta o actualiza una entidad con una única sentencia y una única conexión.
+        Devuelve 'inserted' o 'updated'.
+        """
         connection = self._get_connection()
         cursor = connection.cursor()
         
-        # Tabla de pacientes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Pacientes (
-                ID VARCHAR(36) PRIMARY KEY,
-                Nombre VARCHAR(100) NOT NULL,
-                Edad INT NOT NULL,
-                Genero VARCHAR(10) NOT NULL,
-                HistorialMedico TEXT,
-                Contacto VARCHAR(100) NOT NULL,
-                CreatedAt DATETIME NOT NULL,
-                UpdatedAt DATETIME NOT NULL
-            )
-        """)
-        
-        # Tabla de citas médicas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Citas (
-                ID VARCHAR(50) PRIMARY KEY,
-                PatientID VARCHAR(36) NOT NULL,
-                Fecha DATETIME NOT NULL,
-                Doctor VARCHAR(100) NOT NULL,
-                Razon VARCHAR(200) NOT NULL,
-                Estado VARCHAR(20) NOT NULL,
-                Notas TEXT,
-                FOREIGN KEY (PatientID) REFERENCES Pacientes(ID)
+        try:
+            cursor.execute(self._upsert_statement(), self._to_params(entity))
+            connection.commit()
+            # MySQL informa 1 fila afectada al insertar y 2 (o 0 si no hubo cambios) al actualizar
+            return SAVE_INSERTED if cursor.rowcount == 1 else SAVE_UPDATED
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _upsert_statement(self) -> str:
+        """Construye la sentencia INSERT ... ON DUPLICATE KEY UPDATE de la tabla"""
+        columns = ', '.join(self.insert_columns)
+        placeholders = ', '.join(['%s'] * len(self.insert_columns))
+        updates = ', '.join(f"{column} = VALUES({column})" for column in self.update_columns)
+        return (
+            f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
+    def save_many(self, entities: Iterable, batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Guarda o actualiza entidades por lotes con executemany, con un commit por lote.
+        Acepta cualquier iterable (incluso generadores) y devuelve el resultado de cada fila.
+        """
+        batch_size = batch_size or REPOSITORY_CONFIG['batch_size']
+        iterator = iter(entities)
+        results = []
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            while True:
+                chunk = list(islice(iterator, batch_size))
+                if not chunk:
+                    break
+                results.extend(self._save_chunk(connection, cursor, chunk))
+            return results
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def delete_many(self, ids: Iterable, batch_size: Optional[int] = None) -> List[BatchItemResultDTO]:
+        """
+        Elimina entidades por lotes con un commit por lote.
+        Devuelve 'deleted' o 'not_found' para cada ID.
+        """
+        batch_size = batch_size or REPOSITORY_CONFIG['batch_size']
+        iterator = (str(entity_id) for entity_id in ids)
+        results = []
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            while True:
+                chunk = list(islice(iterator, batch_size))
+                if not chunk:
+                    break
+                results.extend(self._delete_chunk(connection, cursor, chunk))
+            return results
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def find_by_ids(self, ids: Iterable) -> List:
+        """Obtiene en una sola consulta las entidades con los IDs indicados que existan"""
+        ids = list({str(entity_id) for entity_id in ids})
+        if not ids:
+            return []
+
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(
+                f"SELECT {self._select_list()} FROM {self.table_name} WHERE ID IN ({placeholders})", tuple(ids)
             )
-        """)
-        
-        # Tabla de tratamientos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Tratamientos (
-                ID VARCHAR(50) PRIMARY KEY,
-                PatientID VARCHAR(36) NOT NULL,
-                Diagnostico VARCHAR(200) NOT NULL,
-                Prescripcion TEXT NOT NULL,
-                FechaInicio DATETIME NOT NULL,
-                FechaFin DATETIME,
-                Estado VARCHAR(20) NOT NULL,
-                FOREIGN KEY (PatientID) REFERENCES Pacientes(ID)
+            return [self._row_to_entity(row) for row in cursor.fetchall()]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def existing_ids(self, ids: Iterable) -> Set[str]:
+        """Devuelve cuáles de los IDs indicados existen en la tabla"""
+        ids = list({str(entity_id) for entity_id in ids})
+        if not ids:
+            return set()
+
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            return self._existing_ids(cursor, ids)
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _save_chunk(self, connection, cursor, chunk: list) -> List[BatchItemResultDTO]:
+        """Guarda un lote en una transacción; si falla, todo el lote queda como 'failed'"""
+        ids = [str(entity.id) for entity in chunk]
+        try:
+            existing = self._existing_ids(cursor, ids)
+            cursor.executemany(self._upsert_statement(), [self._to_params(entity) for entity in chunk])
+            connection.commit()
+        except mysql.connector.Error as e:
+            connection.rollback()
+            return [BatchItemResultDTO(entity_id, BatchItemResultDTO.FAILED, str(e)) for entity_id in ids]
+
+        results = []
+        for entity_id in ids:
+            # Un ID repetido dentro del lote actualiza la fila insertada previamente
+            outcome = SAVE_UPDATED if entity_id in existing else SAVE_INSERTED
+            existing.add(entity_id)
+            results.append(BatchItemResultDTO(entity_id, outcome))
+        return results
+
+    def _delete_chunk(self, connection, cursor, ids: list) -> List[BatchItemResultDTO]:
+        """Elimina un lote en una transacción; si falla, todo el lote queda como 'failed'"""
+        try:
+            existing = self._existing_ids(cursor, ids)
+            if existing:
+                placeholders = ', '.join(['%s'] * len(existing))
+                cursor.execute(
+                    f"DELETE FROM {self.table_name} WHERE ID IN ({placeholders})",
+                    tuple(existing)
+                )
+            connection.commit()
+        except mysql.connector.Error as e:
+            connection.rollback()
+            return [BatchItemResultDTO(entity_id, BatchItemResultDTO.FAILED, str(e)) for entity_id in ids]
+
+        results = []
+        for entity_id in ids:
+            if entity_id in existing:
+                existing.discard(entity_id)
+                results.append(BatchItemResultDTO(entity_id, BatchItemResultDTO.DELETED))
+            else:
+                results.append(BatchItemResultDTO(entity_id, BatchItemResultDTO.NOT_FOUND))
+        return results
+
+    def _existing_ids(self, cursor, ids: list) -> Set[str]:
+        """Consulta en una sola sentencia qué IDs existen, usando el cursor recibido"""
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(f"SELECT ID FROM {self.table_name} WHERE ID IN ({placeholders})", tuple(ids))
+        return {row[0] for row in cursor.fetchall()}
+
+    def page_key(self, entity) -> tuple:
+        """Devuelve los valores de keyset_columns de una entidad, para continuar la paginación"""
+        raise NotImplementedError
+
+    def _paginate(
+        self,
+        query: str,
+        params: list,
+        limit: Optional[int],
+        after: Optional[tuple],
+        alias: Optional[str] = None
+    ) -> Tuple[str, list]:
+        """
+        Agrega a una consulta con WHERE el filtro keyset, el orden y el límite.
+        'after' es el page_key de la última fila de la página anterior.
+        'alias' califica las columnas del keyset en consultas con JOIN.
+        """
+        prefix = f"{alias}." if alias else ''
+        order_column, tiebreak_column = (prefix + column for column in self.keyset_columns)
+        operator = '<' if self.keyset_descending else '>'
+        direction = ' DESC' if self.keyset_descending else ''
+        params = list(params)
+
+        if after is not None:
+            query += (
+                f" AND ({order_column} {operator} %s"
+                f" OR ({order_column} = %s AND {tiebreak_column} {operator} %s))"
             )
-        """)
+            params.extend([after[0], after[0], after[1]])
+
+        query += f" ORDER BY {order_column}{direction}, {tiebreak_column}{direction}"
+
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        return query, params
+
+    def _iter_rows(
+        self,
+        query: str,
+        params: list,
+        row_to_entity: Callable[[tuple], object],
+        chunk_size: Optional[int] = None
+    ) -> Iterator:
+        """
+        Recorre el resultado de una consulta con un cursor sin buffer, leyendo
+        chunk_size filas por vez, de modo que la memoria no depende del tamaño de la tabla.
+        La conexión se toma recién en la primera iteración.
+        """
+        chunk_size = chunk_size or REPOSITORY_CONFIG['stream_chunk_size']
+        # Dentro de una transacción la conexión es la de la transacción: no se puede descartar
+        in_transaction = self.pool.in_transaction()
+        connection = self._get_connection()
+        cursor = None
+        exhausted = False
+        
+        try:
+            cursor = connection.cursor(buffered=False)
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    exhausted = True
+                    break
+                for row in rows:
+                    yield row_to_entity(row)
+                    
+        finally:
+            if exhausted:
+                cursor.close()
+                connection.close()
+            elif in_transaction and self._drain(cursor, chunk_size):
+                # Se leyó el resto del resultado: la conexión (y la transacción) siguen usables
+                cursor.close()
+                connection.close()
+            else:
+                # El consumidor se detuvo antes del final (o hubo un error): quedan filas
+                # sin leer en el servidor, así que la conexión se descarta en vez de volver al pool.
+                # Dentro de una transacción esto solo ocurre si no se pudo vaciar el cursor.
+                connection.invalidate()
+
+    @staticmethod
+    def _drain(cursor, chunk_size: int) -> bool:
+        """
+        Lee y descarta las filas pendientes de un cursor sin buffer, para cortar un recorrido
+        dentro de una transacción sin perderla. Devuelve False si no se pudo vaciar.
+        """
+        if cursor is None:
+            return True
+        try:
+            while cursor.fetchmany(chunk_size):
+                pass
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def _fetch_pairs(self, query: str, params: Iterable = ()) -> List[tuple]:
+        """Ejecuta una consulta de dos columnas (clave, valor) y devuelve sus filas"""
+        connection = self._get_connection()
+        cursor = connection.cursor()
         
-        connection.commit()
-        cursor.close()
-        connection.close()
+        try:
+            cursor.execute(query, tuple(params))
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _fetch_items(self, query: str, params: Iterable, to_item: Callable[..., object]) -> List:
+        """
+        Ejecuta una consulta de proyección y crea cada resultado con to_item(*fila),
+        sin pasar por la entidad: las columnas deben venir en el orden de los argumentos
+        """
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(query, tuple(params))
+            return [to_item(*row) for row in cursor.fetchall()]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _fetch_one(self, query: str, params: tuple) -> Optional[tuple]:
+        """Ejecuta una consulta y devuelve su primera fila, o None si no hay resultados"""
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _fetch_count(self, query: str, params: tuple) -> int:
+        """Ejecuta una consulta de un solo valor (COUNT, SUM) y lo devuelve"""
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _to_params(self, entity) -> tuple:
+        """Convierte una entidad en los parámetros de insert_columns"""
+        raise NotImplementedError
+
+    def _row_to_entity(self, row: tuple):
+        """Convierte una fila (tupla en el orden de select_columns) en la entidad del repositorio"""
+        raise NotImplementedError
+
+    def _save_check_then_write(self, entity) -> str:
+        """Guardado anterior: consulta si existe y luego ejecuta UPDATE o INSERT"""
+        raise NotImplementedError
 
 
 class MySQLPatientRepository(MySQLRepository):
     """
     Repositorio MySQL para la gestión de pacientes
     """
+
+    table_name = 'Pacientes'
+    insert_columns = ('ID', 'Nombre', 'Edad', 'Genero', 'HistorialMedico', 'Contacto', 'CreatedAt', 'UpdatedAt')
+    update_columns = ('Nombre', 'Edad', 'Genero', 'HistorialMedico', 'Contacto', 'UpdatedAt')
+    select_columns = insert_columns
+    # Columnas de PatientListItemDTO (lista y búsqueda), en el orden de sus campos. Del historial
+    # solo se lee el comienzo: un carácter más que preview_length, para saber si continúa
+    list_item_columns = (
+        'ID', 'Nombre', 'Edad', 'Genero', 'Contacto',
+        f"LEFT(COALESCE(HistorialMedico, ''), {PREVIEW_LENGTH + 1})"
+    )
+    keyset_columns = ('Nombre', 'ID')
+
+    def page_key(self, patient: Patient) -> tuple:
+        """Devuelve (Nombre, ID) del paciente"""
+        return (patient.name, str(patient.id))
+
+    def _to_params(self, patient: Patient) -> tuple:
+        """Convierte un paciente en los parámetros de insert_columns"""
+        return (
+            str(patient.id),
+            patient.name,
+            patient.age.value,
+            patient.gender.value,
+            patient.medical_history.value,
+            patient.contact.value,
+            patient.created_at,
+            patient.updated_at
+        )
     
-    def save(self, patient: Patient) -> Patient:
-        """Guarda o actualiza un paciente en la base de datos"""
+    def _save_check_then_write(self, patient: Patient) -> str:
+        """Guarda o actualiza un paciente consultando antes si existe"""
         connection = self._get_connection()
         cursor = connection.cursor()
         
@@ -99,6 +480,7 @@ class MySQLPatientRepository(MySQLRepository):
                     patient.updated_at,
                     str(patient.id)
                 ))
+                outcome = SAVE_UPDATED
             else:
                 # Insertar nuevo paciente
                 cursor.execute("""
@@ -115,9 +497,10 @@ class MySQLPatientRepository(MySQLRepository):
                     patient.created_at,
                     patient.updated_at
                 ))
+                outcome = SAVE_INSERTED
             
             connection.commit()
-            return patient
+            return outcome
             
         finally:
             cursor.close()
@@ -126,12 +509,12 @@ class MySQLPatientRepository(MySQLRepository):
     def find_by_id(self, patient_id: PatientId) -> Optional[Patient]:
         """Busca un paciente por su ID"""
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT * FROM Pacientes WHERE ID = %s
-            """, (str(patient_id),))
+            cursor.execute(
+                f"SELECT {self._select_list()} FROM Pacientes WHERE ID = %s", (str(patient_id),)
+            )
             
             row = cursor.fetchone()
             if row:
@@ -142,13 +525,29 @@ class MySQLPatientRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def find_all(self) -> List[Patient]:
-        """Obtiene todos los pacientes"""
+    def find_medical_history(self, patient_id: PatientId) -> Optional[str]:
+        """
+        Historial médico completo de un paciente ('' si no tiene), o None si no existe.
+        Las listas solo leen el comienzo; el texto completo se consulta al abrir el registro.
+        """
+        row = self._fetch_one(
+            "SELECT COALESCE(HistorialMedico, '') FROM Pacientes WHERE ID = %s", (str(patient_id),)
+        )
+        return row[0] if row else None
+
+    def find_all(self, limit: Optional[int] = None, after: Optional[tuple] = None) -> List[Patient]:
+        """
+        Obtiene los pacientes ordenados por (Nombre, ID).
+        Con limit y after devuelve solo la página siguiente a la clave indicada.
+        """
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("SELECT * FROM Pacientes ORDER BY Nombre")
+            query, params = self._paginate(
+                f"SELECT {self._select_list()} FROM Pacientes WHERE 1=1", [], limit, after
+            )
+            cursor.execute(query, params)
             rows = cursor.fetchall()
             return [self._row_to_patient(row) for row in rows]
             
@@ -156,36 +555,60 @@ class MySQLPatientRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def search(self, search_dto: PatientSearchDTO) -> List[Patient]:
-        """Busca pacientes según criterios específicos"""
+    def iter_all(self, chunk_size: Optional[int] = None) -> Iterator[Patient]:
+        """Recorre todos los pacientes ordenados por (Nombre, ID) sin cargarlos en memoria"""
+        query, params = self._paginate(
+            f"SELECT {self._select_list()} FROM Pacientes WHERE 1=1", [], None, None
+        )
+        return self._iter_rows(query, params, self._row_to_patient, chunk_size)
+
+    def find_created_since(self, since: datetime, limit: int) -> List[Patient]:
+        """
+        Obtiene los 'limit' pacientes más nuevos dados de alta desde 'since', del más reciente
+        al más antiguo. Ambas columnas del orden van en DESC para que MySQL recorra el índice
+        (CreatedAt) hacia atrás y se detenga al llegar al límite, sin ordenar todo el rango.
+        """
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            query = "SELECT * FROM Pacientes WHERE 1=1"
-            params = []
-            
-            if search_dto.name:
-                query += " AND Nombre LIKE %s"
-                params.append(f"%{search_dto.name}%")
-            
-            if search_dto.age_min is not None:
-                query += " AND Edad >= %s"
-                params.append(search_dto.age_min)
-            
-            if search_dto.age_max is not None:
-                query += " AND Edad <= %s"
-                params.append(search_dto.age_max)
-            
-            if search_dto.gender:
-                query += " AND Genero = %s"
-                params.append(search_dto.gender)
-            
-            if search_dto.contact:
-                query += " AND Contacto LIKE %s"
-                params.append(f"%{search_dto.contact}%")
+            cursor.execute(
+                f"SELECT {self._select_list()} FROM Pacientes "
+                f"WHERE CreatedAt >= %s ORDER BY CreatedAt DESC, ID DESC LIMIT %s",
+                (since, limit)
+            )
+            rows = cursor.fetchall()
+            return [self._row_to_patient(row) for row in rows]
             
-            query += " ORDER BY Nombre"
+        finally:
+            cursor.close()
+            connection.close()
+
+    def iter_names(self, chunk_size: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        """Recorre los pares (ID, Nombre) de todos los pacientes; alimenta el índice de autocompletado"""
+        return self._iter_rows(
+            "SELECT ID, Nombre FROM Pacientes", [], tuple, chunk_size
+        )
+
+    def iter_search(self, search_dto: PatientSearchDTO, chunk_size: Optional[int] = None) -> Iterator[Patient]:
+        """Recorre los pacientes que cumplen los criterios sin cargarlos en memoria"""
+        query, params = self._search_query(search_dto)
+        query, params = self._paginate(query, params, None, None)
+        return self._iter_rows(query, params, self._row_to_patient, chunk_size)
+
+    def search(
+        self,
+        search_dto: PatientSearchDTO,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[Patient]:
+        """Busca pacientes según criterios específicos, con paginación opcional por (Nombre, ID)"""
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            query, params = self._search_query(search_dto)
+            query, params = self._paginate(query, params, limit, after)
             
             cursor.execute(query, params)
             rows = cursor.fetchall()
@@ -195,6 +618,114 @@ class MySQLPatientRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
+    def search_text(self, term: str, limit: Optional[int] = None) -> List[Patient]:
+        """
+        Busca pacientes por nombre, contacto e historial médico usando el índice FULLTEXT.
+        Cada palabra del término es obligatoria y se busca como prefijo; los resultados
+        vuelven ordenados por relevancia. Si ninguna palabra alcanza el largo mínimo que
+        indexa MySQL, se busca por prefijo del nombre.
+        """
+        search = self._search_text_query(term, limit, self._select_list())
+        if search is None:
+            return []
+
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute(*search)
+            rows = cursor.fetchall()
+            return [self._row_to_patient(row) for row in rows]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def search_text_items(self, term: str, limit: Optional[int] = None) -> List[PatientListItemDTO]:
+        """Igual que search_text, pero devuelve directamente las filas de la lista (PatientListItemDTO)"""
+        search = self._search_text_query(term, limit, self._select_list(columns=self.list_item_columns))
+        if search is None:
+            return []
+        return self._fetch_items(*search, PatientListItemDTO)
+
+    def list_items(self, limit: Optional[int] = None, after: Optional[tuple] = None) -> List[PatientListItemDTO]:
+        """
+        Filas de la lista de pacientes, ordenadas por (Nombre, ID) y con paginación opcional,
+        leyendo solo las columnas que muestra la lista
+        """
+        query, params = self._paginate(
+            f"SELECT {self._select_list(columns=self.list_item_columns)} FROM Pacientes WHERE 1=1", [], limit, after
+        )
+        return self._fetch_items(query, params, PatientListItemDTO)
+
+    def _search_text_query(self, term: str, limit: Optional[int], select_list: str) -> Optional[Tuple[str, tuple]]:
+        """
+        Construye la consulta de search_text con las columnas indicadas, o None si no hay nada
+        que buscar. La relevancia solo se usa para ordenar, así no ocupa una columna del resultado.
+        """
+        limit = limit or SEARCH_CONFIG['max_results']
+        tokens = self._search_tokens(term)
+        if not tokens and not term.strip():
+            return None
+
+        if tokens:
+            boolean_query = ' '.join(f"+{token}*" for token in tokens)
+            return f"""
+                SELECT {select_list}
+                FROM Pacientes
+                WHERE MATCH (Nombre, Contacto, HistorialMedico) AGAINST (%s IN BOOLEAN MODE)
+                ORDER BY MATCH (Nombre, Contacto, HistorialMedico) AGAINST (%s IN BOOLEAN MODE) DESC, Nombre, ID
+                LIMIT %s
+            """, (boolean_query, boolean_query, limit)
+
+        return (
+            f"SELECT {select_list} FROM Pacientes WHERE Nombre LIKE %s ORDER BY Nombre, ID LIMIT %s",
+            (f"{self._escape_like(term.strip())}%", limit)
+        )
+
+    @staticmethod
+    def _search_tokens(term: str) -> List[str]:
+        """
+        Divide el término en palabras (incluye letras con tilde y ñ) y descarta las que
+        MySQL no indexa, de modo que los operadores del modo booleano no lleguen a la consulta
+        """
+        return [
+            token for token in re.findall(r"\w+", term.lower())
+            if len(token) >= SEARCH_CONFIG['min_token_size'] and token not in FULLTEXT_STOPWORDS
+        ]
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        """Escapa los comodines de LIKE en un valor ingresado por el usuario"""
+        return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    def _search_query(self, search_dto: PatientSearchDTO) -> Tuple[str, list]:
+        """Construye la consulta filtrada de search sin orden ni límite"""
+        query = f"SELECT {self._select_list()} FROM Pacientes WHERE 1=1"
+        params = []
+        
+        if search_dto.name:
+            query += " AND Nombre LIKE %s"
+            params.append(f"%{search_dto.name}%")
+        
+        if search_dto.age_min is not None:
+            query += " AND Edad >= %s"
+            params.append(search_dto.age_min)
+        
+        if search_dto.age_max is not None:
+            query += " AND Edad <= %s"
+            params.append(search_dto.age_max)
+        
+        if search_dto.gender:
+            query += " AND Genero = %s"
+            params.append(search_dto.gender)
+        
+        if search_dto.contact:
+            query += " AND Contacto LIKE %s"
+            params.append(f"%{search_dto.contact}%")
+        
+        return query, params
+
     def delete(self, patient_id: PatientId) -> bool:
         """Elimina un paciente de la base de datos"""
         connection = self._get_connection()
@@ -223,17 +754,24 @@ class MySQLPatientRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def _row_to_patient(self, row: dict) -> Patient:
-        """Convierte una fila de la base de datos a una entidad Patient"""
+    def _row_to_entity(self, row: tuple) -> Patient:
+        return self._row_to_patient(row)
+
+    def _row_to_patient(self, row: tuple) -> Patient:
+        """
+        Convierte una fila (en el orden de select_columns) a una entidad Patient.
+        Los valores ya se validaron al guardarse: los value objects se crean sin validar.
+        """
+        patient_id, name, age, gender, medical_history, contact, created_at, updated_at = row
         return Patient(
-            id=PatientId.from_string(row['ID']),
-            name=row['Nombre'],
-            age=Age(row['Edad']),
-            gender=Gender(row['Genero']),
-            medical_history=MedicalHistory(row['HistorialMedico']),
-            contact=Contact(row['Contacto']),
-            created_at=row['CreatedAt'],
-            updated_at=row['UpdatedAt']
+            PatientId(patient_id),
+            name,
+            Age.from_trusted(age),
+            Gender.from_trusted(gender),
+            MedicalHistory.from_trusted(medical_history or ''),
+            Contact.from_trusted(contact),
+            created_at,
+            updated_at
         )
 
 
@@ -241,9 +779,34 @@ class MySQLAppointmentRepository(MySQLRepository):
     """
     Repositorio MySQL para la gestión de citas médicas
     """
+
+    table_name = 'Citas'
+    insert_columns = ('ID', 'PatientID', 'Fecha', 'Doctor', 'Razon', 'Estado', 'Notas', 'DuracionMinutos')
+    update_columns = ('PatientID', 'Fecha', 'Doctor', 'Razon', 'Estado', 'Notas', 'DuracionMinutos')
+    select_columns = insert_columns
+    # Columnas de AppointmentListItemDTO, en el orden de sus campos (el nombre del paciente va al final)
+    list_item_columns = ('ID', 'Fecha', 'Doctor', 'Razon', 'Estado')
+    keyset_columns = ('Fecha', 'ID')
+
+    def page_key(self, appointment: Appointment) -> tuple:
+        """Devuelve (Fecha, ID) de la cita"""
+        return (appointment.date, appointment.id)
+
+    def _to_params(self, appointment: Appointment) -> tuple:
+        """Convierte una cita en los parámetros de insert_columns"""
+        return (
+            appointment.id,
+            str(appointment.patient_id),
+            appointment.date,
+            appointment.doctor_name,
+            appointment.reason,
+            appointment.status,
+            appointment.notes,
+            appointment.duration_minutes
+        )
     
-    def save(self, appointment: Appointment) -> Appointment:
-        """Guarda o actualiza una cita en la base de datos"""
+    def _save_check_then_write(self, appointment: Appointment) -> str:
+        """Guarda o actualiza una cita consultando antes si existe"""
         connection = self._get_connection()
         cursor = connection.cursor()
         
@@ -253,7 +816,7 @@ class MySQLAppointmentRepository(MySQLRepository):
                 cursor.execute("""
                     UPDATE Citas 
                     SET PatientID = %s, Fecha = %s, Doctor = %s, Razon = %s, 
-                        Estado = %s, Notas = %s
+                        Estado = %s, Notas = %s, DuracionMinutos = %s
                     WHERE ID = %s
                 """, (
                     str(appointment.patient_id),
@@ -262,13 +825,15 @@ class MySQLAppointmentRepository(MySQLRepository):
                     appointment.reason,
                     appointment.status,
                     appointment.notes,
+                    appointment.duration_minutes,
                     appointment.id
                 ))
+                outcome = SAVE_UPDATED
             else:
                 # Insertar nueva cita
                 cursor.execute("""
-                    INSERT INTO Citas (ID, PatientID, Fecha, Doctor, Razon, Estado, Notas)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    INSERT INTO Citas (ID, PatientID, Fecha, Doctor, Razon, Estado, Notas, DuracionMinutos)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 """, (
                     appointment.id,
                     str(appointment.patient_id),
@@ -276,11 +841,13 @@ class MySQLAppointmentRepository(MySQLRepository):
                     appointment.doctor_name,
                     appointment.reason,
                     appointment.status,
-                    appointment.notes
+                    appointment.notes,
+                    appointment.duration_minutes
                 ))
+                outcome = SAVE_INSERTED
             
             connection.commit()
-            return appointment
+            return outcome
             
         finally:
             cursor.close()
@@ -289,12 +856,10 @@ class MySQLAppointmentRepository(MySQLRepository):
     def find_by_id(self, appointment_id: str) -> Optional[Appointment]:
         """Busca una cita por su ID"""
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT * FROM Citas WHERE ID = %s
-            """, (appointment_id,))
+            cursor.execute(f"SELECT {self._select_list()} FROM Citas WHERE ID = %s", (appointment_id,))
             
             row = cursor.fetchone()
             if row:
@@ -305,13 +870,21 @@ class MySQLAppointmentRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def find_all(self) -> List[Appointment]:
-        """Obtiene todas las citas"""
+    def find_notes(self, appointment_id: str) -> Optional[str]:
+        """Notas completas de una cita ('' si no tiene), o None si no existe; las listas no las leen"""
+        row = self._fetch_one("SELECT COALESCE(Notas, '') FROM Citas WHERE ID = %s", (appointment_id,))
+        return row[0] if row else None
+
+    def find_all(self, limit: Optional[int] = None, after: Optional[tuple] = None) -> List[Appointment]:
+        """Obtiene las citas ordenadas por (Fecha, ID), con paginación opcional"""
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("SELECT * FROM Citas ORDER BY Fecha")
+            query, params = self._paginate(
+                f"SELECT {self._select_list()} FROM Citas WHERE 1=1", [], limit, after
+            )
+            cursor.execute(query, params)
             rows = cursor.fetchall()
             return [self._row_to_appointment(row) for row in rows]
             
@@ -319,15 +892,158 @@ class MySQLAppointmentRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def find_by_patient_id(self, patient_id: PatientId) -> List[Appointment]:
-        """Obtiene todas las citas de un paciente específico"""
+    def find_all_with_patient(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[Tuple[Appointment, Optional[str]]]:
+        """
+        Obtiene las citas junto con el nombre de su paciente en una sola consulta.
+        El nombre es None si el paciente ya no existe.
+        """
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT * FROM Citas WHERE PatientID = %s ORDER BY Fecha
-            """, (str(patient_id),))
+            query, params = self._paginate(f"""
+                SELECT {self._select_list('c')}, p.Nombre AS PacienteNombre
+                FROM Citas c
+                LEFT JOIN Pacientes p ON p.ID = c.PatientID
+                WHERE 1=1
+            """, [], limit, after, alias='c')
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return [(self._row_to_appointment(row[:-1]), row[-1]) for row in rows]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def list_items_with_patient(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[AppointmentListItemDTO]:
+        """
+        Filas de la lista de citas con el nombre del paciente, ordenadas por (Fecha, ID),
+        leyendo solo las columnas que muestra la lista
+        """
+        query, params = self._paginate(f"""
+            SELECT {self._select_list('c', self.list_item_columns)}, p.Nombre
+            FROM Citas c
+            LEFT JOIN Pacientes p ON p.ID = c.PatientID
+            WHERE 1=1
+        """, [], limit, after, alias='c')
+        return self._fetch_items(query, params, AppointmentListItemDTO)
+
+    def list_items_by_patient(
+        self,
+        patient_id: PatientId,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[AppointmentListItemDTO]:
+        """Filas de la lista de citas de un paciente, ordenadas por (Fecha, ID), sin nombre del paciente"""
+        query, params = self._paginate(
+            f"SELECT {self._select_list(columns=self.list_item_columns)} FROM Citas WHERE PatientID = %s",
+            [str(patient_id)], limit, after
+        )
+        return self._fetch_items(query, params, AppointmentListItemDTO)
+
+    def find_scheduled_between(self, start: Optional[datetime], end: datetime) -> List[Appointment]:
+        """
+        Obtiene las citas programadas con fecha entre 'start' y 'end' (ambos incluidos),
+        ordenadas por (Fecha, ID). Sin 'start' incluye también las programadas ya vencidas.
+        Usa el índice idx_citas_estado_fecha (migración 5).
+        """
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            query = f"SELECT {self._select_list()} FROM Citas WHERE Estado = %s AND Fecha <= %s"
+            params = [APPOINTMENT_SCHEDULED, end]
+            if start is not None:
+                query += " AND Fecha >= %s"
+                params.append(start)
+            query, params = self._paginate(query, params, None, None)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return [self._row_to_appointment(row) for row in rows]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def find_overlapping(
+        self,
+        doctor_name: str,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[str] = None,
+        for_update: bool = False
+    ) -> List[Appointment]:
+        """
+        Obtiene las citas programadas del doctor que se superponen con [start, end).
+        Como ninguna cita dura más de AppointmentService.MAX_DURATION_MINUTES, solo pueden
+        superponerse las que empiezan después de start menos ese máximo: la consulta es un
+        rango acotado del índice idx_citas_doctor_fecha (migración 7), no un recorrido de la tabla.
+        Con for_update, dentro de una transacción del pool, bloquea ese rango del índice para
+        que otra transacción no pueda insertar una cita superpuesta antes del commit; fuera de
+        una transacción se ignora, para no dejar bloqueos en una conexión devuelta al pool.
+        """
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            query = f"""
+                SELECT {self._select_list()} FROM Citas
+                WHERE Doctor = %s AND Fecha > %s AND Fecha < %s AND Estado = %s
+                  AND DATE_ADD(Fecha, INTERVAL DuracionMinutos MINUTE) > %s
+            """
+            earliest_start = start - timedelta(minutes=AppointmentService.MAX_DURATION_MINUTES)
+            params = [doctor_name, earliest_start, end, APPOINTMENT_SCHEDULED, start]
+            if exclude_id is not None:
+                query += " AND ID <> %s"
+                params.append(exclude_id)
+            query, params = self._paginate(query, params, None, None)
+            if for_update and self.pool.in_transaction():
+                query += " FOR UPDATE"
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return [self._row_to_appointment(row) for row in rows]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def iter_all(self, chunk_size: Optional[int] = None) -> Iterator[Appointment]:
+        """Recorre todas las citas ordenadas por (Fecha, ID) sin cargarlas en memoria"""
+        query, params = self._paginate(
+            f"SELECT {self._select_list()} FROM Citas WHERE 1=1", [], None, None
+        )
+        return self._iter_rows(query, params, self._row_to_appointment, chunk_size)
+
+    def iter_by_status(self, status: str, chunk_size: Optional[int] = None) -> Iterator[Appointment]:
+        """Recorre las citas en el estado indicado ordenadas por (Fecha, ID), con el índice (Estado, Fecha)"""
+        query, params = self._paginate(
+            f"SELECT {self._select_list()} FROM Citas WHERE Estado = %s", [status], None, None
+        )
+        return self._iter_rows(query, params, self._row_to_appointment, chunk_size)
+
+    def find_by_patient_id(
+        self,
+        patient_id: PatientId,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[Appointment]:
+        """Obtiene las citas de un paciente específico, con paginación opcional por (Fecha, ID)"""
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            query, params = self._paginate(
+                f"SELECT {self._select_list()} FROM Citas WHERE PatientID = %s", [str(patient_id)], limit, after
+            )
+            cursor.execute(query, params)
             
             rows = cursor.fetchall()
             return [self._row_to_appointment(row) for row in rows]
@@ -350,16 +1066,18 @@ class MySQLAppointmentRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def _row_to_appointment(self, row: dict) -> Appointment:
-        """Convierte una fila de la base de datos a una entidad Appointment"""
+    def _row_to_entity(self, row: tuple) -> Appointment:
+        return self._row_to_appointment(row)
+
+    def _row_to_appointment(self, row: tuple) -> Appointment:
+        """
+        Convierte una fila (en el orden de select_columns) a una entidad Appointment.
+        El doctor y el estado se internan: las citas comparten unas pocas cadenas.
+        """
+        appointment_id, patient_id, date, doctor_name, reason, status, notes, duration_minutes = row
         return Appointment(
-            id=row['ID'],
-            patient_id=PatientId.from_string(row['PatientID']),
-            date=row['Fecha'],
-            doctor_name=row['Doctor'],
-            reason=row['Razon'],
-            status=row['Estado'],
-            notes=row['Notas']
+            appointment_id, PatientId(patient_id), date, DOCTOR_NAMES.intern(doctor_name), reason,
+            intern_status(status), notes, duration_minutes
         )
 
 
@@ -367,9 +1085,35 @@ class MySQLTreatmentRepository(MySQLRepository):
     """
     Repositorio MySQL para la gestión de tratamientos médicos
     """
+
+    table_name = 'Tratamientos'
+    insert_columns = ('ID', 'PatientID', 'Diagnostico', 'Prescripcion', 'FechaInicio', 'FechaFin', 'Estado')
+    update_columns = ('PatientID', 'Diagnostico', 'Prescripcion', 'FechaInicio', 'FechaFin', 'Estado')
+    select_columns = insert_columns
+    # Columnas de TreatmentListItemDTO, en el orden de sus campos (el nombre del paciente va al
+    # final); de la prescripción solo se lee el comienzo, como el historial en los pacientes
+    list_item_columns = ('ID', 'Diagnostico', f"LEFT(Prescripcion, {PREVIEW_LENGTH + 1})", 'FechaInicio', 'Estado')
+    keyset_columns = ('FechaInicio', 'ID')
+    keyset_descending = True
+
+    def page_key(self, treatment: Treatment) -> tuple:
+        """Devuelve (FechaInicio, ID) del tratamiento"""
+        return (treatment.start_date, treatment.id)
+
+    def _to_params(self, treatment: Treatment) -> tuple:
+        """Convierte un tratamiento en los parámetros de insert_columns"""
+        return (
+            treatment.id,
+            str(treatment.patient_id),
+            treatment.diagnosis,
+            treatment.prescription,
+            treatment.start_date,
+            treatment.end_date,
+            treatment.status
+        )
     
-    def save(self, treatment: Treatment) -> Treatment:
-        """Guarda o actualiza un tratamiento en la base de datos"""
+    def _save_check_then_write(self, treatment: Treatment) -> str:
+        """Guarda o actualiza un tratamiento consultando antes si existe"""
         connection = self._get_connection()
         cursor = connection.cursor()
         
@@ -390,6 +1134,7 @@ class MySQLTreatmentRepository(MySQLRepository):
                     treatment.status,
                     treatment.id
                 ))
+                outcome = SAVE_UPDATED
             else:
                 # Insertar nuevo tratamiento
                 cursor.execute("""
@@ -405,9 +1150,10 @@ class MySQLTreatmentRepository(MySQLRepository):
                     treatment.end_date,
                     treatment.status
                 ))
+                outcome = SAVE_INSERTED
             
             connection.commit()
-            return treatment
+            return outcome
             
         finally:
             cursor.close()
@@ -416,12 +1162,10 @@ class MySQLTreatmentRepository(MySQLRepository):
     def find_by_id(self, treatment_id: str) -> Optional[Treatment]:
         """Busca un tratamiento por su ID"""
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT * FROM Tratamientos WHERE ID = %s
-            """, (treatment_id,))
+            cursor.execute(f"SELECT {self._select_list()} FROM Tratamientos WHERE ID = %s", (treatment_id,))
             
             row = cursor.fetchone()
             if row:
@@ -432,13 +1176,46 @@ class MySQLTreatmentRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def find_all(self) -> List[Treatment]:
-        """Obtiene todos los tratamientos"""
+    def find_prescription(self, treatment_id: str) -> Optional[str]:
+        """Prescripción completa de un tratamiento, o None si no existe; las listas solo leen el comienzo"""
+        row = self._fetch_one("SELECT Prescripcion FROM Tratamientos WHERE ID = %s", (treatment_id,))
+        return row[0] if row else None
+
+    def find_all(self, limit: Optional[int] = None, after: Optional[tuple] = None) -> List[Treatment]:
+        """Obtiene los tratamientos del más reciente al más antiguo, con paginación opcional"""
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            query, params = self._paginate(
+                f"SELECT {self._select_list()} FROM Tratamientos WHERE 1=1", [], limit, after
+            )
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return [self._row_to_treatment(row) for row in rows]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def find_by_status(
+        self,
+        status: str,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[Treatment]:
+        """
+        Obtiene los tratamientos en el estado indicado, del más reciente al más antiguo,
+        con paginación opcional. Usa el índice idx_tratamientos_estado_fecha (migración 6).
+        """
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("SELECT * FROM Tratamientos ORDER BY FechaInicio DESC")
+            query, params = self._paginate(
+                f"SELECT {self._select_list()} FROM Tratamientos WHERE Estado = %s", [status], limit, after
+            )
+            cursor.execute(query, params)
             rows = cursor.fetchall()
             return [self._row_to_treatment(row) for row in rows]
             
@@ -446,15 +1223,97 @@ class MySQLTreatmentRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def find_by_patient_id(self, patient_id: PatientId) -> List[Treatment]:
-        """Obtiene todos los tratamientos de un paciente específico"""
+    def find_all_with_patient(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None,
+        status: Optional[str] = None
+    ) -> List[Tuple[Treatment, Optional[str]]]:
+        """
+        Obtiene los tratamientos junto con el nombre de su paciente en una sola consulta,
+        opcionalmente solo los del estado indicado. El nombre es None si el paciente ya no existe.
+        """
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            query = f"""
+                SELECT {self._select_list('t')}, p.Nombre AS PacienteNombre
+                FROM Tratamientos t
+                LEFT JOIN Pacientes p ON p.ID = t.PatientID
+                WHERE 1=1
+            """
+            params = []
+            if status is not None:
+                query += " AND t.Estado = %s"
+                params.append(status)
+            query, params = self._paginate(query, params, limit, after, alias='t')
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return [(self._row_to_treatment(row[:-1]), row[-1]) for row in rows]
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def list_items_with_patient(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None,
+        status: Optional[str] = None
+    ) -> List[TreatmentListItemDTO]:
+        """
+        Filas de la lista de tratamientos con el nombre del paciente, del más reciente al más
+        antiguo y opcionalmente solo las del estado indicado, leyendo solo las columnas que muestra la lista
+        """
+        query = f"""
+            SELECT {self._select_list('t', self.list_item_columns)}, p.Nombre
+            FROM Tratamientos t
+            LEFT JOIN Pacientes p ON p.ID = t.PatientID
+            WHERE 1=1
+        """
+        params = []
+        if status is not None:
+            query += " AND t.Estado = %s"
+            params.append(status)
+        query, params = self._paginate(query, params, limit, after, alias='t')
+        return self._fetch_items(query, params, TreatmentListItemDTO)
+
+    def list_items_by_patient(
+        self,
+        patient_id: PatientId,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[TreatmentListItemDTO]:
+        """Filas de la lista de tratamientos de un paciente, del más reciente al más antiguo"""
+        query, params = self._paginate(
+            f"SELECT {self._select_list(columns=self.list_item_columns)} FROM Tratamientos WHERE PatientID = %s",
+            [str(patient_id)], limit, after
+        )
+        return self._fetch_items(query, params, TreatmentListItemDTO)
+
+    def iter_all(self, chunk_size: Optional[int] = None) -> Iterator[Treatment]:
+        """Recorre todos los tratamientos, del más reciente al más antiguo, sin cargarlos en memoria"""
+        query, params = self._paginate(
+            f"SELECT {self._select_list()} FROM Tratamientos WHERE 1=1", [], None, None
+        )
+        return self._iter_rows(query, params, self._row_to_treatment, chunk_size)
+
+    def find_by_patient_id(
+        self,
+        patient_id: PatientId,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> List[Treatment]:
+        """Obtiene los tratamientos de un paciente específico, con paginación opcional"""
         connection = self._get_connection()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT * FROM Tratamientos WHERE PatientID = %s ORDER BY FechaInicio DESC
-            """, (str(patient_id),))
+            query, params = self._paginate(
+                f"SELECT {self._select_list()} FROM Tratamientos WHERE PatientID = %s", [str(patient_id)], limit, after
+            )
+            cursor.execute(query, params)
             
             rows = cursor.fetchall()
             return [self._row_to_treatment(row) for row in rows]
@@ -477,14 +1336,119 @@ class MySQLTreatmentRepository(MySQLRepository):
             cursor.close()
             connection.close()
 
-    def _row_to_treatment(self, row: dict) -> Treatment:
-        """Convierte una fila de la base de datos a una entidad Treatment"""
+    def _row_to_entity(self, row: tuple) -> Treatment:
+        return self._row_to_treatment(row)
+
+    def _row_to_treatment(self, row: tuple) -> Treatment:
+        """Convierte una fila (en el orden de select_columns) a una entidad Treatment; el estado se interna"""
+        treatment_id, patient_id, diagnosis, prescription, start_date, end_date, status = row
         return Treatment(
-            id=row['ID'],
-            patient_id=PatientId.from_string(row['PatientID']),
-            diagnosis=row['Diagnostico'],
-            prescription=row['Prescripcion'],
-            start_date=row['FechaInicio'],
-            end_date=row['FechaFin'],
-            status=row['Estado']
+            treatment_id, PatientId(patient_id), diagnosis, prescription, start_date, end_date, intern_status(status)
+        )
+
+
+class MySQLReportRepository(MySQLRepository):
+    """
+    Repositorio MySQL de solo lectura con las agregaciones de los reportes.
+    Los conteos se calculan en el servidor con GROUP BY / COUNT, sin traer filas a Python.
+    """
+
+    def count_patients_by_gender(self) -> dict:
+        """Cantidad de pacientes por género"""
+        return dict(self._fetch_pairs("SELECT Genero, COUNT(*) FROM Pacientes GROUP BY Genero"))
+
+    def count_patients_by_age_range(self, age_ranges: Iterable[Tuple[str, int, Optional[int]]]) -> dict:
+        """
+        Cantidad de pacientes por rango de edad. Cada rango es (etiqueta, mínimo, máximo),
+        con máximo None para el último; los rangos vacíos no aparecen en el resultado.
+        """
+        cases = []
+        params = []
+        for label, _, max_age in age_ranges:
+            if max_age is None:
+                cases.append("ELSE %s")
+                params.append(label)
+            else:
+                cases.append("WHEN Edad <= %s THEN %s")
+                params.extend([max_age, label])
+
+        query = f"SELECT CASE {' '.join(cases)} END AS Rango, COUNT(*) FROM Pacientes GROUP BY Rango"
+        return dict(self._fetch_pairs(query, params))
+
+    def count_patients_created_since(self, since: datetime) -> int:
+        """Cantidad de pacientes dados de alta desde la fecha indicada (se resuelve con el índice de CreatedAt)"""
+        return self._fetch_count("SELECT COUNT(*) FROM Pacientes WHERE CreatedAt >= %s", (since,))
+
+    def count_treatments_by_status(self, status: str) -> int:
+        """Cantidad de tratamientos en el estado indicado"""
+        return self._fetch_count("SELECT COUNT(*) FROM Tratamientos WHERE Estado = %s", (status,))
+
+    def count_appointments_after(self, status: str, after: datetime, before: Optional[datetime] = None) -> int:
+        """Cantidad de citas en el estado indicado con fecha posterior a 'after' (y anterior a 'before')"""
+        if before is None:
+            return self._fetch_count(
+                "SELECT COUNT(*) FROM Citas WHERE Estado = %s AND Fecha > %s", (status, after)
+            )
+        return self._fetch_count(
+            "SELECT COUNT(*) FROM Citas WHERE Estado = %s AND Fecha > %s AND Fecha < %s", (status, after, before)
         )
+
+    def count_appointments_by_day(self, status: str) -> dict:
+        """Cantidad de citas en el estado indicado por día (fecha -> cantidad)"""
+        return dict(self._fetch_pairs(
+            "SELECT DATE(Fecha) AS Dia, COUNT(*) FROM Citas WHERE Estado = %s GROUP BY Dia", (status,)
+        ))
+
+
+class MySQLStatisticsRepository(MySQLRepository):
+    """
+    Contadores materializados del reporte (tabla EstadisticasReporte).
+    Los casos de uso los actualizan de forma incremental en la misma transacción que cada
+    escritura, de modo que leer el reporte no requiere recorrer las tablas.
+    """
+
+    table_name = 'EstadisticasReporte'
+
+    def apply_deltas(self, deltas: dict):
+        """Suma a cada contador su variación; los contadores que no existen se crean"""
+        if not deltas:
+            return
+
+        connection = self._get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            # Orden fijo de claves para que dos transacciones no se bloqueen mutuamente
+            cursor.executemany(
+                "INSERT INTO EstadisticasReporte (Clave, Valor) VALUES (%s, %s) "
+                "ON DUPLICATE KEY UPDATE Valor = Valor + VALUES(Valor)",
+                sorted(deltas.items())
+            )
+            connection.commit()
+            
+        finally:
+            cursor.close()
+            connection.close()
+
+    def read_counters(self, prefixes: Iterable[str]) -> dict:
+        """Lee los contadores cuyas claves empiezan con alguno de los prefijos indicados"""
+        prefixes = list(prefixes)
+        if not prefixes:
+            return {}
+
+        conditions = ' OR '.join(['Clave LIKE %s'] * len(prefixes))
+        return dict(self._fetch_pairs(
+            f"SELECT Clave, Valor FROM EstadisticasReporte WHERE {conditions}",
+            [prefix + '%' for prefix in prefixes]
+        ))
+
+    def read_all(self) -> dict:
+        """Lee todos los contadores"""
+        return dict(self._fetch_pairs("SELECT Clave, Valor FROM EstadisticasReporte"))
+
+    def sum_after(self, prefix: str, after_key: str) -> int:
+        """Suma los contadores con el prefijo indicado cuyas claves son mayores que after_key"""
+        return int(self._fetch_count(
+            "SELECT COALESCE(SUM(Valor), 0) FROM EstadisticasReporte WHERE Clave > %s AND Clave LIKE %s",
+            (after_key, prefix + '%')
+        ))
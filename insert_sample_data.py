@@ -1,103 +1,247 @@
+import argparse
+import random
+import time
 import mysql.connector
 from datetime import datetime, timedelta
-from config import DATABASE_CONFIG
+from itertools import islice
+from domain.entities import Patient, Appointment, Treatment
+from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+from domain.dto import BatchItemResultDTO
+from application.use_cases import ReportUseCase
+from infrastructure.mysql_repository import (
+    MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository,
+    MySQLReportRepository, MySQLStatisticsRepository
+)
+from infrastructure.migrations import ensure_schema
 
 
-def create_sample_data():
+# Datos para generar pacientes sintéticos
+FIRST_NAMES = [
+    'Juan', 'María', 'Pedro', 'Ana', 'Carlos', 'Laura', 'Roberto', 'Carmen', 'Miguel', 'Isabel',
+    'José', 'Lucía', 'Andrés', 'Sofía', 'Jorge', 'Valentina', 'Diego', 'Camila', 'Tomás', 'Begoña'
+]
+LAST_NAMES = [
+    'Pérez', 'López', 'García', 'Rodríguez', 'Martínez', 'Sánchez', 'Torres', 'Vega', 'Ruiz', 'Moreno',
+    'Muñoz', 'Díaz', 'Rojas', 'Fernández', 'Núñez', 'Castillo', 'Peña', 'Ibáñez', 'Soto', 'Araya'
+]
+MEDICAL_HISTORIES = [
+    '', 'Hipertensión arterial', 'Diabetes mellitus tipo 2', 'Asma bronquial', 'Migraña crónica',
+    'Artritis reumatoide', 'Colesterol alto', 'Alergias estacionales', 'Hipotiroidismo', 'Ansiedad'
+]
+
+
+def build_sample_patients():
+    """Pacientes de ejemplo con IDs fijos para poder referenciarlos en citas y tratamientos"""
+    patients_data = [
+        ('Juan Pérez', 35, 'Masculino', 'Hipertensión arterial, diabetes tipo 2', 'juan.perez@email.com'),
+        ('María López', 45, 'Femenino', 'Diabetes mellitus, obesidad', 'maria.lopez@email.com'),
+        ('Pedro García', 28, 'Masculino', 'Asma bronquial, alergias estacionales', 'pedro.garcia@email.com'),
+        ('Ana Rodríguez', 52, 'Femenino', 'Artritis reumatoide, osteoporosis', 'ana.rodriguez@email.com'),
+        ('Carlos Martínez', 38, 'Masculino', 'Hipertensión, colesterol alto', 'carlos.martinez@email.com'),
+        ('Laura Sánchez', 29, 'Femenino', 'Migraña crónica, ansiedad', 'laura.sanchez@email.com'),
+        ('Roberto Torres', 41, 'Masculino', 'Diabetes tipo 1, retinopatía', 'roberto.torres@email.com'),
+        ('Carmen Vega', 47, 'Femenino', 'Fibromialgia, depresión', 'carmen.vega@email.com'),
+        ('Miguel Ruiz', 33, 'Masculino', 'Síndrome del intestino irritable', 'miguel.ruiz@email.com'),
+        ('Isabel Moreno', 39, 'Femenino', 'Endometriosis, infertilidad', 'isabel.moreno@email.com')
+    ]
+
+    return [
+        Patient(
+            id=PatientId.from_string(f"patient_{i:03d}"),
+            name=name,
+            age=Age(age),
+            gender=Gender(gender),
+            medical_history=MedicalHistory(history),
+            contact=Contact(contact),
+            created_at=datetime.now() - timedelta(days=i*10),
+            updated_at=datetime.now()
+        )
+        for i, (name, age, gender, history, contact) in enumerate(patients_data, 1)
+    ]
+
+
+def build_sample_appointments():
+    """Citas de ejemplo; incluye citas pasadas, por eso no pasan por AppointmentService"""
+    appointments_data = [
+        ('apt_001', 'patient_001', datetime.now() + timedelta(days=2), 'Dr. García', 'Control de hipertensión', 'scheduled', 'Paciente estable'),
+        ('apt_002', 'patient_002', datetime.now() + timedelta(days=5), 'Dra. Martínez', 'Control de diabetes', 'scheduled', 'Revisar glucemia'),
+        ('apt_003', 'patient_003', datetime.now() - timedelta(days=1), 'Dr. López', 'Consulta por asma', 'completed', 'Tratamiento efectivo'),
+        ('apt_004', 'patient_004', datetime.now() + timedelta(days=7), 'Dra. Rodríguez', 'Control de artritis', 'scheduled', 'Evaluar dolor'),
+        ('apt_005', 'patient_005', datetime.now() + timedelta(days=3), 'Dr. Sánchez', 'Control de colesterol', 'scheduled', 'Paciente mejorando'),
+        ('apt_006', 'patient_006', datetime.now() - timedelta(days=2), 'Dra. Torres', 'Consulta por migraña', 'completed', 'Síntomas controlados'),
+        ('apt_007', 'patient_007', datetime.now() + timedelta(days=4), 'Dr. Vega', 'Control de diabetes', 'scheduled', 'Revisar retinopatía'),
+        ('apt_008', 'patient_008', datetime.now() + timedelta(days=6), 'Dra. Ruiz', 'Control de fibromialgia', 'scheduled', 'Evaluar tratamiento'),
+        ('apt_009', 'patient_009', datetime.now() - timedelta(days=3), 'Dr. Moreno', 'Consulta digestiva', 'completed', 'Dieta recomendada'),
+        ('apt_010', 'patient_010', datetime.now() + timedelta(days=1), 'Dra. Pérez', 'Control ginecológico', 'scheduled', 'Revisión anual')
+    ]
+
+    return [
+        Appointment(
+            id=appointment_id,
+            patient_id=PatientId.from_string(patient_id),
+            date=date,
+            doctor_name=doctor,
+            reason=reason,
+            status=status,
+            notes=notes
+        )
+        for appointment_id, patient_id, date, doctor, reason, status, notes in appointments_data
+    ]
+
+
+def build_sample_treatments():
+    """Tratamientos de ejemplo con fechas de inicio en el pasado"""
+    treatments_data = [
+        ('trt_001', 'patient_001', 'Hipertensión arterial', 'Losartán 50mg 1 tableta diaria, dieta baja en sodio, ejercicio moderado', datetime.now() - timedelta(days=30), None, 'active'),
+        ('trt_002', 'patient_002', 'Diabetes mellitus tipo 2', 'Metformina 500mg 2 tabletas diarias, insulina NPH 20 unidades nocturnas, control de glucemia', datetime.now() - timedelta(days=45), None, 'active'),
+        ('trt_003', 'patient_003', 'Asma bronquial', 'Salbutamol inhalador según necesidad, Budesonida 200mcg 2 inhalaciones diarias', datetime.now() - timedelta(days=20), None, 'active'),
+        ('trt_004', 'patient_004', 'Artritis reumatoide', 'Methotrexate 15mg semanal, Ácido fólico 5mg diario, fisioterapia', datetime.now() - timedelta(days=60), None, 'active'),
+        ('trt_005', 'patient_005', 'Hipercolesterolemia', 'Atorvastatina 20mg 1 tableta nocturna, dieta baja en grasas, ejercicio cardiovascular', datetime.now() - timedelta(days=25), None, 'active'),
+        ('trt_006', 'patient_006', 'Migraña crónica', 'Sumatriptán 50mg según necesidad, Propranolol 40mg 2 tabletas diarias, evitar desencadenantes', datetime.now() - timedelta(days=15), None, 'active'),
+        ('trt_007', 'patient_007', 'Diabetes tipo 1', 'Insulina regular 10 unidades antes de cada comida, Insulina NPH 25 unidades nocturnas, control estricto de glucemia', datetime.now() - timedelta(days=90), None, 'active'),
+        ('trt_008', 'patient_008', 'Fibromialgia', 'Amitriptilina 25mg nocturna, ejercicio de bajo impacto, terapia cognitivo-conductual', datetime.now() - timedelta(days=40), None, 'active'),
+        ('trt_009', 'patient_009', 'Síndrome del intestino irritable', 'Dieta FODMAP, probióticos diarios, manejo del estrés, ejercicio regular', datetime.now() - timedelta(days=35), None, 'active'),
+        ('trt_010', 'patient_010', 'Endometriosis', 'Anticonceptivos orales combinados, analgésicos según necesidad, seguimiento ginecológico', datetime.now() - timedelta(days=50), None, 'active')
+    ]
+
+    return [
+        Treatment(
+            id=treatment_id,
+            patient_id=PatientId.from_string(patient_id),
+            diagnosis=diagnosis,
+            prescription=prescription,
+            start_date=start_date,
+            end_date=end_date,
+            status=status
+        )
+        for treatment_id, patient_id, diagnosis, prescription, start_date, end_date, status in treatments_data
+    ]
+
+
+def generate_synthetic_patients(count: int, seed: int = 42):
+    """
+    Genera pacientes sintéticos de forma perezosa para pruebas de carga
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    genders = Gender.VALID_GENDERS
+
+    for i in range(count):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 3))
+        yield Patient(
+            id=None,
+            name=f"{first_name} {last_name} {rng.choice(LAST_NAMES)}",
+            age=Age(rng.randint(0, 100)),
+            gender=Gender(rng.choice(genders)),
+            medical_history=MedicalHistory(rng.choice(MEDICAL_HISTORIES)),
+            contact=Contact(f"{first_name.lower()}.{last_name.lower()}{i}@email.com"),
+            created_at=created_at,
+            updated_at=created_at
+        )
+
+
+def summarize(results) -> dict:
+    """Cuenta los resultados por tipo ('inserted', 'updated', 'failed', ...)"""
+    summary = {}
+    for result in results:
+        summary[result.outcome] = summary.get(result.outcome, 0) + 1
+    return summary
+
+
+def create_sample_data(batch_size: int):
     """
     Crea datos de ejemplo para la clínica SaludTotal
     """
+    patient_repository = MySQLPatientRepository()
+    appointment_repository = MySQLAppointmentRepository()
+    treatment_repository = MySQLTreatmentRepository()
+
+    print("Insertando datos de ejemplo...")
+
+    results = patient_repository.save_many(build_sample_patients(), batch_size)
+    print(f"Pacientes de ejemplo: {summarize(results)}")
+
+    results = appointment_repository.save_many(build_sample_appointments(), batch_size)
+    print(f"Citas de ejemplo: {summarize(results)}")
+
+    results = treatment_repository.save_many(build_sample_treatments(), batch_size)
+    print(f"Tratamientos de ejemplo: {summarize(results)}")
+
+    print("Datos de ejemplo insertados correctamente")
+
+
+def create_synthetic_patients(count: int, batch_size: int, seed: int):
+    """
+    Inserta pacientes sintéticos por lotes sin mantener todas las filas en memoria
+    """
+    patient_repository = MySQLPatientRepository()
+    patients = generate_synthetic_patients(count, seed)
+    totals = {}
+    processed = 0
+    started = time.perf_counter()
+
+    print(f"Insertando {count} pacientes sintéticos en lotes de {batch_size}...")
+
+    # Se entrega un grupo de lotes por llamada para informar progreso sin acumular resultados
+    progress_every = batch_size * 10
+    while True:
+        group = list(islice(patients, progress_every))
+        if not group:
+            break
+
+        for outcome, amount in summarize(patient_repository.save_many(group, batch_size)).items():
+            totals[outcome] = totals.get(outcome, 0) + amount
+        processed += len(group)
+
+        elapsed = time.perf_counter() - started
+        print(f"  {processed}/{count} pacientes ({processed / elapsed:,.0f} filas/s)")
+
+    elapsed = time.perf_counter() - started
+    print(f"Pacientes sintéticos: {totals} en {elapsed:.1f} s")
+    if totals.get(BatchItemResultDTO.FAILED):
+        print("Algunos lotes fallaron; revise el log de MySQL")
+
+
+def refresh_report_statistics():
+    """
+    Las inserciones masivas escriben directo en los repositorios, sin pasar por los casos de uso,
+    así que al terminar se reconcilian los contadores materializados del reporte
+    """
+    report_use_case = ReportUseCase(
+        MySQLPatientRepository(), MySQLAppointmentRepository(), MySQLTreatmentRepository(),
+        MySQLReportRepository(), MySQLStatisticsRepository()
+    )
+    drift = report_use_case.reconcile_statistics()
+    print(f"Contadores del reporte actualizados ({len(drift)} corregidos)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inserta datos de ejemplo en la base de datos de SaludTotal")
+    parser.add_argument('--synthetic-patients', type=int, default=0,
+                        help="Cantidad de pacientes sintéticos a generar para pruebas de carga (ej. 1000000)")
+    parser.add_argument('--batch-size', type=int, default=5000,
+                        help="Filas por lote y por commit")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="Semilla para los datos sintéticos")
+    parser.add_argument('--skip-samples', action='store_true',
+                        help="No insertar los datos de ejemplo fijos")
+    args = parser.parse_args()
+
     try:
-        # Conectar a la base de datos
-        connection = mysql.connector.connect(**DATABASE_CONFIG)
-        cursor = connection.cursor()
-        
-        print("Insertando datos de ejemplo...")
-        
-        # Insertar pacientes de ejemplo
-        patients_data = [
-            ('Juan Pérez', 35, 'Masculino', 'Hipertensión arterial, diabetes tipo 2', 'juan.perez@email.com'),
-            ('María López', 45, 'Femenino', 'Diabetes mellitus, obesidad', 'maria.lopez@email.com'),
-            ('Pedro García', 28, 'Masculino', 'Asma bronquial, alergias estacionales', 'pedro.garcia@email.com'),
-            ('Ana Rodríguez', 52, 'Femenino', 'Artritis reumatoide, osteoporosis', 'ana.rodriguez@email.com'),
-            ('Carlos Martínez', 38, 'Masculino', 'Hipertensión, colesterol alto', 'carlos.martinez@email.com'),
-            ('Laura Sánchez', 29, 'Femenino', 'Migraña crónica, ansiedad', 'laura.sanchez@email.com'),
-            ('Roberto Torres', 41, 'Masculino', 'Diabetes tipo 1, retinopatía', 'roberto.torres@email.com'),
-            ('Carmen Vega', 47, 'Femenino', 'Fibromialgia, depresión', 'carmen.vega@email.com'),
-            ('Miguel Ruiz', 33, 'Masculino', 'Síndrome del intestino irritable', 'miguel.ruiz@email.com'),
-            ('Isabel Moreno', 39, 'Femenino', 'Endometriosis, infertilidad', 'isabel.moreno@email.com')
-        ]
-        
-        for i, (name, age, gender, history, contact) in enumerate(patients_data, 1):
-            patient_id = f"patient_{i:03d}"
-            created_at = datetime.now() - timedelta(days=i*10)
-            updated_at = datetime.now()
-            
-            cursor.execute("""
-                INSERT INTO Pacientes (ID, Nombre, Edad, Genero, HistorialMedico, Contacto, CreatedAt, UpdatedAt)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (patient_id, name, age, gender, history, contact, created_at, updated_at))
-        
-        print(f"Insertados {len(patients_data)} pacientes de ejemplo")
-        
-        # Insertar citas de ejemplo
-        appointments_data = [
-            ('apt_001', 'patient_001', datetime.now() + timedelta(days=2), 'Dr. García', 'Control de hipertensión', 'scheduled', 'Paciente estable'),
-            ('apt_002', 'patient_002', datetime.now() + timedelta(days=5), 'Dra. Martínez', 'Control de diabetes', 'scheduled', 'Revisar glucemia'),
-            ('apt_003', 'patient_003', datetime.now() - timedelta(days=1), 'Dr. López', 'Consulta por asma', 'completed', 'Tratamiento efectivo'),
-            ('apt_004', 'patient_004', datetime.now() + timedelta(days=7), 'Dra. Rodríguez', 'Control de artritis', 'scheduled', 'Evaluar dolor'),
-            ('apt_005', 'patient_005', datetime.now() + timedelta(days=3), 'Dr. Sánchez', 'Control de colesterol', 'scheduled', 'Paciente mejorando'),
-            ('apt_006', 'patient_006', datetime.now() - timedelta(days=2), 'Dra. Torres', 'Consulta por migraña', 'completed', 'Síntomas controlados'),
-            ('apt_007', 'patient_007', datetime.now() + timedelta(days=4), 'Dr. Vega', 'Control de diabetes', 'scheduled', 'Revisar retinopatía'),
-            ('apt_008', 'patient_008', datetime.now() + timedelta(days=6), 'Dra. Ruiz', 'Control de fibromialgia', 'scheduled', 'Evaluar tratamiento'),
-            ('apt_009', 'patient_009', datetime.now() - timedelta(days=3), 'Dr. Moreno', 'Consulta digestiva', 'completed', 'Dieta recomendada'),
-            ('apt_010', 'patient_010', datetime.now() + timedelta(days=1), 'Dra. Pérez', 'Control ginecológico', 'scheduled', 'Revisión anual')
-        ]
-        
-        for appointment_id, patient_id, date, doctor, reason, status, notes in appointments_data:
-            cursor.execute("""
-                INSERT INTO Citas (ID, PatientID, Fecha, Doctor, Razon, Estado, Notas)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (appointment_id, patient_id, date, doctor, reason, status, notes))
-        
-        print(f"Insertadas {len(appointments_data)} citas de ejemplo")
-        
-        # Insertar tratamientos de ejemplo
-        treatments_data = [
-            ('trt_001', 'patient_001', 'Hipertensión arterial', 'Losartán 50mg 1 tableta diaria, dieta baja en sodio, ejercicio moderado', datetime.now() - timedelta(days=30), None, 'active'),
-            ('trt_002', 'patient_002', 'Diabetes mellitus tipo 2', 'Metformina 500mg 2 tabletas diarias, insulina NPH 20 unidades nocturnas, control de glucemia', datetime.now() - timedelta(days=45), None, 'active'),
-            ('trt_003', 'patient_003', 'Asma bronquial', 'Salbutamol inhalador según necesidad, Budesonida 200mcg 2 inhalaciones diarias', datetime.now() - timedelta(days=20), None, 'active'),
-            ('trt_004', 'patient_004', 'Artritis reumatoide', 'Methotrexate 15mg semanal, Ácido fólico 5mg diario, fisioterapia', datetime.now() - timedelta(days=60), None, 'active'),
-            ('trt_005', 'patient_005', 'Hipercolesterolemia', 'Atorvastatina 20mg 1 tableta nocturna, dieta baja en grasas, ejercicio cardiovascular', datetime.now() - timedelta(days=25), None, 'active'),
-            ('trt_006', 'patient_006', 'Migraña crónica', 'Sumatriptán 50mg según necesidad, Propranolol 40mg 2 tabletas diarias, evitar desencadenantes', datetime.now() - timedelta(days=15), None, 'active'),
-            ('trt_007', 'patient_007', 'Diabetes tipo 1', 'Insulina regular 10 unidades antes de cada comida, Insulina NPH 25 unidades nocturnas, control estricto de glucemia', datetime.now() - timedelta(days=90), None, 'active'),
-            ('trt_008', 'patient_008', 'Fibromialgia', 'Amitriptilina 25mg nocturna, ejercicio de bajo impacto, terapia cognitivo-conductual', datetime.now() - timedelta(days=40), None, 'active'),
-            ('trt_009', 'patient_009', 'Síndrome del intestino irritable', 'Dieta FODMAP, probióticos diarios, manejo del estrés, ejercicio regular', datetime.now() - timedelta(days=35), None, 'active'),
-            ('trt_010', 'patient_010', 'Endometriosis', 'Anticonceptivos orales combinados, analgésicos según necesidad, seguimiento ginecológico', datetime.now() - timedelta(days=50), None, 'active')
-        ]
-        
-        for treatment_id, patient_id, diagnosis, prescription, start_date, end_date, status in treatments_data:
-            cursor.execute("""
-                INSERT INTO Tratamientos (ID, PatientID, Diagnostico, Prescripcion, FechaInicio, FechaFin, Estado)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (treatment_id, patient_id, diagnosis, prescription, start_date, end_date, status))
-        
-        print(f"Insertados {len(treatments_data)} tratamientos de ejemplo")
-        
-        # Confirmar cambios
-        connection.commit()
-        print("Datos de ejemplo insertados correctamente")
-        
+        ensure_schema()
+        if not args.skip_samples:
+            create_sample_data(args.batch_size)
+        if args.synthetic_patients > 0:
+            create_synthetic_patients(args.synthetic_patients, args.batch_size, args.seed)
+        refresh_report_statistics()
+
     except mysql.connector.Error as err:
         print(f"Error de MySQL: {err}")
     except Exception as e:
         print(f"Error general: {e}")
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
-            print("Conexión a la base de datos cerrada")
 
 
 if __name__ == "__main__":
-    create_sample_data() 
\ No newline at end of file
+    main()
@@ -1,28 +1,165 @@
+import argparse
 import sys
+import time
 import tkinter as tk
+from contextlib import contextmanager
 from tkinter import messagebox
-from infrastructure.gui_interface import SaludTotalGUI
 from config import APP_CONFIG
 
 
+class StartupProfiler:
+    """
+    Mide la duración de cada etapa del arranque de la aplicación
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    @contextmanager
+    def step(self, name: str):
+        """Registra el tiempo transcurrido dentro del bloque con el nombre indicado"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - started))
+
+    def report(self):
+        """Imprime el desglose de tiempos del arranque"""
+        total = sum(elapsed for _, elapsed in self.steps)
+        print("\nTiempos de arranque:")
+        for name, elapsed in self.steps:
+            print(f"  {name:<32} {elapsed * 1000:8.1f} ms")
+        print(f"  {'Total':<32} {total * 1000:8.1f} ms\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=APP_CONFIG['title'])
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Imprime el desglose de tiempos del arranque")
+    parser.add_argument('--reconcile-stats', action='store_true',
+                        help="Recalcula los contadores del reporte, informa las diferencias y termina")
+    parser.add_argument('--audit-conflicts', action='store_true',
+                        help="Informa las citas programadas de un mismo doctor que se superponen y termina")
+    return parser.parse_args(argv)
+
+
+def reconcile_statistics():
+    """
+    Recalcula desde cero los contadores materializados del reporte e informa las diferencias
+    """
+    from application.use_cases import ReportUseCase
+    from infrastructure.migrations import ensure_schema
+    from infrastructure.mysql_repository import (
+        MySQLPatientRepository, MySQLAppointmentRepository, MySQLTreatmentRepository,
+        MySQLReportRepository, MySQLStatisticsRepository
+    )
+
+    ensure_schema()
+    report_use_case = ReportUseCase(
+        MySQLPatientRepository(), MySQLAppointmentRepository(), MySQLTreatmentRepository(),
+        MySQLReportRepository(), MySQLStatisticsRepository()
+    )
+    drift = report_use_case.reconcile_statistics()
+
+    if not drift:
+        print("Los contadores del reporte están al día")
+        return
+
+    print(f"Contadores corregidos: {len(drift)}")
+    for key, (stored, expected) in drift.items():
+        print(f"  {key:<40} {stored:>8} -> {expected:>8}")
+
+
+def audit_conflicts() -> int:
+    """
+    Informa los pares de citas programadas de un mismo doctor que se superponen y devuelve cuántos hay
+    """
+    from application.use_cases import AppointmentUseCase
+    from infrastructure.migrations import ensure_schema
+    from infrastructure.mysql_repository import MySQLPatientRepository, MySQLAppointmentRepository
+
+    ensure_schema()
+    appointment_use_case = AppointmentUseCase(MySQLAppointmentRepository(), MySQLPatientRepository())
+    conflicts = appointment_use_case.audit_conflicts()
+
+    if not conflicts:
+        print("No hay citas superpuestas")
+        return 0
+
+    print(f"Citas superpuestas: {len(conflicts)}")
+    for first, second in conflicts:
+        print(
+            f"  {first.doctor_name:<25} {first.id} ({first.date:%Y-%m-%d %H:%M}, {first.duration_minutes} min)"
+            f"  <->  {second.id} ({second.date:%Y-%m-%d %H:%M}, {second.duration_minutes} min)"
+        )
+    return len(conflicts)
+
+
 def main():
     """
     Función principal que inicia la aplicación
     """
+    args = parse_args()
+    profiler = StartupProfiler()
+
+    if args.reconcile_stats:
+        try:
+            reconcile_statistics()
+        except Exception as e:
+            print(str(e))
+            sys.exit(1)
+        return
+
+    if args.audit_conflicts:
+        try:
+            conflicts = audit_conflicts()
+        except Exception as e:
+            print(str(e))
+            sys.exit(1)
+        sys.exit(1 if conflicts else 0)
+
     try:
         print("Iniciando aplicación SaludTotal...")
         print(f"Versión: {APP_CONFIG['version']}")
         print(f"Título: {APP_CONFIG['title']}")
-        
-        # Crear y ejecutar la interfaz gráfica
-        app = SaludTotalGUI()
-        app.run()
-        
+
+        with profiler.step("Importación de módulos"):
+            from infrastructure.gui_interface import SaludTotalGUI
+            from infrastructure.connection_pool import get_connection_pool
+            from infrastructure.migrations import ensure_schema
+
+        # Abrir la primera conexión del pool
+        with profiler.step("Conexión a la base de datos"):
+            get_connection_pool().get_connection().close()
+
+        # Preparar el esquema una sola vez, antes de crear la interfaz
+        with profiler.step("Verificación del esquema"):
+            ensure_schema()
+
+        with profiler.step("Construcción de la interfaz"):
+            app = SaludTotalGUI()
+
+        with profiler.step("Primera consulta"):
+            app.load_patients()
+
+        with profiler.step("Primer pintado"):
+            app.root.update()
+
+        with profiler.step("Carga de pestañas restantes"):
+            app.load_secondary_data()
+
+        if args.profile_startup:
+            profiler.report()
+
+        # Ejecutar la aplicación
+        app.root.mainloop()
+
     except Exception as e:
         # Mostrar error en caso de problemas
         error_message = f"Error al iniciar la aplicación: {str(e)}"
         print(error_message)
-        
+
         # Intentar mostrar error en GUI si es posible
         try:
             root = tk.Tk()
@@ -31,7 +168,7 @@ def main():
             root.destroy()
         except:
             pass
-        
+
         sys.exit(1)
 
 
@@ -15,7 +15,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/saludtotal/sistema-gestion-pacientes",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "tests", "tests.*"]),
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Healthcare Industry",
@@ -31,6 +31,9 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "analytics": ["numpy>=1.20"],
+    },
     entry_points={
         "console_scripts": [
             "saludtotal=main:main",
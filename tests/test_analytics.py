@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+import pytest
+from domain.entities import Patient, Appointment, Treatment
+from domain.services import ReportService
+from domain.value_objects import PatientId, Age, Gender, Contact, MedicalHistory
+
+np = pytest.importorskip("numpy")
+from domain.analytics import ReportColumns, VectorizedReportEngine  # noqa: E402
+
+
+def make_patient(number: int, age: int, gender: str, created_at: datetime) -> Patient:
+    patient_id = PatientId(f"00000000-0000-4000-8000-{number:012d}")
+    return Patient(
+        patient_id, f"Paciente {number}", Age(age), Gender(gender),
+        MedicalHistory(""), Contact(f"paciente{number}@correo.cl"), created_at, created_at
+    )
+
+
+@pytest.fixture
+def entities():
+    now = datetime.now()
+    tied = now - timedelta(days=2)
+    # Varias altas con la misma fecha: el orden de los recientes lo decide el ID
+    patients = [
+        make_patient(7, 5, "Masculino", tied),
+        make_patient(2, 25, "Femenino", tied),
+        make_patient(9, 45, "Otro", tied),
+        make_patient(4, 65, "Femenino", now - timedelta(days=1)),
+        make_patient(1, 80, "Masculino", now - timedelta(days=10)),
+        make_patient(3, 18, "Femenino", now - timedelta(days=90)),
+        make_patient(8, 30, "Masculino", tied),
+    ]
+    patient_id = patients[0].id
+    appointments = [
+        Appointment("apt_1", patient_id, now + timedelta(days=3), "Dr. Núñez", "Control", "scheduled"),
+        Appointment("apt_2", patient_id, now - timedelta(days=3), "Dr. Núñez", "Control", "scheduled"),
+        Appointment("apt_3", patient_id, now + timedelta(days=5), "Dra. Pérez", "Control", "cancelled"),
+    ]
+    treatments = [
+        Treatment("trt_1", patient_id, "Gripe", "Reposo", now, status="active"),
+        Treatment("trt_2", patient_id, "Gripe", "Reposo", now, status="completed"),
+    ]
+    return now, patients, appointments, treatments
+
+
+def test_vectorized_report_matches_reference_engine(entities):
+    now, patients, appointments, treatments = entities
+
+    expected = ReportService.generate_patient_report(patients, appointments, treatments)
+    report = VectorizedReportEngine().generate_patient_report(
+        ReportColumns.from_entities(patients, appointments, treatments), now
+    )
+
+    assert report == expected
+
+
+def test_recent_patients_ties_are_ordered_by_id_descending(entities):
+    now, patients, appointments, treatments = entities
+
+    report = VectorizedReportEngine().generate_patient_report(
+        ReportColumns.from_entities(patients, appointments, treatments), now
+    )
+
+    assert [patient.name for patient in report.recent_patients] == [
+        "Paciente 4", "Paciente 9", "Paciente 8", "Paciente 7", "Paciente 2", "Paciente 1"
+    ]
+    assert report.recent_patients_total == 6
+
+
+def test_vectorized_report_matches_counts_built_in_sql(entities):
+    now, patients, appointments, treatments = entities
+    since = ReportService.recent_patients_since(now)
+    recent = sorted(
+        (p for p in patients if p.created_at >= since), key=lambda p: (p.created_at, str(p.id)), reverse=True
+    )
+    patients_by_gender = {}
+    for patient in patients:
+        patients_by_gender[patient.gender.value] = patients_by_gender.get(patient.gender.value, 0) + 1
+    patients_by_age_range = {}
+    for patient in patients:
+        label = ReportService.age_range_label(patient.age.value)
+        patients_by_age_range[label] = patients_by_age_range.get(label, 0) + 1
+
+    expected = ReportService.build_patient_report(
+        patients_by_gender, patients_by_age_range, recent, 1, 1, len(recent)
+    )
+    report = VectorizedReportEngine().generate_patient_report(
+        ReportColumns.from_entities(patients, appointments, treatments), now
+    )
+
+    assert report == expected
@@ -0,0 +1,103 @@
+from datetime import date, datetime, timedelta
+from application.appointment_calendar import AppointmentCalendar
+from domain.entities import Appointment
+from domain.value_objects import PatientId
+
+PATIENT_ID = PatientId("00000000-0000-4000-8000-000000000001")
+# Miércoles
+DAY = date(2024, 5, 8)
+
+
+def appointment(appointment_id: str, when: datetime, doctor: str = "Dr. Núñez",
+                status: str = "scheduled") -> Appointment:
+    return Appointment(appointment_id, PATIENT_ID, when, doctor, "Control", status)
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute)
+
+
+def ids(appointments) -> list:
+    return [appointment.id for appointment in appointments]
+
+
+def loaded_calendar() -> AppointmentCalendar:
+    calendar = AppointmentCalendar()
+    calendar.load([
+        appointment("c", at(DAY, 11)),
+        appointment("a", at(DAY, 9), doctor="Dra. Pérez"),
+        appointment("b", at(DAY, 9)),
+        appointment("d", at(DAY - timedelta(days=2), 10)),                 # lunes
+        appointment("e", at(DAY + timedelta(days=4), 18), status="cancelled"),  # domingo
+        appointment("f", at(DAY + timedelta(days=5), 8)),                  # lunes siguiente
+    ])
+    return calendar
+
+
+def test_load_sorts_by_date_and_id():
+    calendar = loaded_calendar()
+
+    assert calendar.loaded
+    assert len(calendar) == 6
+    assert ids(calendar.day(DAY)) == ["a", "b", "c"]
+
+
+def test_between_is_half_open():
+    calendar = loaded_calendar()
+
+    assert ids(calendar.between(at(DAY, 9), at(DAY, 11))) == ["a", "b"]
+
+
+def test_day_filters_by_doctor_without_case_or_accents():
+    calendar = loaded_calendar()
+
+    assert ids(calendar.day(DAY, doctor_name="dr. nunez")) == ["b", "c"]
+    assert ids(calendar.day(DAY, doctor_name="Dr. Sin Citas")) == []
+
+
+def test_week_goes_from_monday_to_sunday():
+    calendar = loaded_calendar()
+
+    assert ids(calendar.week(DAY)) == ["d", "a", "b", "c", "e"]
+    assert ids(calendar.week(DAY, status="scheduled")) == ["d", "a", "b", "c"]
+
+
+def test_add_replaces_the_previous_version():
+    calendar = loaded_calendar()
+    moved = appointment("c", at(DAY + timedelta(days=1), 15), doctor="Dra. Pérez")
+
+    calendar.add(moved)
+
+    assert ids(calendar.day(DAY)) == ["a", "b"]
+    assert ids(calendar.day(DAY + timedelta(days=1), doctor_name="Dra. Pérez")) == ["c"]
+    assert len(calendar) == 6
+
+
+def test_add_keeps_a_copy():
+    calendar = AppointmentCalendar()
+    created = appointment("a", at(DAY, 9))
+    calendar.add(created)
+
+    created.reschedule(at(DAY, 17))
+
+    assert [a.date for a in calendar.day(DAY)] == [at(DAY, 9)]
+
+
+def test_remove_drops_the_appointment_and_ignores_unknown_ids():
+    calendar = loaded_calendar()
+
+    calendar.remove("b")
+    calendar.remove("no-existe")
+
+    assert ids(calendar.day(DAY)) == ["a", "c"]
+    assert len(calendar) == 5
+
+
+def test_doctors_lists_each_doctor_once():
+    calendar = loaded_calendar()
+    calendar.add(appointment("g", at(DAY, 16), doctor="DR. NÚÑEZ"))
+
+    doctors = calendar.doctors()
+
+    assert len(doctors) == 2
+    assert "Dra. Pérez" in doctors
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+import pytest
+from domain.entities import Appointment
+from domain.services import AppointmentService
+from domain.value_objects import PatientId
+
+START = datetime(2024, 5, 6, 9, 0)
+PATIENT_ID = PatientId("00000000-0000-4000-8000-000000000001")
+
+
+def appointment(appointment_id: str, minutes_after_start: int, doctor: str = "Dr. Núñez",
+                duration: int = 30, status: str = "scheduled") -> Appointment:
+    return Appointment(
+        appointment_id, PATIENT_ID, START + timedelta(minutes=minutes_after_start),
+        doctor, "Control", status, None, duration
+    )
+
+
+def conflict_ids(appointments) -> list:
+    return [(first.id, second.id) for first, second in AppointmentService.find_conflicts(appointments)]
+
+
+def test_overlapping_appointments_of_the_same_doctor_conflict():
+    appointments = [appointment("a", 0, duration=60), appointment("b", 30)]
+
+    assert conflict_ids(appointments) == [("a", "b")]
+
+
+def test_appointments_that_only_touch_do_not_conflict():
+    appointments = [appointment("a", 0), appointment("b", 30), appointment("c", 60)]
+
+    assert conflict_ids(appointments) == []
+
+
+def test_doctor_names_are_compared_without_case_or_accents():
+    appointments = [appointment("a", 0, doctor="Dr. Núñez"), appointment("b", 10, doctor="dr. nunez")]
+
+    assert conflict_ids(appointments) == [("a", "b")]
+
+
+def test_different_doctors_and_non_scheduled_appointments_do_not_conflict():
+    appointments = [
+        appointment("a", 0, doctor="Dr. Núñez"),
+        appointment("b", 0, doctor="Dra. Pérez"),
+        appointment("c", 10, doctor="Dr. Núñez", status="cancelled"),
+        appointment("d", 15, doctor="Dra. Pérez", status="completed"),
+    ]
+
+    assert conflict_ids(appointments) == []
+
+
+def test_a_long_appointment_conflicts_with_every_one_it_covers():
+    # 'b' ya terminó cuando empieza 'c', pero 'a' sigue abierta detrás en el heap
+    appointments = [
+        appointment("a", 0, duration=120),
+        appointment("b", 10, duration=20),
+        appointment("c", 40),
+        appointment("d", 120),
+    ]
+
+    assert sorted(conflict_ids(appointments)) == [("a", "b"), ("a", "c")]
+
+
+def test_unsorted_appointments_are_rejected():
+    with pytest.raises(ValueError, match="ordenadas por fecha"):
+        list(AppointmentService.find_conflicts([appointment("a", 30), appointment("b", 0)]))
+
+
+def test_find_conflicts_consumes_the_input_lazily():
+    consumed = []
+
+    def appointments():
+        for item in (appointment("a", 0, duration=60), appointment("b", 30), appointment("c", 200)):
+            consumed.append(item.id)
+            yield item
+
+    conflicts = AppointmentService.find_conflicts(appointments())
+
+    assert [(a.id, b.id) for a, b in [next(conflicts)]] == [("a", "b")]
+    assert consumed == ["a", "b"]
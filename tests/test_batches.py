@@ -0,0 +1,88 @@
+from contextlib import nullcontext
+from application.use_cases import _create_in_batches
+from domain.dto import BatchItemResultDTO
+
+
+class Entity:
+    def __init__(self, entity_id: str, patient_id: str = "p1"):
+        self.id = entity_id
+        self.patient_id = patient_id
+
+
+class RecordingRepository:
+    """Repositorio en memoria con la interfaz de save_many de MySQLRepository"""
+
+    def __init__(self):
+        self.batches = []
+        self.transactions = 0
+
+    def transaction(self):
+        self.transactions += 1
+        return nullcontext()
+
+    def save_many(self, entities, batch_size=None):
+        self.batches.append([entity.id for entity in entities])
+        return [BatchItemResultDTO(entity.id, BatchItemResultDTO.INSERTED) for entity in entities]
+
+
+def build_entity(row: dict) -> Entity:
+    if not row["id"]:
+        raise ValueError("ID vacío")
+    return Entity(row["id"], row.get("patient_id", "p1"))
+
+
+def outcomes(results) -> list:
+    return [(result.id, result.outcome) for result in results]
+
+
+def test_duplicate_ids_are_rejected_within_and_across_batches():
+    repository = RecordingRepository()
+    rows = [{"id": "a"}, {"id": "b"}, {"id": "a"}, {"id": "c"}, {"id": "c"}, {"id": "b"}]
+
+    results = _create_in_batches(rows, 2, build_entity, repository)
+
+    assert outcomes(results) == [
+        ("a", "inserted"), ("b", "inserted"),
+        ("a", "invalid"), ("c", "inserted"),
+        ("c", "invalid"), ("b", "invalid"),
+    ]
+    assert repository.batches == [["a", "b"], ["c"]]
+    assert all(result.error == "ID duplicado dentro de la carga" for result in results if result.outcome == "invalid")
+
+
+def test_invalid_rows_keep_their_position():
+    repository = RecordingRepository()
+    rows = [{"id": "a"}, {}, {"id": ""}, {"id": "b"}]
+
+    results = _create_in_batches(rows, 10, build_entity, repository)
+
+    assert outcomes(results) == [("a", "inserted"), (None, "invalid"), (None, "invalid"), ("b", "inserted")]
+    assert results[1].error.startswith("Campo obligatorio faltante")
+    assert results[2].error == "ID vacío"
+    assert repository.transactions == 1
+
+
+def test_check_batch_rejections_are_not_saved():
+    repository = RecordingRepository()
+    rows = [{"id": "a", "patient_id": "p1"}, {"id": "b", "patient_id": "p9"}, {"id": "c", "patient_id": "p1"}]
+
+    def check_batch(entities):
+        return {index: "Paciente no encontrado" for index, entity in enumerate(entities) if entity.patient_id == "p9"}
+
+    results = _create_in_batches(rows, 10, build_entity, repository, check_batch=check_batch)
+
+    assert outcomes(results) == [("a", "inserted"), ("b", "invalid"), ("c", "inserted")]
+    assert results[1].error == "Paciente no encontrado"
+    assert repository.batches == [["a", "c"]]
+
+
+def test_on_saved_receives_each_saved_batch():
+    repository = RecordingRepository()
+    saved = []
+
+    _create_in_batches(
+        [{"id": "a"}, {"id": "b"}, {"id": "c"}], 2, build_entity, repository,
+        on_saved=lambda entities, results: saved.append([entity.id for entity in entities])
+    )
+
+    assert saved == [["a", "b"], ["c"]]
@@ -0,0 +1,82 @@
+import threading
+from datetime import datetime, timezone
+from domain.id_generator import ID_LENGTH, MonotonicIdGenerator, id_timestamp, new_id
+
+# 2024-01-01 00:00:00 UTC en nanosegundos
+EPOCH_2024_NS = 1_704_067_200_000_000_000
+
+
+class FakeClock:
+    def __init__(self, now_ns: int):
+        self.now_ns = now_ns
+
+    def __call__(self) -> int:
+        return self.now_ns
+
+
+def test_ids_within_the_same_millisecond_are_strictly_increasing():
+    generator = MonotonicIdGenerator(clock=FakeClock(EPOCH_2024_NS), random_bytes=lambda size: b"\xff" * (size - 1) + b"\xfd")
+
+    ids = [generator.new_id() for _ in range(5)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+    assert all(len(entity_id) == ID_LENGTH for entity_id in ids)
+
+
+def test_ids_keep_increasing_when_the_clock_goes_back():
+    clock = FakeClock(EPOCH_2024_NS)
+    generator = MonotonicIdGenerator(clock=clock)
+
+    first = generator.new_id()
+    clock.now_ns -= 5_000_000_000
+    second = generator.new_id()
+
+    assert second > first
+
+
+def test_a_later_millisecond_sorts_after_any_earlier_id():
+    clock = FakeClock(EPOCH_2024_NS)
+    generator = MonotonicIdGenerator(clock=clock, random_bytes=lambda size: b"\xff" * size)
+    earlier = generator.new_id()
+
+    clock.now_ns += 1_000_000
+    later = MonotonicIdGenerator(clock=clock, random_bytes=lambda size: b"\x00" * size).new_id()
+
+    assert later > earlier
+
+
+def test_id_timestamp_decodes_the_creation_millisecond():
+    generator = MonotonicIdGenerator(clock=FakeClock(EPOCH_2024_NS + 123_000_000))
+
+    assert id_timestamp("apt_" + generator.new_id()) == datetime(2024, 1, 1, 0, 0, 0, 123000, tzinfo=timezone.utc)
+
+
+def test_new_id_is_unique_across_threads():
+    generated = []
+    lock = threading.Lock()
+
+    def worker():
+        ids = [new_id("trt_") for _ in range(500)]
+        with lock:
+            generated.extend(ids)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(generated)) == 2000
+    assert all(entity_id.startswith("trt_") for entity_id in generated)
+
+
+def test_reseed_forgets_the_last_id():
+    clock = FakeClock(EPOCH_2024_NS)
+    generator = MonotonicIdGenerator(clock=clock, random_bytes=lambda size: b"\x00" * size)
+    generator.new_id()
+    second = generator.new_id()
+
+    generator.reseed()
+
+    assert generator.new_id() < second
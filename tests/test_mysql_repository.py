@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("mysql.connector")
+from infrastructure.connection_pool import ConnectionPool  # noqa: E402
+from infrastructure.mysql_repository import MySQLAppointmentRepository  # noqa: E402
+from domain.entities import Appointment  # noqa: E402
+from domain.value_objects import PatientId  # noqa: E402
+
+PATIENT_ID = PatientId("00000000-0000-4000-8000-000000000001")
+
+
+class StubCursor:
+    """Cursor de tuplas que responde las consultas de IDs con los de StubDatabase"""
+
+    def __init__(self, database):
+        self.database = database
+        self.rows = []
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.database.statements.append((" ".join(query.split()), params))
+        if query.startswith("SELECT ID FROM"):
+            self.rows = [(entity_id,) for entity_id in params if entity_id in self.database.ids]
+        elif query.startswith("INSERT"):
+            self.rowcount = self.database.upsert_rowcounts.pop(0)
+        else:
+            self.rows = list(self.database.rows)
+
+    def executemany(self, query, seq_params):
+        self.database.statements.append((" ".join(query.split()), list(seq_params)))
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    in_transaction = False
+
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self, *args, **kwargs):
+        return StubCursor(self.database)
+
+    def commit(self):
+        self.database.commits += 1
+
+    def rollback(self):
+        self.database.rollbacks += 1
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self.database.closed += 1
+
+
+class StubDatabase:
+    def __init__(self, ids=(), rows=(), upsert_rowcounts=()):
+        self.ids = set(ids)
+        self.rows = list(rows)
+        self.upsert_rowcounts = list(upsert_rowcounts)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+
+
+def repository_for(database: StubDatabase) -> MySQLAppointmentRepository:
+    pool = ConnectionPool(config={}, pool_size=1, connect=lambda **kwargs: StubConnection(database))
+    return MySQLAppointmentRepository(pool=pool)
+
+
+def appointment(appointment_id: str) -> Appointment:
+    return Appointment(appointment_id, PATIENT_ID, datetime(2024, 5, 6, 9), "Dr. Núñez", "Control", "scheduled")
+
+
+def outcomes(results) -> list:
+    return [(result.id, result.outcome) for result in results]
+
+
+def test_save_many_reports_inserted_and_updated_rows():
+    database = StubDatabase(ids={"apt_2"})
+    repository = repository_for(database)
+
+    results = repository.save_many([appointment("apt_1"), appointment("apt_2")])
+
+    assert outcomes(results) == [("apt_1", "inserted"), ("apt_2", "updated")]
+    assert database.commits == 1
+
+
+def test_save_many_reports_a_repeated_id_in_a_batch_as_updated():
+    database = StubDatabase()
+    repository = repository_for(database)
+
+    results = repository.save_many([appointment("apt_1"), appointment("apt_2"), appointment("apt_1")], batch_size=10)
+
+    assert outcomes(results) == [("apt_1", "inserted"), ("apt_2", "inserted"), ("apt_1", "updated")]
+
+
+def test_save_many_commits_once_per_batch():
+    database = StubDatabase()
+    repository = repository_for(database)
+
+    repository.save_many((appointment(f"apt_{i}") for i in range(5)), batch_size=2)
+
+    assert database.commits == 3
+
+
+@pytest.mark.parametrize("rowcount, outcome", [(1, "inserted"), (2, "updated"), (0, "updated")])
+def test_upsert_outcome_comes_from_the_affected_rows(rowcount, outcome):
+    database = StubDatabase(upsert_rowcounts=[rowcount])
+    repository = repository_for(database)
+
+    assert repository.upsert(appointment("apt_1")) == outcome
+    assert database.statements[0][0].endswith(
+        "ON DUPLICATE KEY UPDATE PatientID = VALUES(PatientID), Fecha = VALUES(Fecha), Doctor = VALUES(Doctor), "
+        "Razon = VALUES(Razon), Estado = VALUES(Estado), Notas = VALUES(Notas), "
+        "DuracionMinutos = VALUES(DuracionMinutos)"
+    )
+
+
+def test_delete_many_reports_deleted_and_not_found():
+    database = StubDatabase(ids={"apt_1", "apt_3"})
+    repository = repository_for(database)
+
+    results = repository.delete_many(["apt_1", "apt_2", "apt_3", "apt_1"])
+
+    assert outcomes(results) == [
+        ("apt_1", "deleted"), ("apt_2", "not_found"), ("apt_3", "deleted"), ("apt_1", "not_found")
+    ]
+
+
+def test_list_page_query_uses_the_keyset_of_the_previous_page():
+    database = StubDatabase(rows=[("apt_9", datetime(2024, 5, 7, 10), "Dr. Núñez", "Control", "scheduled", "Ana")])
+    repository = repository_for(database)
+    after = (datetime(2024, 5, 6, 9), "apt_1")
+
+    items = repository.list_items_with_patient(limit=3, after=after)
+
+    query, params = database.statements[-1]
+    assert "AND (c.Fecha > %s OR (c.Fecha = %s AND c.ID > %s)) ORDER BY c.Fecha, c.ID LIMIT %s" in query
+    assert list(params) == [after[0], after[0], after[1], 3]
+    assert [(item.id, item.patient_name) for item in items] == [("apt_9", "Ana")]
+
+
+def stream_rows(count: int) -> list:
+    start = datetime(2024, 5, 6, 9)
+    return [
+        (f"apt_{i}", str(PATIENT_ID), start + timedelta(hours=i), "Dr. Núñez", "Control", "scheduled", None, 30)
+        for i in range(count)
+    ]
+
+
+def test_stopping_a_stream_early_discards_the_connection():
+    database = StubDatabase(rows=stream_rows(10))
+    repository = repository_for(database)
+
+    stream = repository.iter_all(chunk_size=3)
+    next(stream)
+    stream.close()
+
+    assert repository.pool.stats()['discarded'] == 1
+
+
+def test_stopping_a_stream_early_inside_a_transaction_keeps_it_usable():
+    database = StubDatabase(rows=stream_rows(10))
+    repository = repository_for(database)
+
+    with repository.transaction() as transaction:
+        stream = repository.iter_all(chunk_size=3)
+        next(stream)
+        stream.close()
+        assert not transaction.invalidated
+
+    assert database.commits == 1
+    assert repository.pool.stats()['discarded'] == 0
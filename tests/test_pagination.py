@@ -0,0 +1,72 @@
+import base64
+from datetime import datetime
+import pytest
+from application.use_cases import _decode_page_token, _encode_page_token, _fetch_page
+
+
+def test_page_token_round_trip_keeps_datetimes_and_text():
+    key = (datetime(2024, 3, 5, 14, 30, 15, 123456), "apt_01HQ")
+
+    assert _decode_page_token(_encode_page_token(key)) == key
+
+
+def test_page_token_round_trip_keeps_text_and_numbers():
+    key = ("Núñez, José", 42)
+
+    assert _decode_page_token(_encode_page_token(key)) == key
+
+
+@pytest.mark.parametrize("token", [
+    "no es base64!",
+    base64.urlsafe_b64encode(b"no es json").decode("ascii"),
+    base64.urlsafe_b64encode(b'[{"fecha": "2024-01-01"}]').decode("ascii"),
+    base64.urlsafe_b64encode(b'[{"datetime": "ayer"}]').decode("ascii"),
+])
+def test_invalid_page_token_raises_value_error(token):
+    with pytest.raises(ValueError, match="Token de paginación inválido"):
+        _decode_page_token(token)
+
+
+class FakeRows:
+    """Fuente ordenada con la firma fetch(limit=..., after=...) de los repositorios"""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.calls = []
+
+    def fetch(self, limit, after):
+        self.calls.append((limit, after))
+        rows = [key for key in self.keys if after is None or key > after]
+        return rows[:limit]
+
+
+def test_fetch_page_walks_every_row_once():
+    source = FakeRows([(f"Paciente {i:02d}", str(i)) for i in range(7)])
+
+    page = _fetch_page(source.fetch, lambda row: row, None, 3, None)
+    seen = list(page.items)
+    while page.next_token:
+        page = _fetch_page(source.fetch, lambda row: row, None, 3, page.next_token)
+        seen.extend(page.items)
+
+    assert seen == source.keys
+    # Se pide una fila extra para saber si hay una página siguiente
+    assert all(limit == 4 for limit, _ in source.calls)
+
+
+def test_fetch_page_has_no_next_token_on_an_exact_last_page():
+    source = FakeRows([("a", "1"), ("b", "2")])
+
+    page = _fetch_page(source.fetch, lambda row: row, None, 2, None)
+
+    assert page.items == [("a", "1"), ("b", "2")]
+    assert page.next_token is None
+
+
+def test_fetch_page_converts_rows_with_to_dto():
+    source = FakeRows([("a", "1"), ("b", "2"), ("c", "3")])
+
+    page = _fetch_page(source.fetch, lambda row: row, lambda row: row[0].upper(), 2, None)
+
+    assert page.items == ["A", "B"]
+    assert _decode_page_token(page.next_token) == ("b", "2")
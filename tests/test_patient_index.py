@@ -0,0 +1,70 @@
+from application.patient_index import PatientNameIndex
+
+
+def loaded_index() -> PatientNameIndex:
+    index = PatientNameIndex()
+    index.load([
+        ("1", "José Núñez"),
+        ("2", "Ana María Pérez"),
+        ("3", "Josefina Andrade"),
+        ("4", "María José Soto"),
+        ("5", "Mariano Quijosé"),
+    ])
+    return index
+
+
+def names(suggestions) -> list:
+    return [name for _, name in suggestions]
+
+
+def test_short_queries_match_word_prefixes():
+    index = loaded_index()
+
+    assert names(index.suggest("jo")) == ["José Núñez", "Josefina Andrade", "María José Soto"]
+
+
+def test_queries_ignore_case_and_accents():
+    index = loaded_index()
+
+    assert names(index.suggest("NUNEZ")) == ["José Núñez"]
+    assert names(index.suggest("maria")) == ["María José Soto", "Mariano Quijosé", "Ana María Pérez"]
+
+
+def test_name_prefix_ranks_before_word_prefix_and_substring():
+    index = loaded_index()
+
+    assert names(index.suggest("jose")) == [
+        "José Núñez", "Josefina Andrade", "María José Soto", "Mariano Quijosé"
+    ]
+
+
+def test_limit_and_empty_queries():
+    index = loaded_index()
+
+    assert len(index.suggest("a", limit=2)) == 2
+    assert index.suggest("   ") == []
+    assert index.suggest("jose", limit=0) == []
+    assert index.suggest("xyz") == []
+
+
+def test_add_updates_the_name_of_an_existing_patient():
+    index = loaded_index()
+
+    index.add("1", "Pedro Rojas")
+
+    assert index.get_name("1") == "Pedro Rojas"
+    assert "1" not in [patient_id for patient_id, _ in index.suggest("nunez")]
+    assert index.suggest("rojas") == [("1", "Pedro Rojas")]
+    assert len(index) == 5
+
+
+def test_remove_drops_the_patient_and_ignores_unknown_ids():
+    index = loaded_index()
+
+    index.remove("2")
+    index.remove("no-existe")
+
+    assert index.get_name("2") is None
+    assert names(index.suggest("ana")) == []
+    assert names(index.suggest("an")) == ["Josefina Andrade"]
+    assert len(index) == 4